@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Benchmark: outstanding LLM calls per uvicorn worker, threadpool routes vs async routes.
+
+Starts the mock LM backend, then fires ``--requests`` concurrent classifications two ways and reports the peak number
+of calls the backend saw open at once:
+
+- ``threadpool``: the sync predictor dispatched through ``run_in_threadpool`` (how FastAPI runs ``def`` routes).
+  Peak concurrency is capped by Starlette's threadpool (40 tokens by default).
+- ``async``: the real API served by a single uvicorn worker, whose routes await DSPy's async module path.
+
+    uv run python scripts/bench/async_concurrency.py --requests 300 --delay-ms 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import free_port, running_mock_server  # noqa: E402
+
+COMPLAINT = "My Ozempic pen arrived with a cracked cartridge and leaked everywhere."
+
+
+def _backend_env(api_base: str) -> dict[str, str]:
+    return {
+        "DSPY_PROVIDER": "local",
+        "DSPY_LOCAL_BASE": api_base,
+        "DSPY_MODEL_NAME": "mock-model",
+    }
+
+
+def _reset_stats(api_base: str) -> None:
+    httpx.post(f"{api_base.removesuffix('/v1')}/stats/reset").raise_for_status()
+
+
+def _peak(api_base: str) -> int:
+    return httpx.get(f"{api_base.removesuffix('/v1')}/stats").json()["peak_in_flight"]
+
+
+async def _run_threadpool(requests: int) -> float:
+    from starlette.concurrency import run_in_threadpool
+
+    from src.common.config import configure_lm
+    from src.common.types import ClassificationType
+    from src.serving.service import ComplaintRequest, get_classification_function
+
+    configure_lm()
+    predict = get_classification_function(ClassificationType.AE_PC)
+    payload = ComplaintRequest(complaint=COMPLAINT)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_in_threadpool(predict, payload) for _ in range(requests)))
+    return time.perf_counter() - started
+
+
+async def _run_async_api(api_url: str, requests: int) -> tuple[float, int]:
+    limits = httpx.Limits(max_connections=requests, max_keepalive_connections=requests)
+    async with httpx.AsyncClient(base_url=api_url, timeout=300.0, limits=limits) as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post("/classify/ae-pc", json={"complaint": COMPLAINT}) for _ in range(requests))
+        )
+        elapsed = time.perf_counter() - started
+    failures = sum(1 for response in responses if response.status_code != 200)
+    return elapsed, failures
+
+
+def _wait_for_api(api_url: str, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            if httpx.get(f"{api_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError("API server did not become healthy in time")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="Concurrent classifications to fire.")
+    parser.add_argument("--delay-ms", type=float, default=1000, help="Mock backend latency per call.")
+    args = parser.parse_args()
+
+    with running_mock_server(delay_ms=args.delay_ms) as api_base:
+        os.environ.update(_backend_env(api_base))
+
+        _reset_stats(api_base)
+        threadpool_elapsed = asyncio.run(_run_threadpool(args.requests))
+        threadpool_peak = _peak(api_base)
+
+        _reset_stats(api_base)
+        api_port = free_port()
+        api_url = f"http://127.0.0.1:{api_port}"
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "src.api.app:app",
+                "--port",
+                str(api_port),
+                "--workers",
+                "1",
+                "--log-level",
+                "warning",
+            ],
+            cwd=REPO_ROOT,
+            env={**os.environ, **_backend_env(api_base)},
+        )
+        try:
+            _wait_for_api(api_url, server)
+            async_elapsed, failures = asyncio.run(_run_async_api(api_url, args.requests))
+            async_peak = _peak(api_base)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print(f"{'mode':<12} {'requests':>9} {'peak open LM calls':>19} {'wall time (s)':>14}")
+    print(f"{'threadpool':<12} {args.requests:>9} {threadpool_peak:>19} {threadpool_elapsed:>14.2f}")
+    print(f"{'async':<12} {args.requests:>9} {async_peak:>19} {async_elapsed:>14.2f}")
+    if failures:
+        print(f"WARNING: {failures} async API requests failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
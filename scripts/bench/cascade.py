@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark: LLM calls saved and accuracy lost by the n-gram first stage (``DSPY_CASCADE``).
+
+For each classifier, trains the first stage on ``data/<type>-classification/train.json`` (see
+``src/common/cascade.py``) and runs every complaint in ``test.json`` through the optimized DSPy program. The cascade
+answers a complaint itself when the first stage's confidence reaches the threshold and takes the program's answer
+otherwise, so the report shows:
+
+- ``answered``: share of complaints the first stage answers, i.e. the LLM calls the cascade saves;
+- ``stage acc``: the first stage's accuracy on the complaints it answers;
+- ``llm acc`` / ``cascade acc``: accuracy of the program alone and of the cascade, and their difference.
+
+Accuracy is only meaningful against a real model (``--api-base`` or the configured provider); the mock backend picks
+a label by keyword.
+
+    uv run python scripts/bench/cascade.py --mock
+    uv run python scripts/bench/cascade.py --api-base http://127.0.0.1:8080/v1 --threshold 0.9
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+
+async def _llm_labels(classification_type, examples, concurrency: int) -> list[str]:
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+
+    predict = get_async_classification_function(classification_type, use_cache=False)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _classify(example) -> str:
+        async with semaphore:
+            return (await predict(ComplaintRequest(complaint=example.complaint))).classification
+
+    return await asyncio.gather(*(_classify(example) for example in examples))
+
+
+def _same(predicted: str, actual: str) -> bool:
+    return predicted.strip().lower() == actual.strip().lower()
+
+
+async def _run(concurrency: int, limit: int | None, threshold: float | None) -> None:
+    from src.common.cascade import first_stage_for
+    from src.common.config import configure_lm
+    from src.common.data_utils import prepare_datasets
+    from src.common.types import ClassificationType
+
+    configure_lm()
+    print(
+        f"{'classifier':<12} {'train s':>7} {'threshold':>9} {'answered':>8} {'stage acc':>9} {'llm acc':>7} "
+        f"{'cascade acc':>11} {'delta':>6}"
+    )
+    for classification_type in ClassificationType:
+        _, test = prepare_datasets(classification_type)
+        examples = test[:limit] if limit else test
+        started = time.perf_counter()
+        stage = first_stage_for(classification_type).with_threshold(threshold)
+        train_seconds = time.perf_counter() - started
+        llm = await _llm_labels(classification_type, examples, concurrency)
+
+        answers = [stage.answer(example.complaint) for example in examples]
+        answered = [(answer[0], example) for answer, example in zip(answers, examples, strict=True) if answer]
+        cascade = [answer[0] if answer else label for answer, label in zip(answers, llm, strict=True)]
+        llm_accuracy = sum(map(_same, llm, (e.classification for e in examples))) / len(examples)
+        cascade_accuracy = sum(map(_same, cascade, (e.classification for e in examples))) / len(examples)
+        stage_accuracy = sum(_same(label, e.classification) for label, e in answered) / len(answered) if answered else 0
+        print(
+            f"{classification_type:<12} {train_seconds:>7.1f} {stage.threshold:>9.3f} "
+            f"{len(answered) / len(examples):>8.0%} {stage_accuracy:>9.1%} {llm_accuracy:>7.1%} "
+            f"{cascade_accuracy:>11.1%} {cascade_accuracy - llm_accuracy:>+6.1%}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="Classifications in flight.")
+    parser.add_argument("--limit", type=int, help="Only use the first N test complaints per classifier.")
+    parser.add_argument("--threshold", type=float, help="First-stage confidence threshold (default: calibrated).")
+    parser.add_argument("--mock", action="store_true", help="Benchmark against the local mock backend.")
+    parser.add_argument("--delay-ms", type=float, default=5, help="Mock fixed time per LM call.")
+    parser.add_argument("--api-base", help="Benchmark this OpenAI-compatible server instead of the configured LM.")
+    args = parser.parse_args()
+
+    server = running_mock_server(args.delay_ms) if args.mock else contextlib.nullcontext(args.api_base)
+    with server as api_base:
+        if api_base:
+            os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base)
+            os.environ.setdefault("DSPY_MODEL_NAME", "mock-model")
+        asyncio.run(_run(args.concurrency, args.limit, args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
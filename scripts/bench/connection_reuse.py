@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark: TCP connections opened for LM calls, pooled keep-alive client vs no keep-alive.
+
+Runs the real AE/PC classifier against the mock LM backend in ``--waves`` bursts of ``--concurrency`` unique
+complaints and reports how many distinct client connections the backend saw:
+
+- ``pooled``: the process-wide client installed by ``configure_lm()`` with the default keep-alive settings. After
+  the first burst, calls reuse the open connections (against a TLS endpoint such as OpenRouter, each avoided
+  connection is an avoided handshake).
+- ``no-keepalive``: the same client with ``DSPY_HTTP_MAX_KEEPALIVE_CONNECTIONS=0``, so every call opens a connection.
+
+    uv run python scripts/bench/connection_reuse.py --waves 10 --concurrency 32 --delay-ms 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+MODES = {"pooled": {}, "no-keepalive": {"DSPY_HTTP_MAX_KEEPALIVE_CONNECTIONS": "0"}}
+
+
+async def _waves(waves: int, concurrency: int) -> list[float]:
+    from src.common.types import ClassificationType
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+
+    predict = get_async_classification_function(ClassificationType.AE_PC)
+
+    async def _one() -> float:
+        started = time.perf_counter()
+        await predict(ComplaintRequest(complaint=f"My pen arrived cracked ({uuid4().hex})."))
+        return (time.perf_counter() - started) * 1000
+
+    latencies: list[float] = []
+    for _ in range(waves):
+        latencies.extend(await asyncio.gather(*(_one() for _ in range(concurrency))))
+    return latencies
+
+
+async def _run(api_base: str, waves: int, concurrency: int) -> None:
+    import litellm
+
+    from src.common.config import configure_lm
+
+    stats_url = api_base.removesuffix("/v1")
+    print(f"{'mode':<14} {'LM calls':>9} {'connections':>12} {'mean ms':>9} {'p95 ms':>8}")
+    async with httpx.AsyncClient(base_url=stats_url) as client:
+        for mode, overrides in MODES.items():
+            for name in MODES["no-keepalive"]:
+                os.environ.pop(name, None)
+            os.environ.update(overrides)
+            # the pool is process-wide and installed once, and LiteLLM caches the SDK clients wrapping it; drop both
+            # so this mode gets its own
+            litellm.aclient_session = litellm.client_session = None
+            litellm.in_memory_llm_clients_cache.flush_cache()
+            configure_lm()
+            await _waves(1, 1)  # warm up outside the measurement
+            (await client.post("/stats/reset")).raise_for_status()
+            latencies = await _waves(waves, concurrency)
+            stats = (await client.get("/stats")).json()
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(
+                f"{mode:<14} {stats['requests']:>9} {stats['connections']:>12} "
+                f"{statistics.mean(latencies):>9.0f} {p95:>8.0f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--waves", type=int, default=10, help="Bursts of concurrent classifications per mode.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Classifications per burst.")
+    parser.add_argument("--delay-ms", type=float, default=200, help="Mock backend latency per LM call.")
+    args = parser.parse_args()
+
+    with running_mock_server(delay_ms=args.delay_ms) as api_base:
+        os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base, DSPY_MODEL_NAME="mock-model")
+        asyncio.run(_run(api_base, args.waves, args.concurrency))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark: accuracy against latency and tokens for each serve-time inference profile.
+
+Runs every complaint in ``data/<type>-classification/test.json`` through the async predictor of each classifier, once
+per profile (``DSPY_INFERENCE_PROFILE``), with ``--concurrency`` requests in flight and the prediction cache off:
+
+- ``full``: the optimized ChainOfThought program as trained (reasoning, label, justification).
+- ``no-reasoning``: the same instructions and demos without the reasoning field.
+- ``label-only``: also without the justification; the response carries an empty one.
+
+Accuracy is only meaningful against a real model (``--api-base`` or the configured provider); the mock backend picks a
+label by keyword, but still shows how many completion tokens and how much decode time each profile saves. The mock
+charges ``--ms-per-token`` for every completion token so the latency columns follow the output length.
+
+    uv run python scripts/bench/inference_profiles.py --mock --concurrency 8
+    uv run python scripts/bench/inference_profiles.py --api-base http://127.0.0.1:8080/v1 --limit 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+
+async def _run_profile(
+    classification_type, profile, examples, concurrency: int
+) -> tuple[float, list[float], float, float]:
+    from src.common.config import get_display_model_name
+    from src.serving.metrics import MetricsRegistry
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+
+    registry = MetricsRegistry()
+    predict = get_async_classification_function(
+        classification_type, use_cache=False, metrics_registry=registry, default_profile=profile
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def _classify(example) -> bool:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await predict(ComplaintRequest(complaint=example.complaint))
+            latencies.append((time.perf_counter() - started) * 1000)
+        return response.classification.strip().lower() == example.classification.strip().lower()
+
+    correct = await asyncio.gather(*(_classify(example) for example in examples))
+    metric = registry.classifier(classification_type, get_display_model_name())
+    return (
+        sum(correct) / len(examples),
+        latencies,
+        metric.prompt_tokens.value / len(examples),
+        metric.completion_tokens.value / len(examples),
+    )
+
+
+async def _run(concurrency: int, limit: int | None) -> None:
+    from src.common.config import configure_lm
+    from src.common.data_utils import prepare_datasets
+    from src.common.types import ClassificationType, InferenceProfile
+
+    configure_lm()
+    print(
+        f"{'classifier':<12} {'profile':<13} {'accuracy':>8} {'prompt tok':>10} {'output tok':>10} "
+        f"{'mean ms':>8} {'p95 ms':>7}"
+    )
+    for classification_type in ClassificationType:
+        _, test = prepare_datasets(classification_type)
+        examples = test[:limit] if limit else test
+        for profile in InferenceProfile:
+            accuracy, latencies, prompt_tokens, completion_tokens = await _run_profile(
+                classification_type, profile, examples, concurrency
+            )
+            print(
+                f"{classification_type:<12} {profile:<13} {accuracy:>8.1%} {prompt_tokens:>10.0f} "
+                f"{completion_tokens:>10.0f} {statistics.mean(latencies):>8.0f} "
+                f"{statistics.quantiles(latencies, n=20)[-1]:>7.0f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="Classifications in flight.")
+    parser.add_argument("--limit", type=int, help="Only use the first N test complaints per classifier.")
+    parser.add_argument("--mock", action="store_true", help="Benchmark against the local mock backend.")
+    parser.add_argument("--delay-ms", type=float, default=20, help="Mock fixed time per LM call.")
+    parser.add_argument("--ms-per-token", type=float, default=2.0, help="Mock decode time per completion token.")
+    parser.add_argument("--api-base", help="Benchmark this OpenAI-compatible server instead of the configured LM.")
+    args = parser.parse_args()
+
+    if args.mock:
+        server = running_mock_server(args.delay_ms, ms_per_token=args.ms_per_token)
+    else:
+        server = contextlib.nullcontext(args.api_base)
+    with server as api_base:
+        if api_base:
+            os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base)
+            os.environ.setdefault("DSPY_MODEL_NAME", "mock-model")
+        asyncio.run(_run(args.concurrency, args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
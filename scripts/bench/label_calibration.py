@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Fit each classifier's ``logprob`` calibration temperature and report the calibration error it removes.
+
+Scores every complaint in ``data/<type>-classification/test.json`` with the ``logprob`` profile, without a
+temperature, and fits the one that minimizes the negative log-likelihood of the true labels (temperature scaling, see
+``src/common/label_scoring.py``). The report shows, before and after scaling:
+
+- ``nll``: mean negative log-likelihood of the true label;
+- ``ece``: expected calibration error of the top label over 10 confidence bins.
+
+``acc`` does not change, since scaling keeps the order of the labels. ``--write`` stores the temperature in the
+artifact's metadata (``label_temperature``, with these numbers in ``label_calibration``), where the serving layer picks
+it up. Complaints whose completion carries no label logprobs are skipped and counted.
+
+Probabilities only mean something against the model that will serve (``--api-base`` or the configured provider); the
+mock's logprobs are made up.
+
+    uv run python scripts/bench/label_calibration.py --mock
+    uv run python scripts/bench/label_calibration.py --api-base http://127.0.0.1:8080/v1 --write
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+
+async def _score(classification_type, examples, concurrency: int) -> tuple[list[dict[str, float]], list[str], int]:
+    """Unscaled label probabilities and true labels of ``examples``, and how many could not be scored."""
+    from dspy.utils.exceptions import AdapterParseError
+
+    from src.common.types import InferenceProfile
+    from src.serving.service import _load_classifier, _resolve_artifact_path
+
+    scorer = _load_classifier(_resolve_artifact_path(classification_type), classification_type).for_profile(
+        InferenceProfile.LOGPROB
+    )
+    scorer.temperature = None
+    canonical = {label.casefold(): label for label in scorer.labels}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probabilities(example) -> dict[str, float] | None:
+        async with semaphore:
+            try:
+                return (await scorer.acall(complaint=example.complaint)).probabilities
+            except AdapterParseError:
+                return None
+
+    scored = await asyncio.gather(*(_probabilities(example) for example in examples))
+    pairs = [
+        (probabilities, canonical.get(example.classification.strip().casefold(), example.classification))
+        for probabilities, example in zip(scored, examples, strict=True)
+        if probabilities is not None
+    ]
+    return [p for p, _ in pairs], [truth for _, truth in pairs], len(examples) - len(pairs)
+
+
+def _write_metadata(classification_type, metadata: dict[str, Any]) -> None:
+    from src.common.paths import get_classifier_artifact_path
+
+    path = get_classifier_artifact_path(classification_type)
+    artifact = json.loads(path.read_text(encoding="utf-8"))
+    artifact.setdefault("metadata", {}).update(metadata)
+    path.write_text(json.dumps(artifact, indent=2) + "\n", encoding="utf-8")
+
+
+async def _run(concurrency: int, limit: int | None, write: bool) -> None:
+    from src.common.config import configure_lm
+    from src.common.data_utils import prepare_datasets
+    from src.common.label_scoring import label_calibration_metadata
+    from src.common.types import ClassificationType
+
+    configure_lm()
+    print(f"{'classifier':<12} {'scored':>6} {'skipped':>7} {'acc':>6} {'temp':>6} {'nll':>13} {'ece':>13}")
+    for classification_type in ClassificationType:
+        _, test = prepare_datasets(classification_type)
+        examples = test[:limit] if limit else test
+        probability_sets, truths, skipped = await _score(classification_type, examples, concurrency)
+        if not truths:
+            print(f"{classification_type:<12} {0:>6} {skipped:>7}  no label logprobs, nothing to fit")
+            continue
+        metadata = label_calibration_metadata(probability_sets, truths)
+        calibration = metadata["label_calibration"]
+        accuracy = sum(
+            max(probabilities, key=probabilities.__getitem__) == truth
+            for probabilities, truth in zip(probability_sets, truths, strict=True)
+        ) / len(truths)
+        print(
+            f"{classification_type:<12} {len(truths):>6} {skipped:>7} {accuracy:>6.1%} "
+            f"{metadata['label_temperature']:>6.2f} "
+            f"{calibration['nll_before']:>6.3f}>{calibration['nll_after']:<6.3f} "
+            f"{calibration['ece_before']:>6.3f}>{calibration['ece_after']:<6.3f}"
+        )
+        if write:
+            _write_metadata(classification_type, metadata)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="Scoring calls in flight.")
+    parser.add_argument("--limit", type=int, help="Only use the first N test complaints per classifier.")
+    parser.add_argument("--write", action="store_true", help="Store each temperature in its artifact's metadata.")
+    parser.add_argument("--mock", action="store_true", help="Score against the local mock backend.")
+    parser.add_argument("--delay-ms", type=float, default=5, help="Mock fixed time per LM call.")
+    parser.add_argument("--api-base", help="Score against this OpenAI-compatible server instead of the configured LM.")
+    args = parser.parse_args()
+
+    server = running_mock_server(args.delay_ms) if args.mock else contextlib.nullcontext(args.api_base)
+    with server as api_base:
+        if api_base:
+            os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base)
+            os.environ.setdefault("DSPY_MODEL_NAME", "mock-model")
+        asyncio.run(_run(args.concurrency, args.limit, args.write))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark: plain concurrent dispatch vs micro-batched dispatch to the LM backend.
+
+Sends ``--requests`` distinct complaints through the async AE/PC predictor in Poisson-ish bursts, once dispatching each
+LM call as soon as it arrives (plain concurrency) and once through a ``MicroBatcher``. One warm-up request runs first,
+and the two modes alternate for ``--rounds`` rounds so neither pays for a cold client or a drifting backend. Prints the
+median throughput and mean/p95 latency of each mode, the batched/plain throughput ratio and the batch-size histogram.
+
+The mock answers every call in a fixed ``--delay-ms`` however many are open, so against it the window can only add
+latency. Whether grouping arrivals buys throughput depends on the backend; llama.cpp's continuous batching already
+decodes concurrent requests together. Run it with ``--api-base`` pointed at the server from ``serve.sh`` before
+setting ``DSPY_MICRO_BATCH_MAX_WAIT_MS``.
+
+    uv run python scripts/bench/micro_batching.py --requests 200 --max-wait-ms 5 --max-batch-size 4
+    uv run python scripts/bench/micro_batching.py --api-base http://127.0.0.1:8080/v1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+
+async def _measure(predict, payloads, arrival_ms: float) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    async def _one(request) -> None:
+        started = time.perf_counter()
+        await predict(request)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    rng = random.Random(0)
+    started = time.perf_counter()
+    tasks = []
+    for request in payloads:
+        tasks.append(asyncio.create_task(_one(request)))
+        await asyncio.sleep(rng.expovariate(1000 / arrival_ms) if arrival_ms > 0 else 0)
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - started, latencies
+
+
+async def _run(requests: int, arrival_ms: float, max_wait_ms: float, max_batch_size: int, rounds: int) -> None:
+    from src.common.config import configure_lm
+    from src.common.types import ClassificationType
+    from src.serving.batching import MicroBatcher
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+
+    configure_lm()
+    payloads = [
+        ComplaintRequest(complaint=f"Complaint #{index}: the pen leaked after use.") for index in range(requests)
+    ]
+
+    batcher = MicroBatcher(max_wait_ms, max_batch_size)
+    modes = {
+        "plain": get_async_classification_function(ClassificationType.AE_PC),
+        "micro-batched": get_async_classification_function(ClassificationType.AE_PC, micro_batcher=batcher),
+    }
+    await modes["plain"](ComplaintRequest(complaint="Warm-up: the pen arrived cracked."))
+
+    throughput: dict[str, list[float]] = {mode: [] for mode in modes}
+    latencies: dict[str, list[float]] = {mode: [] for mode in modes}
+    for round_index in range(rounds):
+        for mode, predict in modes.items():
+            round_payloads = [
+                ComplaintRequest(complaint=f"Round {round_index} {mode}: {payload.complaint}") for payload in payloads
+            ]
+            elapsed, round_latencies = await _measure(predict, round_payloads, arrival_ms)
+            throughput[mode].append(requests / elapsed)
+            latencies[mode].extend(round_latencies)
+
+    print(f"{'mode':<14} {'req/s':>8} {'mean ms':>9} {'p95 ms':>9}")
+    for mode in modes:
+        p95 = statistics.quantiles(latencies[mode], n=20)[-1]
+        print(
+            f"{mode:<14} {statistics.median(throughput[mode]):>8.1f} {statistics.mean(latencies[mode]):>9.0f} "
+            f"{p95:>9.0f}"
+        )
+    ratio = statistics.median(throughput["micro-batched"]) / statistics.median(throughput["plain"])
+    print(f"micro-batched / plain throughput: {ratio:.2f}x over {rounds} rounds")
+    print(f"batch sizes: {batcher.stats()['batch_size']['buckets']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Complaints to send per mode.")
+    parser.add_argument("--arrival-ms", type=float, default=2.0, help="Mean gap between arrivals (0 = all at once).")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Micro-batching window.")
+    parser.add_argument("--max-batch-size", type=int, default=4, help="Dispatch early once this many are queued.")
+    parser.add_argument("--rounds", type=int, default=3, help="Alternating rounds of both modes.")
+    parser.add_argument("--delay-ms", type=float, default=200, help="Mock backend latency per LM call.")
+    parser.add_argument("--api-base", help="Use an existing OpenAI-compatible backend instead of the mock.")
+    args = parser.parse_args()
+
+    server = contextlib.nullcontext(args.api_base) if args.api_base else running_mock_server(delay_ms=args.delay_ms)
+    with server as api_base:
+        os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base)
+        if not args.api_base:
+            os.environ["DSPY_MODEL_NAME"] = "mock-model"
+        asyncio.run(_run(args.requests, args.arrival_ms, args.max_wait_ms, args.max_batch_size, args.rounds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""Local OpenAI-compatible mock LM backend for serving benchmarks.
+
+Answers ``POST /v1/chat/completions`` after a fixed delay with a DSPy chat-formatted completion, so the real
+classifier/adapter stack can run end to end without a model. With ``"stream": true`` the same completion is sent as
+OpenAI SSE chunks spread evenly over the delay, like a model decoding at a constant rate. ``GET /stats`` reports
+request counts, the peak number of concurrently open requests and the number of distinct client connections (TCP
+keep-alive reuse), which is what the benchmarks compare.
+
+With ``--prompt-ms-per-token`` above zero the mock also models llama.cpp's prompt processing: requests run in one of
+``--slots`` server slots, each slot keeps the tokens of its last prompt, and only the tokens after the prefix shared
+with them are charged. A request takes the slot named by ``id_slot``; otherwise, like llama.cpp, the idle slot whose
+cached prompt shares the most with it (if that covers ``--slot-prompt-similarity`` of the prompt) or else the least
+recently used idle slot. Prompt caching follows ``cache_prompt`` (on by default, as in current llama.cpp). Responses
+then carry llama.cpp's ``timings`` and ``usage.prompt_tokens_details.cached_tokens``. ``--ms-per-token`` adds decode
+time per completion token, so programs that ask for fewer output fields answer sooner. A completion longer than
+``max_tokens`` words is cut there, with ``finish_reason: "length"``.
+With ``"logprobs": true`` the completion carries OpenAI-style token logprobs, in which the other labels are
+alternatives to the picked one. A JSON-schema ``response_format`` is answered with a JSON object that satisfies the schema; a ``grammar`` is ignored,
+since the chat-formatted completion already picks one of the advertised labels.
+
+Run it directly or via uvicorn:
+
+    uv run python scripts/bench/mock_llm_server.py --port 8199 --delay-ms 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+DELAY_MS = float(os.getenv("MOCK_LLM_DELAY_MS", "500"))
+SLOTS = 4
+SLOT_PROMPT_SIMILARITY = 0.5
+LABEL_OPTIONS = re.compile(r"One of: ([^\n`]+)")
+
+app = FastAPI(title="Mock LLM backend")
+app.state.delay_ms = DELAY_MS
+app.state.prompt_ms_per_token = 0.0
+app.state.ms_per_token = 0.0
+app.state.slot_prompt_similarity = SLOT_PROMPT_SIMILARITY
+app.state.stats = {
+    "requests": 0,
+    "in_flight": 0,
+    "peak_in_flight": 0,
+    "connections": 0,
+    "prompt_tokens": 0,
+    "cached_tokens": 0,
+    "prompt_ms": 0,
+}
+app.state.peers: set[tuple[str, int]] = set()
+
+
+class _Slot:
+    def __init__(self) -> None:
+        self.tokens: list[str] = []
+        self.busy = False
+        self.last_used = 0
+
+
+app.state.slots = [_Slot() for _ in range(SLOTS)]
+app.state.slots_changed = asyncio.Condition()
+
+
+def _prompt_tokens(messages: list[dict]) -> list[str]:
+    return " ".join(f"<{m.get('role')}> {m.get('content', '')}" for m in messages).split()
+
+
+def _shared_prefix(left: list[str], right: list[str]) -> int:
+    shared = 0
+    for a, b in zip(left, right, strict=False):
+        if a != b:
+            break
+        shared += 1
+    return shared
+
+
+def _pick_idle_slot(tokens: list[str]) -> _Slot | None:
+    idle = [slot for slot in app.state.slots if not slot.busy]
+    if not idle:
+        return None
+    best = max(idle, key=lambda slot: _shared_prefix(slot.tokens, tokens))
+    if _shared_prefix(best.tokens, tokens) >= app.state.slot_prompt_similarity * len(tokens) > 0:
+        return best
+    return min(idle, key=lambda slot: slot.last_used)
+
+
+async def _process_prompt(payload: dict) -> dict[str, int | float]:
+    """Wait for a slot, charge the uncached prompt tokens and return llama.cpp-style ``timings``."""
+    tokens = _prompt_tokens(payload.get("messages", []))
+    id_slot = payload.get("id_slot")
+    slots: list[_Slot] = app.state.slots
+    async with app.state.slots_changed:
+        while True:
+            if isinstance(id_slot, int) and 0 <= id_slot < len(slots):
+                slot = slots[id_slot] if not slots[id_slot].busy else None
+            else:
+                slot = _pick_idle_slot(tokens)
+            if slot is not None:
+                break
+            await app.state.slots_changed.wait()
+        slot.busy = True
+    try:
+        cached = _shared_prefix(slot.tokens, tokens) if payload.get("cache_prompt", True) else 0
+        cached = min(cached, len(tokens) - 1)  # llama.cpp always evaluates at least the last prompt token
+        prompt_ms = (len(tokens) - cached) * app.state.prompt_ms_per_token
+        await asyncio.sleep((prompt_ms + app.state.delay_ms) / 1000)
+        slot.tokens = tokens
+    finally:
+        async with app.state.slots_changed:
+            slot.busy = False
+            slot.last_used = time.monotonic_ns()
+            app.state.slots_changed.notify_all()
+    stats = app.state.stats
+    stats["prompt_tokens"] += len(tokens)
+    stats["cached_tokens"] += cached
+    stats["prompt_ms"] += prompt_ms
+    return {"prompt_n": len(tokens) - cached, "prompt_ms": prompt_ms, "cache_n": cached}
+
+
+def _advertised_labels(messages: list[dict]) -> list[str]:
+    """Labels advertised in the prompt's ``classification`` field description."""
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            match = LABEL_OPTIONS.search(content)
+            if match:
+                return [label.strip() for label in match.group(1).split(", ")]
+    return ["Product Complaint"]
+
+
+def _pick_label(messages: list[dict]) -> str:
+    """Answer with the first label advertised in the prompt."""
+    return _advertised_labels(messages)[0]
+
+
+def _render_logprobs(messages: list[dict], content: str, top_logprobs: int) -> dict:
+    """OpenAI-style ``logprobs`` for ``content``, one token per word (with its leading whitespace).
+
+    Every token is certain except the first word of the label, which gives the picked label 0.8 and splits the rest
+    over the first words of the other advertised labels.
+    """
+    labels = _advertised_labels(messages)
+    label = _pick_label(messages)
+    first_words: dict[str, float] = {}
+    for other in labels:
+        if other != label:
+            word = f"\n{other.split()[0]}"
+            first_words[word] = first_words.get(word, 0.0) + 0.2 / max(len(labels) - 1, 1)
+    entries = []
+    label_start = content.find(f"\n{label}")
+    offset = 0
+    for token in re.findall(r"\s*\S+|\s+", content):
+        top = [{"token": token, "logprob": 0.0}]
+        if offset == label_start:
+            top = [{"token": token, "logprob": math.log(0.8)}]
+            top += [{"token": word, "logprob": math.log(p)} for word, p in first_words.items() if word != token]
+        entries.append({"token": token, "logprob": top[0]["logprob"], "top_logprobs": top[:top_logprobs]})
+        offset += len(token)
+    return {"content": entries}
+
+
+def _render_json_completion(messages: list[dict], schema: dict) -> str:
+    """Answer a JSON-schema ``response_format`` with an object that satisfies it (enums get an allowed value)."""
+    label = _pick_label(messages)
+    answer = {}
+    for name, spec in schema.get("properties", {}).items():
+        if "enum" in spec:
+            answer[name] = label if label in spec["enum"] else spec["enum"][0]
+        else:
+            answer[name] = f"Mock {name} for benchmarking."
+    return json.dumps(answer)
+
+
+def _render_completion(messages: list[dict], response_format: dict | None = None) -> str:
+    """Answer every output field the system prompt asks for, so slimmer programs get shorter completions."""
+    if isinstance(response_format, dict) and response_format.get("type") == "json_schema":
+        return _render_json_completion(messages, response_format["json_schema"].get("schema", {}))
+    system = next((str(m.get("content", "")) for m in messages if m.get("role") == "system"), "")
+
+    def _asks_for(field: str) -> bool:
+        return not system or f"[[ ## {field} ## ]]" in system
+
+    parts = []
+    if _asks_for("reasoning"):
+        parts.append(
+            "[[ ## reasoning ## ]]\nThe complaint describes the reported issue in enough detail to classify it."
+        )
+    parts.append(f"[[ ## classification ## ]]\n{_pick_label(messages)}")
+    if _asks_for("justification"):
+        parts.append(
+            "[[ ## justification ## ]]\n"
+            "Mock backend response for benchmarking. The complaint text names the product and the problem that was "
+            "observed, which matches the selected label better than any of the alternatives offered in the prompt."
+        )
+    parts.append("[[ ## completed ## ]]")
+    return "\n\n".join(parts)
+
+
+def _usage(messages: list[dict], content: str) -> dict[str, int]:
+    prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+    completion_tokens = len(content.split())
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _stream_chunks(payload: dict, content: str) -> StreamingResponse:
+    completion_id = f"chatcmpl-{uuid4().hex}"
+    pieces = re.findall(r"\S+\s*", content)
+    per_piece = app.state.delay_ms / 1000 / max(len(pieces), 1)
+
+    def _chunk(delta: dict, finish_reason: str | None = None, usage: dict | None = None) -> str:
+        body = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        if usage is not None:
+            body["usage"] = usage
+        return f"data: {json.dumps(body)}\n\n"
+
+    async def _events():
+        stats = app.state.stats
+        try:
+            yield _chunk({"role": "assistant", "content": ""})
+            for piece in pieces:
+                await asyncio.sleep(per_piece)
+                yield _chunk({"content": piece})
+            yield _chunk({}, "stop", _usage(payload.get("messages", []), content))
+            yield "data: [DONE]\n\n"
+        finally:
+            stats["in_flight"] -= 1
+
+    return StreamingResponse(_events(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+async def stats() -> dict[str, int | float]:
+    return dict(app.state.stats)
+
+
+@app.post("/stats/reset")
+async def reset_stats() -> dict[str, int | float]:
+    app.state.stats.update(
+        requests=0, in_flight=0, peak_in_flight=0, connections=0, prompt_tokens=0, cached_tokens=0, prompt_ms=0
+    )
+    app.state.peers.clear()
+    for slot in app.state.slots:
+        slot.tokens = []
+    return dict(app.state.stats)
+
+
+@app.post("/v1/chat/completions", response_model=None)
+async def chat_completions(request: Request) -> dict | StreamingResponse:
+    payload = await request.json()
+    stats = app.state.stats
+    stats["requests"] += 1
+    if request.client is not None:
+        # one (host, port) per client TCP connection; a pooled client reuses them across requests
+        app.state.peers.add((request.client.host, request.client.port))
+        stats["connections"] = len(app.state.peers)
+    stats["in_flight"] += 1
+    stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+    if payload.get("stream"):
+        return _stream_chunks(payload, _render_completion(payload.get("messages", []), payload.get("response_format")))
+    timings: dict[str, float] | None = None
+    try:
+        if app.state.prompt_ms_per_token > 0:
+            timings = await _process_prompt(payload)
+        else:
+            await asyncio.sleep(app.state.delay_ms / 1000)
+        content = _render_completion(payload.get("messages", []), payload.get("response_format"))
+        finish_reason = "stop"
+        pieces = re.findall(r"\S+\s*", content)
+        if payload.get("max_tokens") and len(pieces) > payload["max_tokens"]:
+            content, finish_reason = "".join(pieces[: payload["max_tokens"]]).rstrip(), "length"
+        if app.state.ms_per_token > 0:
+            await asyncio.sleep(len(content.split()) * app.state.ms_per_token / 1000)
+    finally:
+        stats["in_flight"] -= 1
+
+    usage = _usage(payload.get("messages", []), content)
+    body = {
+        "id": f"chatcmpl-{uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "mock"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+        "usage": usage,
+    }
+    if payload.get("logprobs"):
+        messages = payload.get("messages", [])
+        body["choices"][0]["logprobs"] = _render_logprobs(messages, content, payload.get("top_logprobs") or 1)
+    if timings is not None:
+        usage["prompt_tokens"] = timings["prompt_n"] + timings["cache_n"]
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        usage["prompt_tokens_details"] = {"cached_tokens": timings["cache_n"]}
+        body["timings"] = timings
+    return body
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def running_mock_server(
+    delay_ms: float = DELAY_MS,
+    port: int | None = None,
+    prompt_ms_per_token: float = 0.0,
+    slots: int = SLOTS,
+    ms_per_token: float = 0.0,
+) -> Iterator[str]:
+    """Run the mock backend in a subprocess and yield its OpenAI-compatible base URL (``.../v1``)."""
+    port = port or free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "--port",
+            str(port),
+            "--delay-ms",
+            str(delay_ms),
+            "--prompt-ms-per-token",
+            str(prompt_ms_per_token),
+            "--slots",
+            str(slots),
+            "--ms-per-token",
+            str(ms_per_token),
+        ],
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/stats", timeout=1.0).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("Mock LLM server failed to start") from None
+                time.sleep(0.1)
+        yield f"{base_url}/v1"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8199)
+    parser.add_argument("--delay-ms", type=float, default=DELAY_MS)
+    parser.add_argument("--prompt-ms-per-token", type=float, default=0.0, help="0 disables the prompt-cache model")
+    parser.add_argument("--slots", type=int, default=SLOTS)
+    parser.add_argument("--ms-per-token", type=float, default=0.0, help="decode time per completion token")
+    parser.add_argument("--slot-prompt-similarity", type=float, default=SLOT_PROMPT_SIMILARITY)
+    args = parser.parse_args()
+
+    app.state.delay_ms = args.delay_ms
+    app.state.prompt_ms_per_token = args.prompt_ms_per_token
+    app.state.ms_per_token = args.ms_per_token
+    app.state.slot_prompt_similarity = args.slot_prompt_similarity
+    app.state.slots = [_Slot() for _ in range(args.slots)]
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark: true- and false-hit rates of the near-duplicate cache (``DSPY_NEAR_DUPLICATE_THRESHOLD``).
+
+Runs offline over the bundled datagen corpora (``data/*/train.json`` and ``test.json``), without an LM. For each
+threshold and classifier:
+
+- ``true hits``: every complaint is indexed, then queried again as a second transcript of the same call, re-rendered
+  with the datagen transcription artifacts (``add_transcription_artifacts``) and with ``--edit-rate`` of its words
+  dropped or repeated. Share of those variants that find their original;
+- ``false hits``: each complaint is looked up against all the *other* complaints of its classifier (leave one out). The
+  corpora hold no duplicates, so any hit is a different complaint answered from someone else's prediction;
+- ``wrong label``: the false hits whose cached label differs from the complaint's own, i.e. the errors the cache
+  would serve;
+- ``us/lookup``: mean time of one :meth:`~src.serving.near_duplicates.NearDuplicateIndex.find`.
+
+    uv run python scripts/bench/near_duplicates.py
+    uv run python scripts/bench/near_duplicates.py --thresholds 0.8 0.9 --edit-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts/datagen"))
+
+from ae_pc_classification_sample_data import add_transcription_artifacts  # noqa: E402
+
+from src.serving.near_duplicates import NearDuplicateIndex  # noqa: E402
+
+
+def _corpus(classification_type) -> list[tuple[str, str]]:
+    """Distinct ``(complaint, label)`` pairs of one classifier's train and test sets."""
+    from src.common.data_utils import prepare_datasets
+
+    seen: dict[str, str] = {}
+    for split in prepare_datasets(classification_type):
+        for example in split:
+            seen.setdefault(example.complaint, example.classification)
+    return list(seen.items())
+
+
+def _variant(text: str, edit_rate: float, rng: random.Random) -> str:
+    """The same complaint as another transcript: new filler words and pauses, a few words dropped or repeated."""
+    words = []
+    for word in text.split():
+        roll = rng.random()
+        if roll < edit_rate / 2:
+            continue
+        words.append(word)
+        if roll > 1 - edit_rate / 2:
+            words.append(word)
+    return add_transcription_artifacts(" ".join(words), 0.3)
+
+
+def _measure(corpus: list[tuple[str, str]], threshold: float, edit_rate: float, seed: int) -> dict[str, float]:
+    index = NearDuplicateIndex(threshold, max_entries=len(corpus))
+    for key, (complaint, _) in enumerate(corpus):
+        index.add("bench", complaint, str(key))
+
+    rng = random.Random(seed)
+    true_hits = sum(index.find("bench", _variant(c, edit_rate, rng)) == str(k) for k, (c, _) in enumerate(corpus))
+
+    false_hits = wrong_label = 0
+    elapsed = 0.0
+    for key, (complaint, label) in enumerate(corpus):
+        index.discard(str(key))
+        started = time.perf_counter()
+        found = index.find("bench", complaint)
+        elapsed += time.perf_counter() - started
+        if found is not None:
+            false_hits += 1
+            wrong_label += corpus[int(found)][1] != label
+        index.add("bench", complaint, str(key))
+    return {
+        "true": true_hits / len(corpus),
+        "false": false_hits / len(corpus),
+        "wrong": wrong_label / len(corpus),
+        "lookup_us": elapsed / len(corpus) * 1e6,
+        "bands": index.bands,
+        "rows": index.rows,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.7, 0.8, 0.85, 0.9, 0.95])
+    parser.add_argument("--edit-rate", type=float, default=0.02, help="Share of words a variant drops or repeats.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from src.common.types import ClassificationType
+
+    corpora = {str(classification_type): _corpus(classification_type) for classification_type in ClassificationType}
+    print(
+        f"{'classifier':<12} {'n':>4} {'threshold':>9} {'bands':>7} {'true hits':>9} {'false hits':>10} "
+        f"{'wrong label':>11} {'us/lookup':>9}"
+    )
+    for threshold in args.thresholds:
+        for name, corpus in corpora.items():
+            result = _measure(corpus, threshold, args.edit_rate, args.seed)
+            print(
+                f"{name:<12} {len(corpus):>4} {threshold:>9.2f} {result['bands']:>3}x{result['rows']:<3} "
+                f"{result['true']:>9.1%} {result['false']:>10.1%} {result['wrong']:>11.1%} "
+                f"{result['lookup_us']:>9.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark: sequential vs speculative two-stage pipeline latency and token overhead.
+
+Runs the real classifiers (async path) against the mock LM backend and prints, per mode, the mean end-to-end latency,
+tokens used by the router + chosen branch, and tokens spent on the discarded speculative branch. A branch cancelled
+mid-generation reports no usage, so the overhead column is a lower bound when the cancelled share is high (the backend
+still processed that branch's prompt). Use the overhead column to decide ``DSPY_PIPELINE_SPECULATIVE`` per deployment.
+
+    uv run python scripts/bench/pipeline_speculation.py --complaints 20 --delay-ms 1500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+COMPLAINTS = [
+    "After my first Ozempic injection, I developed severe hives and my throat started swelling.",
+    "The Ozempic pen I received has a crack in the barrel and is leaking medication.",
+]
+
+
+async def _run(complaints: int) -> None:
+    from src.common.config import configure_lm
+    from src.common.types import ClassificationType
+    from src.serving.pipeline import run_pipeline
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+
+    configure_lm()
+    predictors = [get_async_classification_function(classification_type) for classification_type in ClassificationType]
+    requests = [ComplaintRequest(complaint=COMPLAINTS[i % len(COMPLAINTS)]) for i in range(complaints)]
+
+    print(
+        f"{'mode':<12} {'mean latency (ms)':>18} {'tokens/request':>15} {'overhead tokens/request':>24} "
+        f"{'loser cancelled':>16}"
+    )
+    for speculative in (False, True):
+        responses = [await run_pipeline(*predictors, request, speculative=speculative) for request in requests]
+        latency = statistics.mean(response.latency_ms for response in responses)
+        tokens = statistics.mean(response.tokens.total_tokens for response in responses)
+        overhead = statistics.mean(response.speculative_overhead_tokens.total_tokens for response in responses)
+        cancelled = sum(response.discarded_branch_cancelled for response in responses) / len(responses)
+        mode = "speculative" if speculative else "sequential"
+        print(f"{mode:<12} {latency:>18.0f} {tokens:>15.0f} {overhead:>24.0f} {cancelled:>16.0%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--complaints", type=int, default=20, help="Complaints to run through each mode.")
+    parser.add_argument("--delay-ms", type=float, default=1500, help="Mock backend latency per LM call.")
+    args = parser.parse_args()
+
+    with running_mock_server(delay_ms=args.delay_ms) as api_base:
+        os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base, DSPY_MODEL_NAME="mock-model")
+        asyncio.run(_run(args.complaints))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Benchmark: prompt tokens llama.cpp has to process per request, with and without prefix-cache slot pinning.
+
+Sends ``--requests`` distinct complaints, spread round-robin over the three built-in classifiers, through their async
+predictors with ``--concurrency`` requests in flight:
+
+- ``default``: the stock LM and ``ChatAdapter``. llama.cpp caches prompts (``cache_prompt`` is on by default) and picks
+  a slot by prompt similarity, but under concurrency a classifier often lands in a slot another one just used.
+- ``pinned``: ``DSPY_PREFIX_CACHE=true``. The system prompt and demos are rendered once per classifier, every request
+  carries ``cache_prompt``, and each classifier's calls go to its own slots (``DSPY_LLAMA_SLOTS``).
+
+The mock backend models llama.cpp's slots and charges ``--prompt-ms-per-token`` for every prompt token it cannot take
+from the slot's cache (``--slots`` should match the server's ``-np``). Cached tokens come from the usage the backend
+reports, so ``--api-base`` also works against the llama.cpp server from ``serve.sh``; prompt time is then only visible
+in the latency columns.
+
+    uv run python scripts/bench/prefix_cache.py --requests 240 --concurrency 8 --prompt-ms-per-token 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+MODES = {"default": {"DSPY_PREFIX_CACHE": "false"}, "pinned": {"DSPY_PREFIX_CACHE": "true"}}
+
+
+async def _run_mode(requests: int, concurrency: int, slots: int, pinned: bool) -> tuple[list[float], float, float]:
+    from src.common.config import get_display_model_name
+    from src.common.slots import SlotPinner, assign_slots
+    from src.common.types import ClassificationType
+    from src.serving.metrics import MetricsRegistry
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+
+    registry = MetricsRegistry()
+    pinned_slots = assign_slots(list(ClassificationType), slots) if pinned else {}
+    predictors = [
+        get_async_classification_function(
+            classification_type,
+            metrics_registry=registry,
+            slot_pinner=SlotPinner(pinned_slots[classification_type]) if pinned else None,
+        )
+        for classification_type in ClassificationType
+    ]
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(index)
+    latencies: list[float] = []
+
+    async def _worker() -> None:
+        while not queue.empty():
+            index = queue.get_nowait()
+            started = time.perf_counter()
+            await predictors[index % len(predictors)](
+                ComplaintRequest(complaint=f"My pen arrived cracked and leaked ({uuid4().hex}).")
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    model = get_display_model_name()
+    metrics = [registry.classifier(classification_type, model) for classification_type in ClassificationType]
+    prompt_tokens = sum(metric.prompt_tokens.value for metric in metrics)
+    cached_tokens = sum(metric.cached_prompt_tokens.value for metric in metrics)
+    return latencies, prompt_tokens, cached_tokens
+
+
+async def _run(api_base: str, requests: int, concurrency: int, slots: int, mock: bool) -> None:
+    from src.common.config import configure_lm
+
+    stats_url = api_base.removesuffix("/v1")
+    print(f"{'mode':<9} {'prompt tok/req':>15} {'cached':>7} {'prompt ms/req':>14} {'mean ms':>8} {'p95 ms':>7}")
+    async with httpx.AsyncClient(base_url=stats_url) as client:
+        for mode, overrides in MODES.items():
+            os.environ.update(overrides)
+            configure_lm()
+            if mock:
+                (await client.post("/stats/reset")).raise_for_status()
+            latencies, prompt_tokens, cached_tokens = await _run_mode(requests, concurrency, slots, mode == "pinned")
+            prompt_ms = f"{(await client.get('/stats')).json()['prompt_ms'] / requests:.1f}" if mock else "-"
+            print(
+                f"{mode:<9} {prompt_tokens / requests:>15.0f} {cached_tokens / max(prompt_tokens, 1):>7.0%} "
+                f"{prompt_ms:>14} {statistics.mean(latencies):>8.0f} {statistics.quantiles(latencies, n=20)[-1]:>7.0f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=240, help="Classifications per mode.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Classifications in flight.")
+    parser.add_argument("--slots", type=int, default=4, help="Server slots (llama-server -np).")
+    parser.add_argument("--delay-ms", type=float, default=50, help="Mock decode time per LM call.")
+    parser.add_argument("--prompt-ms-per-token", type=float, default=0.5, help="Mock cost of an uncached prompt token.")
+    parser.add_argument("--api-base", help="Benchmark this OpenAI-compatible llama.cpp server instead of the mock.")
+    args = parser.parse_args()
+
+    server = (
+        contextlib.nullcontext(args.api_base)
+        if args.api_base
+        else running_mock_server(args.delay_ms, prompt_ms_per_token=args.prompt_ms_per_token, slots=args.slots)
+    )
+    with server as api_base:
+        os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base, DSPY_LLAMA_SLOTS=str(args.slots))
+        os.environ.setdefault("DSPY_MODEL_NAME", "mock-model")
+        asyncio.run(_run(api_base, args.requests, args.concurrency, args.slots, mock=args.api_base is None))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
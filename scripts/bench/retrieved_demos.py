@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark: prompt tokens and accuracy with the artifact's demos vs demos retrieved per complaint.
+
+For each classifier, runs every complaint in ``data/<type>-classification/test.json`` through the optimized program
+once with the demos baked into its artifact and once per ``--k`` with the ``k`` most similar training examples from
+the retrieval index (``DSPY_RETRIEVED_DEMOS``, see ``src/common/demo_retrieval.py``). The report shows:
+
+- ``demos``: demos sent per call;
+- ``prompt tok``: mean prompt tokens per call, as the backend reports them;
+- ``same label``: share of retrieved demos labelled like the complaint (how relevant retrieval is, no LM needed);
+- ``acc``: the program's accuracy;
+- ``ms/lookup``: mean time to retrieve one complaint's demos.
+
+Accuracy is only meaningful against a real model (``--api-base`` or the configured provider); the mock backend picks
+a label by keyword and counts words as tokens.
+
+    uv run python scripts/bench/retrieved_demos.py --mock
+    uv run python scripts/bench/retrieved_demos.py --api-base http://127.0.0.1:8080/v1 --k 1 2 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+
+class _PromptTokens:
+    def __init__(self) -> None:
+        self.counts: list[int] = []
+
+    def add_usage(self, lm: str, usage_entry: dict[str, Any]) -> None:
+        self.counts.append(usage_entry.get("prompt_tokens") or 0)
+
+
+async def _evaluate(classifier, examples, concurrency: int) -> tuple[float, float]:
+    """Accuracy and mean prompt tokens of ``classifier`` on ``examples``."""
+    import dspy
+
+    semaphore = asyncio.Semaphore(concurrency)
+    usage = _PromptTokens()
+
+    async def _correct(example) -> bool:
+        async with semaphore:
+            prediction = await classifier.acall(complaint=example.complaint)
+        return prediction.classification.strip().lower() == example.classification.strip().lower()
+
+    with dspy.settings.context(usage_tracker=usage):
+        correct = await asyncio.gather(*(_correct(example) for example in examples))
+    return sum(correct) / len(examples), sum(usage.counts) / max(len(usage.counts), 1)
+
+
+async def _run(ks: list[int], concurrency: int, limit: int | None) -> None:
+    from src.common.config import configure_lm
+    from src.common.data_utils import prepare_datasets
+    from src.common.demo_retrieval import DemoRetriever, demo_index_for
+    from src.common.types import ClassificationType
+    from src.serving.service import _load_classifier, _resolve_artifact_path
+
+    configure_lm()
+    print(f"{'classifier':<12} {'demos':>9} {'prompt tok':>10} {'same label':>10} {'acc':>6} {'ms/lookup':>9}")
+    for classification_type in ClassificationType:
+        _, test = prepare_datasets(classification_type)
+        examples = test[:limit] if limit else test
+        classifier = _load_classifier(_resolve_artifact_path(classification_type), classification_type)
+        classifier.demo_retriever = None
+        accuracy, prompt = await _evaluate(classifier, examples, concurrency)
+        demos = len(classifier.classify.predict.demos)
+        print(f"{classification_type:<12} {f'{demos} fixed':>9} {prompt:>10.0f} {'':>10} {accuracy:>6.1%} {'':>9}")
+
+        index = demo_index_for(classification_type)
+        for k in ks:
+            retriever = DemoRetriever(index, k)
+            started = time.perf_counter()
+            retrieved = [retriever(example.complaint) for example in examples]
+            lookup_ms = (time.perf_counter() - started) / len(examples) * 1000
+            same = sum(
+                demo["classification"] == example.classification
+                for demos, example in zip(retrieved, examples, strict=True)
+                for demo in demos
+            ) / sum(map(len, retrieved))
+            classifier.demo_retriever = retriever
+            accuracy, prompt = await _evaluate(classifier, examples, concurrency)
+            print(
+                f"{classification_type:<12} {f'{k} top-k':>9} {prompt:>10.0f} {same:>10.1%} {accuracy:>6.1%} "
+                f"{lookup_ms:>9.2f}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 2, 4], help="Retrieved demos per call to compare.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Classifications in flight.")
+    parser.add_argument("--limit", type=int, help="Only use the first N test complaints per classifier.")
+    parser.add_argument("--mock", action="store_true", help="Benchmark against the local mock backend.")
+    parser.add_argument("--delay-ms", type=float, default=5, help="Mock fixed time per LM call.")
+    parser.add_argument("--api-base", help="Benchmark this OpenAI-compatible server instead of the configured LM.")
+    args = parser.parse_args()
+
+    server = running_mock_server(args.delay_ms) if args.mock else contextlib.nullcontext(args.api_base)
+    with server as api_base:
+        if api_base:
+            os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base)
+            os.environ.setdefault("DSPY_MODEL_NAME", "mock-model")
+        asyncio.run(_run(args.k, args.concurrency, args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
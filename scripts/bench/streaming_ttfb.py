@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark: time to the classification label, streaming vs non-streaming.
+
+Runs the real AE/PC classifier against the streaming mock LM backend, which decodes the DSPy completion at a constant
+rate over ``--delay-ms``. For each complaint it records the non-streaming latency, then the streaming time to the
+``classification`` event and to ``done``. Complaints are made unique so DSPy's LM cache never answers.
+
+    uv run python scripts/bench/streaming_ttfb.py --complaints 10 --delay-ms 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+
+async def _run(complaints: int) -> None:
+    from src.common.config import configure_lm
+    from src.common.types import ClassificationType
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+    from src.serving.streaming import get_streaming_classification_function
+
+    configure_lm()
+    predict = get_async_classification_function(ClassificationType.AE_PC)
+    stream = get_streaming_classification_function(ClassificationType.AE_PC)
+
+    blocking, to_label, to_done = [], [], []
+    for _ in range(complaints):
+        started = time.perf_counter()
+        await predict(ComplaintRequest(complaint=f"My pen arrived cracked ({uuid4().hex})."))
+        blocking.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        async for event in stream(ComplaintRequest(complaint=f"My pen arrived cracked ({uuid4().hex}).")):
+            elapsed = (time.perf_counter() - started) * 1000
+            if event.event == "classification":
+                to_label.append(elapsed)
+            elif event.event == "done":
+                to_done.append(elapsed)
+
+    print(f"{'measure':<34} {'mean ms':>9}")
+    print(f"{'non-streaming response':<34} {statistics.mean(blocking):>9.0f}")
+    print(f"{'streaming: classification event':<34} {statistics.mean(to_label):>9.0f}")
+    print(f"{'streaming: done event':<34} {statistics.mean(to_done):>9.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--complaints", type=int, default=10, help="Complaints to classify per mode.")
+    parser.add_argument("--delay-ms", type=float, default=3000, help="Mock backend decode time per LM call.")
+    args = parser.parse_args()
+
+    with running_mock_server(delay_ms=args.delay_ms) as api_base:
+        os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base, DSPY_MODEL_NAME="mock-model")
+        asyncio.run(_run(args.complaints))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
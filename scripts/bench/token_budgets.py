@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Derive each classifier's ``max_tokens`` budget from its completion lengths, and the llama.cpp slots it frees.
+
+Runs every complaint in ``data/<type>-classification/test.json`` through the classifier without a budget
+(``DSPY_TOKEN_BUDGETS=false``) and records the prompt and completion tokens of every LM call. The budget is the p99
+completion length times 1.5 (see ``src/common/token_budget.py``). ``--write`` stores it in the artifact's metadata,
+where the serving layer picks it up; training does the same on its final test-set evaluation.
+
+The slot columns divide the llama.cpp context (``serve.sh``: ``-c 32768``) by the longest prompt plus the largest
+completion a call may produce: first with the LM's ``max_tokens=8000``, then with the budget. That is how many slots
+(``-np``) the server can run without a runaway completion overflowing its slot's share of the context.
+
+Completion lengths only mean something against the model that will serve (``--api-base`` or the configured
+provider). The mock writes the same completion every time.
+
+    uv run python scripts/bench/token_budgets.py --mock
+    uv run python scripts/bench/token_budgets.py --api-base http://127.0.0.1:8080/v1 --write
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_llm_server import running_mock_server  # noqa: E402
+
+UNBUDGETED_MAX_TOKENS = 8000
+
+
+class _Usage:
+    def __init__(self) -> None:
+        self.prompt: list[int] = []
+        self.completion: list[int] = []
+
+    def add_usage(self, lm: str, usage_entry: dict[str, Any]) -> None:
+        self.prompt.append(usage_entry.get("prompt_tokens") or 0)
+        self.completion.append(usage_entry.get("completion_tokens") or 0)
+
+
+async def _measure(classification_type, examples, concurrency: int) -> _Usage:
+    import dspy
+
+    from src.serving.service import ComplaintRequest, get_async_classification_function
+
+    predict = get_async_classification_function(classification_type, use_cache=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    usage = _Usage()
+
+    async def _classify(example) -> None:
+        async with semaphore:
+            await predict(ComplaintRequest(complaint=example.complaint))
+
+    with dspy.settings.context(usage_tracker=usage):
+        await asyncio.gather(*(_classify(example) for example in examples))
+    return usage
+
+
+def _write_budget(classification_type, metadata: dict[str, Any]) -> None:
+    from src.common.paths import get_classifier_artifact_path
+
+    path = get_classifier_artifact_path(classification_type)
+    artifact = json.loads(path.read_text(encoding="utf-8"))
+    artifact.setdefault("metadata", {}).update(metadata)
+    path.write_text(json.dumps(artifact, indent=2) + "\n", encoding="utf-8")
+
+
+async def _run(concurrency: int, limit: int | None, context: int, write: bool) -> None:
+    from src.common.config import configure_lm
+    from src.common.data_utils import prepare_datasets
+    from src.common.token_budget import token_budget_metadata
+    from src.common.types import ClassificationType
+
+    configure_lm()
+    print(
+        f"{'classifier':<12} {'calls':>5} {'prompt max':>10} {'p50':>5} {'p99':>5} {'max':>5} {'budget':>6} "
+        f"{'slots @8000':>11} {'slots @budget':>13}"
+    )
+    for classification_type in ClassificationType:
+        _, test = prepare_datasets(classification_type)
+        examples = test[:limit] if limit else test
+        usage = await _measure(classification_type, examples, concurrency)
+        metadata = token_budget_metadata(usage.completion)
+        lengths = metadata["completion_tokens"]
+        longest_prompt = max(usage.prompt)
+        print(
+            f"{classification_type:<12} {len(usage.completion):>5} {longest_prompt:>10} {lengths['p50']:>5} "
+            f"{lengths['p99']:>5} {lengths['max']:>5} {metadata['max_tokens']:>6} "
+            f"{context // (longest_prompt + UNBUDGETED_MAX_TOKENS):>11} "
+            f"{context // (longest_prompt + metadata['max_tokens']):>13}"
+        )
+        if write:
+            _write_budget(classification_type, metadata)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="Classifications in flight.")
+    parser.add_argument("--limit", type=int, help="Only use the first N test complaints per classifier.")
+    parser.add_argument("--context", type=int, default=32768, help="llama.cpp total context (-c) to split into slots.")
+    parser.add_argument("--write", action="store_true", help="Store each budget in its artifact's metadata.")
+    parser.add_argument("--mock", action="store_true", help="Measure against the local mock backend.")
+    parser.add_argument("--delay-ms", type=float, default=5, help="Mock fixed time per LM call.")
+    parser.add_argument("--api-base", help="Measure this OpenAI-compatible server instead of the configured LM.")
+    args = parser.parse_args()
+
+    os.environ["DSPY_TOKEN_BUDGETS"] = "false"
+    server = running_mock_server(args.delay_ms) if args.mock else contextlib.nullcontext(args.api_base)
+    with server as api_base:
+        if api_base:
+            os.environ.update(DSPY_PROVIDER="local", DSPY_LOCAL_BASE=api_base)
+            os.environ.setdefault("DSPY_MODEL_NAME", "mock-model")
+        asyncio.run(_run(args.concurrency, args.limit, args.context, args.write))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,9 @@ EXPECTED_OPERATIONS = {
     "/classify/ae-pc": "classifyAePc",
     "/classify/ae-category": "classifyAeCategory",
     "/classify/pc-category": "classifyPcCategory",
+    "/classify/ae-pc/batch": "classifyAePcBatch",
+    "/classify/ae-category/batch": "classifyAeCategoryBatch",
+    "/classify/pc-category/batch": "classifyPcCategoryBatch",
 }
 UNSUPPORTED_COMBINERS = {"anyOf", "oneOf", "allOf"}
 
@@ -36,7 +36,7 @@ trap cleanup EXIT INT TERM
     -ngl 999 `# offload all layers to GPU` \
     -fa on `# flash attention - faster, less VRAM` \
     -c 32768 `# total context (divided across parallel slots)` \
-    -np 4 `# parallel slots for concurrent requests (8K ctx each)` \
+    -np 4 `# parallel slots for concurrent requests (8K ctx each); keep DSPY_LLAMA_SLOTS in sync` \
     -b 4096 `# logical batch size` \
     -ub 1024 `# physical GPU batch size, tune for VRAM` \
     -ctk q8_0 `# quantize KV cache keys - saves VRAM` \
@@ -1,26 +1,68 @@
-"""Core DSPy Ozempic classifier package."""
-
-from .common import (
-    CLASSIFICATION_CONFIGS,
-    ClassificationConfig,
-    ComplaintClassifier,
-    classification_metric,
-    configure_lm,
-    create_classification_signature,
-    evaluate_model,
-    prepare_datasets,
-)
-from .serving.service import (
-    AECategoryRequest,
-    AEPCRequest,
-    ComplaintRequest,
-    ComplaintResponse,
-    PCCategoryRequest,
-    get_ae_category_classifier,
-    get_ae_pc_classifier,
-    get_classification_function,
-    get_pc_category_classifier,
-)
+"""Core DSPy Ozempic classifier package.
+
+Exports are resolved lazily (PEP 562): ``import src.api.app`` must not import DSPy, LiteLLM or MLflow, which are
+loaded on first use instead.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .common import (
+        CLASSIFICATION_CONFIGS,
+        ClassificationConfig,
+        ComplaintClassifier,
+        classification_metric,
+        configure_lm,
+        create_classification_signature,
+        evaluate_model,
+        prepare_datasets,
+    )
+    from .serving.service import (
+        AECategoryRequest,
+        AEPCRequest,
+        ComplaintRequest,
+        ComplaintResponse,
+        PCCategoryRequest,
+        get_ae_category_classifier,
+        get_ae_pc_classifier,
+        get_async_classification_function,
+        get_classification_function,
+        get_pc_category_classifier,
+    )
+
+_EXPORTS: dict[str, str] = {
+    "CLASSIFICATION_CONFIGS": ".common",
+    "ClassificationConfig": ".common",
+    "create_classification_signature": ".common",
+    "ComplaintClassifier": ".common",
+    "classification_metric": ".common",
+    "configure_lm": ".common",
+    "evaluate_model": ".common",
+    "prepare_datasets": ".common",
+    "ComplaintRequest": ".serving.service",
+    "AEPCRequest": ".serving.service",
+    "AECategoryRequest": ".serving.service",
+    "PCCategoryRequest": ".serving.service",
+    "ComplaintResponse": ".serving.service",
+    "get_ae_pc_classifier": ".serving.service",
+    "get_ae_category_classifier": ".serving.service",
+    "get_pc_category_classifier": ".serving.service",
+    "get_classification_function": ".serving.service",
+    "get_async_classification_function": ".serving.service",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "CLASSIFICATION_CONFIGS",
@@ -40,4 +82,5 @@ __all__ = [
     "get_ae_category_classifier",
     "get_pc_category_classifier",
     "get_classification_function",
+    "get_async_classification_function",
 ]
@@ -2,51 +2,278 @@
 
 from __future__ import annotations
 
+import asyncio
+import secrets
+import time
+from collections.abc import Callable
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import FastAPI, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from loguru import logger
 
-from ..common.config import configure_lm
-from ..common.types import ClassificationType
+from ..common.config import EnvironmentSettings, configure_lm, create_lm, load_llm_config
+from ..common.slots import SlotPinner, assign_slots
+from ..common.types import ClassificationType, InferenceProfile
+from ..serving.admission import AdmissionController, AdmissionRejected
+from ..serving.batching import MicroBatcher
+from ..serving.cache import PredictionCache
+from ..serving.hedging import RequestHedger
+from ..serving.metrics import MetricsRegistry
+from ..serving.pipeline import PipelineRequest, PipelineResponse, run_pipeline
+from ..serving.registry import ArtifactEntry, ClassifierRegistry, UnknownClassificationType
+from ..serving.reload import ArtifactReloader, ReloadResponse
 from ..serving.service import (
+    DEFAULT_BATCH_CONCURRENCY,
     AECategoryRequest,
     AEPCRequest,
+    AsyncClassificationFunction,
+    BatchComplaintRequest,
+    BatchComplaintResponse,
+    ComplaintRequest,
     ComplaintResponse,
     PCCategoryRequest,
-    get_ae_category_classifier,
-    get_ae_pc_classifier,
-    get_pc_category_classifier,
+    SingleFlight,
+    classify_batch,
+    get_async_classification_function,
 )
+from ..serving.store import PersistentPredictionStore
+from ..serving.streaming import (
+    ClassificationStreamEvent,
+    StreamingClassificationFunction,
+    get_streaming_classification_function,
+)
+
+if TYPE_CHECKING:
+    import dspy
+
+    from ..common.cascade import NgramClassifier
+
+# a lazy load that failed is retried after this delay, doubled after every further failure up to the maximum
+_LAZY_LOAD_RETRY_SECONDS = 1.0
+_LAZY_LOAD_RETRY_MAX_SECONDS = 60.0
+
+# app.state attribute and display name for each classifier's loaded predictor
+_PREDICTORS: dict[ClassificationType, tuple[str, str]] = {
+    ClassificationType.AE_PC: ("ae_pc_predictor", "AE-PC"),
+    ClassificationType.AE_CATEGORY: ("ae_category_predictor", "AE-Category"),
+    ClassificationType.PC_CATEGORY: ("pc_category_predictor", "PC-Category"),
+}
 
 
 @asynccontextmanager
 async def _lifespan(app: FastAPI):
-    configure_lm()
+    env = EnvironmentSettings()  # pyright: ignore[reportCallIssue]
+    app.state.lazy_load = not env.preload_classifiers
+    app.state.lm = None
+    app.state.lm_lock = asyncio.Lock()
+    app.state.load_locks = {}
+    app.state.load_retries = {}
+    if env.preload_classifiers:
+        app.state.lm = configure_lm()
 
     app.state.errors = {}
+    app.state.batch_max_concurrency = env.batch_max_concurrency or DEFAULT_BATCH_CONCURRENCY
+    app.state.pipeline_speculative = env.pipeline_speculative
+    app.state.inference_profile = env.inference_profile
+    app.state.classifier_profiles = env.classifier_profiles
+    app.state.cascade = env.cascade
+    app.state.cascade_threshold = env.cascade_threshold
+    prediction_store = (
+        PersistentPredictionStore(env.prediction_store_path, max_bytes=env.prediction_store_max_mb * 1024 * 1024)
+        if env.prediction_store_path
+        else None
+    )
+    app.state.prediction_cache = (
+        PredictionCache(
+            max(env.prediction_cache_size, 0),
+            env.prediction_cache_ttl_seconds,
+            store=prediction_store,
+            response_model=ComplaintResponse,
+        )
+        if env.prediction_cache_size > 0 or prediction_store is not None
+        else None
+    )
+    # lookups resolve to prediction-cache keys, so the index only works alongside the cache
+    app.state.near_duplicates = None
+    if env.near_duplicate_threshold > 0 and app.state.prediction_cache is not None:
+        from ..serving.near_duplicates import NearDuplicateIndex
+
+        app.state.near_duplicates = NearDuplicateIndex(
+            env.near_duplicate_threshold, max(env.near_duplicate_max_entries, 1)
+        )
 
-    try:
-        app.state.ae_pc_predictor = get_ae_pc_classifier()
-    except FileNotFoundError as exc:
-        app.state.ae_pc_predictor = None
-        app.state.errors[ClassificationType.AE_PC] = str(exc)
+    app.state.single_flight = SingleFlight[ComplaintResponse]()
+    app.state.micro_batchers = (
+        {
+            classification_type: MicroBatcher(env.micro_batch_max_wait_ms, env.micro_batch_max_size)
+            for classification_type in _PREDICTORS
+        }
+        if env.micro_batch_max_wait_ms > 0
+        else {}
+    )
+
+    app.state.admission = (
+        {
+            classification_type: AdmissionController(
+                env.admission_max_in_flight, env.admission_max_queue, env.admission_max_queue_ms
+            )
+            for classification_type in _PREDICTORS
+        }
+        if env.admission_max_in_flight > 0
+        else {}
+    )
+    app.state.hedgers = (
+        {
+            classification_type: RequestHedger(env.hedge_percentile, env.hedge_max_extra_ratio, env.hedge_min_delay_ms)
+            for classification_type in _PREDICTORS
+        }
+        if env.hedge_percentile > 0
+        else {}
+    )
+    app.state.hedge_backup_base = env.hedge_backup_base
+    app.state.hedge_lm = None
+    # Artifacts found by the registry are not pinned; llama.cpp picks a slot for them.
+    app.state.slot_pinners = (
+        {
+            classification_type: SlotPinner(slots)
+            for classification_type, slots in assign_slots(list(_PREDICTORS), env.llama_slots).items()
+        }
+        if env.prefix_cache
+        else {}
+    )
+    app.state.metrics = MetricsRegistry()
+    app.state.streamers = {}
+    app.state.admin_token = env.admin_token
+
+    for state_attr, _ in _PREDICTORS.values():
+        setattr(app.state, state_attr, None)
+    app.state.reloader = ArtifactReloader(
+        lambda classification_type: _build_classifier(app, classification_type),
+        lambda classification_type, built: _install_classifier(app, classification_type, built),
+        prediction_cache=app.state.prediction_cache,
+    )
+    if env.preload_classifiers:
+        for result in await app.state.reloader.reload_all():
+            if result.status == "failed":
+                app.state.errors[ClassificationType(result.classification_type)] = result.error
+
+    def _build_registered(entry: ArtifactEntry) -> AsyncClassificationFunction:
+        classification_type = entry.classification_type
+        if env.micro_batch_max_wait_ms > 0:
+            app.state.micro_batchers.setdefault(
+                classification_type, MicroBatcher(env.micro_batch_max_wait_ms, env.micro_batch_max_size)
+            )
+        if env.admission_max_in_flight > 0:
+            app.state.admission.setdefault(
+                classification_type,
+                AdmissionController(env.admission_max_in_flight, env.admission_max_queue, env.admission_max_queue_ms),
+            )
+        if env.hedge_percentile > 0:
+            app.state.hedgers.setdefault(
+                classification_type,
+                RequestHedger(env.hedge_percentile, env.hedge_max_extra_ratio, env.hedge_min_delay_ms),
+            )
+        return get_async_classification_function(
+            classification_type,
+            prediction_cache=app.state.prediction_cache,
+            single_flight=app.state.single_flight,
+            micro_batcher=app.state.micro_batchers.get(classification_type),
+            admission=app.state.admission.get(classification_type),
+            metrics_registry=app.state.metrics,
+            model_path=entry.path,
+            classification_config=entry.config,
+            hedger=app.state.hedgers.get(classification_type),
+            hedge_lm=_hedge_lm(app),
+            default_profile=_default_profile(app, classification_type),
+            near_duplicates=app.state.near_duplicates,
+        )
 
-    try:
-        app.state.ae_category_predictor = get_ae_category_classifier()
-    except FileNotFoundError as exc:
-        app.state.ae_category_predictor = None
-        app.state.errors[ClassificationType.AE_CATEGORY] = str(exc)
+    # Other artifacts are only indexed and loaded when a request names them, so startup cost does not grow with them.
+    app.state.classifier_registry = ClassifierRegistry(
+        _build_registered,
+        max_loaded=env.classifier_registry_max_loaded,
+        max_bytes=env.classifier_registry_max_mb * 1024 * 1024,
+        prediction_cache=app.state.prediction_cache,
+    )
 
-    try:
-        app.state.pc_category_predictor = get_pc_category_classifier()
-    except FileNotFoundError as exc:
-        app.state.pc_category_predictor = None
-        app.state.errors[ClassificationType.PC_CATEGORY] = str(exc)
+    watcher = (
+        asyncio.create_task(app.state.reloader.watch(env.artifact_reload_interval_seconds))
+        if env.artifact_reload_interval_seconds > 0
+        else None
+    )
 
     yield
 
+    if watcher is not None:
+        watcher.cancel()
+    if prediction_store is not None:
+        prediction_store.close()
+
+
+def _hedge_lm(app: FastAPI) -> dspy.BaseLM | None:
+    """The LM hedges go to when ``DSPY_HEDGE_BACKUP_BASE`` names a second backend (built on first use)."""
+    if not app.state.hedgers or app.state.hedge_backup_base is None:
+        return None
+    if app.state.hedge_lm is None:
+        cfg = load_llm_config()
+        app.state.hedge_lm = create_lm(cfg.model_copy(update={"api_base": app.state.hedge_backup_base, "backends": []}))
+    return app.state.hedge_lm
+
+
+def _default_profile(app: FastAPI, classification_type: str) -> InferenceProfile:
+    """``DSPY_CLASSIFIER_PROFILES`` entry for the classifier, else ``DSPY_INFERENCE_PROFILE``."""
+    return app.state.classifier_profiles.get(classification_type, app.state.inference_profile)
+
+
+def _first_stage(app: FastAPI, classification_type: ClassificationType) -> NgramClassifier | None:
+    """The n-gram first stage with ``DSPY_CASCADE``, trained on the classifier's ``train.json`` on first use."""
+    if not app.state.cascade:
+        return None
+    from ..common.cascade import first_stage_for
+
+    return first_stage_for(classification_type).with_threshold(app.state.cascade_threshold)
+
+
+def _build_classifier(
+    app: FastAPI, classification_type: ClassificationType
+) -> tuple[AsyncClassificationFunction, StreamingClassificationFunction]:
+    """Create the predictor and streamer for the artifact currently on disk, wired to the app's shared components."""
+    predictor = get_async_classification_function(
+        classification_type,
+        prediction_cache=app.state.prediction_cache,
+        single_flight=app.state.single_flight,
+        micro_batcher=app.state.micro_batchers.get(classification_type),
+        admission=app.state.admission.get(classification_type),
+        metrics_registry=app.state.metrics,
+        hedger=app.state.hedgers.get(classification_type),
+        hedge_lm=_hedge_lm(app),
+        slot_pinner=app.state.slot_pinners.get(classification_type),
+        default_profile=_default_profile(app, classification_type),
+        first_stage=_first_stage(app, classification_type),
+        near_duplicates=app.state.near_duplicates,
+    )
+    streamer = get_streaming_classification_function(
+        classification_type, prediction_cache=app.state.prediction_cache, metrics_registry=app.state.metrics
+    )
+    return predictor, streamer
+
+
+def _install_classifier(
+    app: FastAPI,
+    classification_type: ClassificationType,
+    built: tuple[AsyncClassificationFunction, StreamingClassificationFunction],
+) -> None:
+    """Publish a built classifier; requests that already looked up the previous one finish on it."""
+    predictor, streamer = built
+    state_attr, _ = _PREDICTORS[classification_type]
+    setattr(app.state, state_attr, predictor)
+    app.state.streamers = {**app.state.streamers, classification_type: streamer}
+    app.state.errors.pop(classification_type, None)
+    app.state.load_retries.pop(classification_type, None)
+
 
 app = FastAPI(
     title="DSPy Complaint Classifier API",
@@ -77,6 +304,125 @@ async def request_id_middleware(request: Request, call_next):
     return response
 
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def _ensure_lm() -> None:
+    """Configure the LM once; with lazy loading this is where DSPy and LiteLLM get imported."""
+    if app.state.lm is not None:
+        return
+    async with app.state.lm_lock:
+        if app.state.lm is None:
+            app.state.lm = await asyncio.to_thread(configure_lm)
+
+
+async def _ensure_loaded(classification_type: ClassificationType) -> None:
+    """With ``DSPY_PRELOAD_CLASSIFIERS=false``, load a built-in classifier on its first request.
+
+    After a failed load, requests get 503 until the backoff in ``app.state.load_retries`` has passed; the next request
+    then tries again. A successful ``/admin/reload`` installs the classifier and clears the failure at once.
+    """
+    state_attr, _ = _PREDICTORS[classification_type]
+    if not getattr(app.state, "lazy_load", False) or getattr(app.state, state_attr, None) is not None:
+        return
+    async with app.state.load_locks.setdefault(classification_type, asyncio.Lock()):
+        if getattr(app.state, state_attr, None) is not None:
+            return
+        failures, retry_at = app.state.load_retries.get(classification_type, (0, 0.0))
+        if time.monotonic() < retry_at:
+            return
+        await _ensure_lm()
+        result = await app.state.reloader.reload(classification_type)
+        if result.status == "failed":
+            app.state.errors[classification_type] = result.error
+            delay = min(_LAZY_LOAD_RETRY_MAX_SECONDS, _LAZY_LOAD_RETRY_SECONDS * 2**failures)
+            app.state.load_retries[classification_type] = (failures + 1, time.monotonic() + delay)
+
+
+async def _require_predictor(classification_type: ClassificationType) -> AsyncClassificationFunction:
+    """Return the loaded predictor for ``classification_type`` or raise 503 with the load error."""
+    await _ensure_loaded(classification_type)
+    state_attr, _ = _PREDICTORS[classification_type]
+    predictor = getattr(app.state, state_attr, None)
+    if predictor is None:
+        raise _unavailable(classification_type)
+    return predictor
+
+
+def _unavailable(classification_type: ClassificationType) -> HTTPException:
+    _, display_name = _PREDICTORS[classification_type]
+    errors = getattr(app.state, "errors", {})
+    error_detail = errors.get(classification_type, "Classifier artifact not loaded")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"{display_name} classifier unavailable: {error_detail}",
+    )
+
+
+async def _classify_batch(
+    classification_type: ClassificationType,
+    payload: BatchComplaintRequest,
+) -> BatchComplaintResponse:
+    predictor = await _require_predictor(classification_type)
+    max_concurrency = getattr(app.state, "batch_max_concurrency", DEFAULT_BATCH_CONCURRENCY)
+    return await classify_batch(predictor, payload.items, classification_type, max_concurrency=max_concurrency)
+
+
+async def _stream_classification(
+    classification_type: ClassificationType,
+    payload: ComplaintRequest,
+) -> StreamingResponse:
+    await _ensure_loaded(classification_type)
+    streamer: StreamingClassificationFunction | None = getattr(app.state, "streamers", {}).get(classification_type)
+    if streamer is None:
+        raise _unavailable(classification_type)
+
+    # Admit before the 200 goes out so a shed stream still gets a proper 429/503 + Retry-After.
+    admission: AdmissionController | None = getattr(app.state, "admission", {}).get(classification_type)
+    if admission is not None:
+        await admission.acquire()
+
+    async def _events():
+        try:
+            async for event in streamer(payload):
+                yield event.encode()
+        except Exception as exc:
+            yield ClassificationStreamEvent(event="error", data={"error": f"{type(exc).__name__}: {exc}"}).encode()
+
+    return _AdmittedStreamingResponse(
+        _events(),
+        admission.release if admission is not None else None,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class _AdmittedStreamingResponse(StreamingResponse):
+    """``StreamingResponse`` that gives its admission slot back however the response ends.
+
+    Releasing in the body generator's ``finally`` misses responses whose body is never iterated: a client that
+    disconnects, or a task cancelled, before the first chunk. Sending the response is the one step every admitted
+    stream goes through, so the slot is released when it returns or raises.
+    """
+
+    def __init__(self, content: Any, release: Callable[[], None] | None, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self._release = release
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self._release is not None:
+                self._release()
+
+
 @app.get("/", tags=["system"], summary="API Root")
 def root() -> dict[str, str | dict[str, str]]:
     return {
@@ -86,10 +432,19 @@ def root() -> dict[str, str | dict[str, str]]:
         "docs": "/docs",
         "redoc": "/redoc",
         "health": "/health",
+        "metrics": "/metrics",
         "endpoints": {
             "ae_pc": "/classify/ae-pc",
             "ae_category": "/classify/ae-category",
             "pc_category": "/classify/pc-category",
+            "ae_pc_batch": "/classify/ae-pc/batch",
+            "ae_category_batch": "/classify/ae-category/batch",
+            "pc_category_batch": "/classify/pc-category/batch",
+            "ae_pc_stream": "/classify/ae-pc/stream",
+            "ae_category_stream": "/classify/ae-category/stream",
+            "pc_category_stream": "/classify/pc-category/stream",
+            "pipeline": "/classify/pipeline",
+            "by_type": "/classify/{classification_type}",
         },
     }
 
@@ -98,25 +453,119 @@ def root() -> dict[str, str | dict[str, str]]:
 def healthcheck() -> dict[str, str | dict]:
     errors = getattr(app.state, "errors", {})
 
-    classifier_status = {
-        ClassificationType.AE_PC: "ok" if getattr(app.state, "ae_pc_predictor", None) else "unavailable",
-        ClassificationType.AE_CATEGORY: "ok" if getattr(app.state, "ae_category_predictor", None) else "unavailable",
-        ClassificationType.PC_CATEGORY: "ok" if getattr(app.state, "pc_category_predictor", None) else "unavailable",
-    }
+    lazy_load = getattr(app.state, "lazy_load", False)
+
+    classifier_status: dict[ClassificationType, str] = {}
+    for classification_type, (state_attr, _) in _PREDICTORS.items():
+        if getattr(app.state, state_attr, None):
+            classifier_status[classification_type] = "ok"
+        elif lazy_load and classification_type not in errors:
+            classifier_status[classification_type] = "not_loaded"  # loads on its first request
+        else:
+            classifier_status[classification_type] = "unavailable"
 
-    overall_status = "ok" if all(s == "ok" for s in classifier_status.values()) else "degraded"
+    overall_status = "ok" if all(s in ("ok", "not_loaded") for s in classifier_status.values()) else "degraded"
 
     response = {
         "status": overall_status,
         "classifiers": classifier_status,
     }
 
+    prediction_cache = getattr(app.state, "prediction_cache", None)
+    if prediction_cache is not None:
+        response["prediction_cache"] = prediction_cache.stats()
+    near_duplicates = getattr(app.state, "near_duplicates", None)
+    if near_duplicates is not None:
+        response["near_duplicates"] = near_duplicates.stats()
+    single_flight = getattr(app.state, "single_flight", None)
+    if single_flight is not None:
+        response["single_flight"] = single_flight.stats()
+    admission = getattr(app.state, "admission", {})
+    if admission:
+        response["admission"] = {
+            str(classification_type): controller.stats() for classification_type, controller in list(admission.items())
+        }
+        if any(controller.saturated for controller in list(admission.values())) and response["status"] == "ok":
+            response["status"] = "saturated"
+    reloader = getattr(app.state, "reloader", None)
+    if reloader is not None:
+        response["artifacts"] = reloader.stats()
+    classifier_registry = getattr(app.state, "classifier_registry", None)
+    if classifier_registry is not None:
+        response["classifier_registry"] = classifier_registry.stats()
+    lm = getattr(app.state, "lm", None)
+    if lm is not None:
+        from ..common.router import RoutedLM  # DSPy is already loaded once there is an LM
+
+        if isinstance(lm, RoutedLM):
+            response["lm_backends"] = lm.stats()
+    slot_pinners = getattr(app.state, "slot_pinners", {})
+    if slot_pinners:
+        response["llama_slots"] = {
+            str(classification_type): pinner.stats() for classification_type, pinner in list(slot_pinners.items())
+        }
+    hedgers = getattr(app.state, "hedgers", {})
+    if hedgers:
+        response["hedging"] = {
+            str(classification_type): hedger.stats() for classification_type, hedger in list(hedgers.items())
+        }
+    micro_batchers = getattr(app.state, "micro_batchers", {})
+    if micro_batchers:
+        response["micro_batching"] = {
+            str(classification_type): batcher.stats() for classification_type, batcher in list(micro_batchers.items())
+        }
+
     if errors:
         response["errors"] = errors
 
     return response
 
 
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["system"],
+    summary="Prometheus metrics",
+    include_in_schema=False,
+)
+def metrics() -> PlainTextResponse:
+    registry: MetricsRegistry | None = getattr(app.state, "metrics", None)
+    body = registry.render() if registry is not None else ""
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.post(
+    "/admin/reload",
+    response_model=ReloadResponse,
+    tags=["admin"],
+    summary="Reload classifier artifacts",
+    include_in_schema=False,
+)
+async def reload_artifacts(
+    classification_type: ClassificationType | None = None,
+    force: bool = False,
+    x_admin_token: str | None = Header(None),
+) -> JSONResponse:
+    admin_token: str | None = getattr(app.state, "admin_token", None)
+    if not admin_token:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Set DSPY_ADMIN_TOKEN to enable admin routes")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+    reloader: ArtifactReloader | None = getattr(app.state, "reloader", None)
+    if reloader is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Reloader not initialized")
+
+    if classification_type is None:
+        results = await reloader.reload_all(force=force)
+    else:
+        results = [await reloader.reload(classification_type, force=force)]
+    failed = any(result.status == "failed" for result in results)
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT if failed else status.HTTP_200_OK,
+        content=ReloadResponse(results=results).model_dump(mode="json"),
+    )
+
+
 @app.post(
     "/classify/ae-pc",
     response_model=ComplaintResponse,
@@ -128,15 +577,9 @@ def healthcheck() -> dict[str, str | dict]:
     ),
     tags=["classification"],
 )
-def classify_ae_pc(payload: AEPCRequest) -> ComplaintResponse:
-    predictor = getattr(app.state, "ae_pc_predictor", None)
-    if predictor is None:
-        error_detail = app.state.errors.get(ClassificationType.AE_PC, "Classifier artifact not loaded")
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"AE-PC classifier unavailable: {error_detail}",
-        )
-    return predictor(payload)
+async def classify_ae_pc(payload: AEPCRequest) -> ComplaintResponse:
+    predictor = await _require_predictor(ClassificationType.AE_PC)
+    return await predictor(payload)
 
 
 @app.post(
@@ -150,15 +593,9 @@ def classify_ae_pc(payload: AEPCRequest) -> ComplaintResponse:
     ),
     tags=["classification"],
 )
-def classify_ae_category(payload: AECategoryRequest) -> ComplaintResponse:
-    predictor = getattr(app.state, "ae_category_predictor", None)
-    if predictor is None:
-        error_detail = app.state.errors.get(ClassificationType.AE_CATEGORY, "Classifier artifact not loaded")
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"AE-Category classifier unavailable: {error_detail}",
-        )
-    return predictor(payload)
+async def classify_ae_category(payload: AECategoryRequest) -> ComplaintResponse:
+    predictor = await _require_predictor(ClassificationType.AE_CATEGORY)
+    return await predictor(payload)
 
 
 @app.post(
@@ -172,15 +609,160 @@ def classify_ae_category(payload: AECategoryRequest) -> ComplaintResponse:
     ),
     tags=["classification"],
 )
-def classify_pc_category(payload: PCCategoryRequest) -> ComplaintResponse:
-    predictor = getattr(app.state, "pc_category_predictor", None)
-    if predictor is None:
-        error_detail = app.state.errors.get(ClassificationType.PC_CATEGORY, "Classifier artifact not loaded")
+async def classify_pc_category(payload: PCCategoryRequest) -> ComplaintResponse:
+    predictor = await _require_predictor(ClassificationType.PC_CATEGORY)
+    return await predictor(payload)
+
+
+_BATCH_DESCRIPTION = (
+    "Accepts up to 500 complaints and classifies them concurrently (bounded by `DSPY_BATCH_MAX_CONCURRENCY`). "
+    "Results are returned in input order; an item that fails is reported with `ok=false` and an `error` message "
+    "instead of failing the whole batch."
+)
+
+
+@app.post(
+    "/classify/ae-pc/batch",
+    response_model=BatchComplaintResponse,
+    operation_id="classifyAePcBatch",
+    summary="Batch-classify complaints as Adverse Event or Product Complaint",
+    description=_BATCH_DESCRIPTION,
+    tags=["classification"],
+)
+async def classify_ae_pc_batch(payload: BatchComplaintRequest) -> BatchComplaintResponse:
+    return await _classify_batch(ClassificationType.AE_PC, payload)
+
+
+@app.post(
+    "/classify/ae-category/batch",
+    response_model=BatchComplaintResponse,
+    operation_id="classifyAeCategoryBatch",
+    summary="Batch-classify Adverse Events into medical categories",
+    description=_BATCH_DESCRIPTION,
+    tags=["classification"],
+)
+async def classify_ae_category_batch(payload: BatchComplaintRequest) -> BatchComplaintResponse:
+    return await _classify_batch(ClassificationType.AE_CATEGORY, payload)
+
+
+@app.post(
+    "/classify/pc-category/batch",
+    response_model=BatchComplaintResponse,
+    operation_id="classifyPcCategoryBatch",
+    summary="Batch-classify Product Complaints into quality/defect categories",
+    description=_BATCH_DESCRIPTION,
+    tags=["classification"],
+)
+async def classify_pc_category_batch(payload: BatchComplaintRequest) -> BatchComplaintResponse:
+    return await _classify_batch(ClassificationType.PC_CATEGORY, payload)
+
+
+_STREAM_DESCRIPTION = (
+    "Server-Sent Events variant of the classify route. Emits `event: classification` with the label as soon as it is "
+    "decoded, then `event: justification` text deltas as they are generated, and finally `event: done` with the "
+    "complete response (or `event: error`)."
+)
+_STREAM_RESPONSES: dict[int | str, dict] = {200: {"content": {"text/event-stream": {}}}}
+
+
+@app.post(
+    "/classify/ae-pc/stream",
+    response_class=StreamingResponse,
+    responses=_STREAM_RESPONSES,
+    operation_id="classifyAePcStream",
+    summary="Stream an Adverse Event vs Product Complaint classification",
+    description=_STREAM_DESCRIPTION,
+    tags=["classification"],
+)
+async def classify_ae_pc_stream(payload: AEPCRequest) -> StreamingResponse:
+    return await _stream_classification(ClassificationType.AE_PC, payload)
+
+
+@app.post(
+    "/classify/ae-category/stream",
+    response_class=StreamingResponse,
+    responses=_STREAM_RESPONSES,
+    operation_id="classifyAeCategoryStream",
+    summary="Stream an Adverse Event category classification",
+    description=_STREAM_DESCRIPTION,
+    tags=["classification"],
+)
+async def classify_ae_category_stream(payload: AECategoryRequest) -> StreamingResponse:
+    return await _stream_classification(ClassificationType.AE_CATEGORY, payload)
+
+
+@app.post(
+    "/classify/pc-category/stream",
+    response_class=StreamingResponse,
+    responses=_STREAM_RESPONSES,
+    operation_id="classifyPcCategoryStream",
+    summary="Stream a Product Complaint category classification",
+    description=_STREAM_DESCRIPTION,
+    tags=["classification"],
+)
+async def classify_pc_category_stream(payload: PCCategoryRequest) -> StreamingResponse:
+    return await _stream_classification(ClassificationType.PC_CATEGORY, payload)
+
+
+@app.post(
+    "/classify/pipeline",
+    response_model=PipelineResponse,
+    operation_id="classifyPipeline",
+    summary="Run the full AE/PC router + category pipeline",
+    description=(
+        "Runs the two-stage flow server-side: the AE vs PC router, then the AE or PC category classifier it selects. "
+        "In speculative mode both category classifiers start alongside the router and the ruled-out branch is "
+        "cancelled or discarded, trading extra tokens (reported in `speculative_overhead_tokens`) for roughly one "
+        "LLM call of latency."
+    ),
+    tags=["classification"],
+)
+async def classify_pipeline(payload: PipelineRequest) -> PipelineResponse:
+    router = await _require_predictor(ClassificationType.AE_PC)
+    ae_category = await _require_predictor(ClassificationType.AE_CATEGORY)
+    pc_category = await _require_predictor(ClassificationType.PC_CATEGORY)
+    speculative = payload.speculative
+    if speculative is None:
+        speculative = getattr(app.state, "pipeline_speculative", False)
+    return await run_pipeline(router, ae_category, pc_category, payload, speculative=speculative)
+
+
+@app.post(
+    "/classify/{classification_type}",
+    response_model=ComplaintResponse,
+    operation_id="classifyByType",
+    summary="Classify with any classifier found under artifacts/",
+    description=(
+        "Generic classify route. The built-in types are served by their preloaded classifiers; any other type is "
+        "looked up by the `metadata.classification_type` of the artifacts in `artifacts/`, loaded on first use and "
+        "evicted when it goes cold (see `DSPY_CLASSIFIER_REGISTRY_MAX_LOADED` and `DSPY_CLASSIFIER_REGISTRY_MAX_MB`)."
+    ),
+    tags=["classification"],
+)
+async def classify_by_type(classification_type: str, payload: ComplaintRequest) -> ComplaintResponse:
+    if classification_type in _PREDICTORS:
+        predictor = await _require_predictor(ClassificationType(classification_type))
+        return await predictor(payload)
+
+    classifier_registry: ClassifierRegistry[AsyncClassificationFunction] | None = getattr(
+        app.state, "classifier_registry", None
+    )
+    if classifier_registry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Classifier registry is not enabled")
+    try:
+        if getattr(app.state, "lazy_load", False):
+            await _ensure_lm()
+        predictor = await classifier_registry.get(classification_type)
+    except UnknownClassificationType:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown classification type: {classification_type}"
+        ) from None
+    except (OSError, ValueError) as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"PC-Category classifier unavailable: {error_detail}",
-        )
-    return predictor(payload)
+            detail=f"{classification_type} classifier unavailable: {exc}",
+        ) from exc
+    return await predictor(payload)
 
 
 __all__ = ["app"]
@@ -1,33 +1,88 @@
-"""Shared DSPy classifier components."""
-
-from .classifier import (
-    CLASSIFICATION_CONFIGS,
-    ClassificationConfig,
-    ComplaintClassifier,
-    classification_metric,
-    create_classification_signature,
-    evaluate_model,
-)
-from .config import (
-    DEFAULT_CACHE_DIR,
-    LLMConfig,
-    configure_lm,
-    ensure_dspy_cache_dir,
-    load_llm_config,
-)
-from .data_utils import prepare_datasets
-from .paths import (
-    ARTIFACTS_DIR,
-    CLASSIFICATION_TYPES,
-    DATA_DIR,
-    DEFAULT_CLASSIFICATION_TYPE,
-    ROOT_DIR,
-    get_classification_data_dir,
-    get_classifier_artifact_path,
-    get_test_data_path,
-    get_train_data_path,
-)
-from .types import ClassificationType
+"""Shared DSPy classifier components.
+
+Exports are resolved lazily (PEP 562) so that importing a light submodule such as ``src.common.types`` does not pull
+in DSPy through ``classifier``/``data_utils``.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .classifier import (
+        ComplaintClassifier,
+        classification_metric,
+        create_classification_signature,
+        evaluate_model,
+    )
+    from .config import (
+        DEFAULT_CACHE_DIR,
+        HTTPClientConfig,
+        LLMConfig,
+        configure_lm,
+        ensure_dspy_cache_dir,
+        load_llm_config,
+    )
+    from .data_utils import prepare_datasets
+    from .paths import (
+        ARTIFACTS_DIR,
+        CLASSIFICATION_TYPES,
+        DATA_DIR,
+        DEFAULT_CLASSIFICATION_TYPE,
+        ROOT_DIR,
+        get_classification_data_dir,
+        get_classifier_artifact_path,
+        get_demo_index_dir,
+        get_test_data_path,
+        get_train_data_path,
+    )
+    from .types import (
+        CLASSIFICATION_CONFIGS,
+        ClassificationConfig,
+        ClassificationType,
+        ConstrainedDecoding,
+        InferenceProfile,
+    )
+
+_EXPORTS: dict[str, str] = {
+    "CLASSIFICATION_CONFIGS": ".types",
+    "ClassificationConfig": ".types",
+    "create_classification_signature": ".classifier",
+    "ComplaintClassifier": ".classifier",
+    "classification_metric": ".classifier",
+    "evaluate_model": ".classifier",
+    "configure_lm": ".config",
+    "ensure_dspy_cache_dir": ".config",
+    "DEFAULT_CACHE_DIR": ".config",
+    "HTTPClientConfig": ".config",
+    "LLMConfig": ".config",
+    "load_llm_config": ".config",
+    "prepare_datasets": ".data_utils",
+    "ROOT_DIR": ".paths",
+    "DATA_DIR": ".paths",
+    "ARTIFACTS_DIR": ".paths",
+    "CLASSIFICATION_TYPES": ".paths",
+    "DEFAULT_CLASSIFICATION_TYPE": ".paths",
+    "ClassificationType": ".types",
+    "InferenceProfile": ".types",
+    "ConstrainedDecoding": ".types",
+    "get_classification_data_dir": ".paths",
+    "get_train_data_path": ".paths",
+    "get_test_data_path": ".paths",
+    "get_demo_index_dir": ".paths",
+    "get_classifier_artifact_path": ".paths",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "CLASSIFICATION_CONFIGS",
@@ -39,6 +94,7 @@ __all__ = [
     "configure_lm",
     "ensure_dspy_cache_dir",
     "DEFAULT_CACHE_DIR",
+    "HTTPClientConfig",
     "LLMConfig",
     "load_llm_config",
     "prepare_datasets",
@@ -48,8 +104,11 @@ __all__ = [
     "CLASSIFICATION_TYPES",
     "DEFAULT_CLASSIFICATION_TYPE",
     "ClassificationType",
+    "InferenceProfile",
+    "ConstrainedDecoding",
     "get_classification_data_dir",
     "get_train_data_path",
     "get_test_data_path",
+    "get_demo_index_dir",
     "get_classifier_artifact_path",
 ]
@@ -0,0 +1,219 @@
+"""First-stage classifier: hashed n-gram features with a NumPy linear model, answering only when confident.
+
+The model trains in a few seconds on a classifier's ``train.json`` and answers in microseconds. Its confidence
+threshold is calibrated on out-of-fold predictions over the training set, so the complaints it answers are classified
+at least as accurately as :data:`TARGET_ACCURACY`; everything else escalates to the optimized DSPy program.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import re
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+
+N_FEATURES = 1 << 18
+TARGET_ACCURACY = 0.98
+
+EPOCHS = 60
+LEARNING_RATE = 0.1
+L2 = 1e-4
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def _features(text: str) -> list[str]:
+    words = _WORD.findall(text.lower())
+    features = [f"w:{word}" for word in words]
+    features.extend(f"b:{first} {second}" for first, second in zip(words, words[1:], strict=False))
+    for word in words:
+        padded = f" {word} "
+        features.extend(f"c:{padded[i : i + 4]}" for i in range(len(padded) - 3))
+    return features
+
+
+class _Batch:
+    """Hashed, L2-normalized feature rows in CSR form."""
+
+    def __init__(self, texts: Sequence[str], n_features: int):
+        indices: list[np.ndarray] = []
+        values: list[np.ndarray] = []
+        for text in texts:
+            hashed = np.fromiter(
+                (zlib.crc32(feature.encode()) % n_features for feature in _features(text)), dtype=np.int64
+            )
+            unique, counts = np.unique(hashed, return_counts=True)
+            weights = np.log1p(counts).astype(np.float32)
+            norm = np.linalg.norm(weights)
+            indices.append(unique)
+            values.append(weights / norm if norm else weights)
+        self.size = len(texts)
+        self.indptr = np.cumsum([0, *(len(row) for row in indices)])
+        self.indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+        self.values = np.concatenate(values) if values else np.zeros(0, dtype=np.float32)
+        self._index()
+
+    def _index(self) -> None:
+        self._nonempty = self.indptr[:-1] < self.indptr[1:]
+        self._starts = self.indptr[:-1][self._nonempty]
+
+    def take(self, rows: Sequence[int]) -> _Batch:
+        """The batch of ``rows``, without hashing the texts again."""
+        batch = object.__new__(_Batch)
+        spans = [np.arange(self.indptr[row], self.indptr[row + 1]) for row in rows]
+        positions = np.concatenate(spans) if spans else np.zeros(0, dtype=np.int64)
+        batch.size = len(rows)
+        batch.indptr = np.cumsum([0, *(len(span) for span in spans)])
+        batch.indices = self.indices[positions]
+        batch.values = self.values[positions]
+        batch._index()
+        return batch
+
+    def dot(self, weights: np.ndarray, indices: np.ndarray | None = None) -> np.ndarray:
+        """``X @ weights``; ``indices`` replaces the feature indices (e.g. positions in a compact weight block)."""
+        out = np.zeros((self.size, weights.shape[1]), dtype=np.float32)
+        if len(self._starts):
+            contributions = weights[self.indices if indices is None else indices] * self.values[:, None]
+            out[self._nonempty] = np.add.reduceat(contributions, self._starts, axis=0)
+        return out
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+class NgramClassifier:
+    """Multinomial logistic regression over hashed word, word-bigram and character 4-gram features."""
+
+    def __init__(self, labels: Sequence[str], n_features: int = N_FEATURES, threshold: float = math.inf):
+        self.labels = list(labels)
+        self.n_features = n_features
+        self.threshold = threshold
+        self.weights = np.zeros((n_features, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        epochs: int = EPOCHS,
+        learning_rate: float = LEARNING_RATE,
+        l2: float = L2,
+    ) -> NgramClassifier:
+        """Train with full-batch Adam on the cross-entropy, over the block of features that occur in ``texts``."""
+        return self._fit(_Batch(texts, self.n_features), labels, epochs, learning_rate, l2)
+
+    def _fit(
+        self, batch: _Batch, labels: Sequence[str], epochs: int, learning_rate: float, l2: float
+    ) -> NgramClassifier:
+        features, local = np.unique(batch.indices, return_inverse=True)
+        rows = np.repeat(np.arange(batch.size), np.diff(batch.indptr))
+        # X.T @ error for the block: contributions sorted by feature, summed per feature
+        order = np.argsort(local, kind="stable")
+        starts = np.flatnonzero(np.r_[True, np.diff(local[order]) != 0])
+        targets = np.zeros((batch.size, len(self.labels)), dtype=np.float32)
+        targets[np.arange(batch.size), [self.labels.index(label) for label in labels]] = 1.0
+
+        weights = np.zeros((len(features), len(self.labels)), dtype=np.float32)
+        bias = np.zeros(len(self.labels), dtype=np.float32)
+        moments = [np.zeros_like(weights), np.zeros_like(weights), np.zeros_like(bias), np.zeros_like(bias)]
+        for step in range(1, epochs + 1):
+            error = (_softmax(batch.dot(weights, local) + bias) - targets) / batch.size
+            weight_gradient = np.add.reduceat((error[rows] * batch.values[:, None])[order], starts, axis=0)
+            for param, gradient, first, second in (
+                (weights, weight_gradient + l2 * weights, moments[0], moments[1]),
+                (bias, error.sum(axis=0), moments[2], moments[3]),
+            ):
+                first *= 0.9
+                first += 0.1 * gradient
+                second *= 0.999
+                second += 0.001 * gradient**2
+                param -= learning_rate * (first / (1 - 0.9**step)) / (np.sqrt(second / (1 - 0.999**step)) + 1e-8)
+        self.weights[:] = 0.0
+        self.weights[features] = weights
+        self.bias = bias
+        return self
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        return self._proba(_Batch(texts, self.n_features))
+
+    def _proba(self, batch: _Batch) -> np.ndarray:
+        return _softmax(batch.dot(self.weights) + self.bias)
+
+    def answer(self, text: str) -> tuple[str, float] | None:
+        """``(label, confidence)`` when the confidence reaches :attr:`threshold`, else ``None`` (escalate)."""
+        probabilities = self.predict_proba([text])[0]
+        best = int(probabilities.argmax())
+        confidence = float(probabilities[best])
+        return (self.labels[best], confidence) if confidence >= self.threshold else None
+
+    def with_threshold(self, threshold: float | None) -> NgramClassifier:
+        """A view sharing this model's weights with another threshold (``None`` keeps the calibrated one)."""
+        if threshold is None:
+            return self
+        view = object.__new__(NgramClassifier)
+        view.__dict__.update(self.__dict__, threshold=threshold)
+        return view
+
+
+def calibrate_threshold(confidences: np.ndarray, correct: np.ndarray, target: float = TARGET_ACCURACY) -> float:
+    """Lowest confidence above which the predictions are at least ``target`` accurate (``inf`` if none are)."""
+    order = np.argsort(-confidences, kind="stable")
+    accuracy = np.cumsum(correct[order]) / np.arange(1, len(order) + 1)
+    meets = np.flatnonzero(accuracy >= target)
+    return float(confidences[order][meets[-1]]) if len(meets) else math.inf
+
+
+def train_first_stage(
+    texts: Sequence[str],
+    labels: Sequence[str],
+    label_set: Sequence[str],
+    folds: int = 5,
+    target: float = TARGET_ACCURACY,
+    seed: int = 0,
+) -> NgramClassifier:
+    """Fit on every example, with the threshold calibrated on ``folds``-fold out-of-fold predictions."""
+    batch = _Batch(texts, N_FEATURES)
+    assignment = np.random.default_rng(seed).permutation(len(texts)) % folds
+    confidences = np.zeros(len(texts))
+    correct = np.zeros(len(texts))
+    for fold in range(folds):
+        held_out = np.flatnonzero(assignment == fold)
+        kept = np.flatnonzero(assignment != fold)
+        model = NgramClassifier(label_set)._fit(batch.take(kept), [labels[i] for i in kept], EPOCHS, LEARNING_RATE, L2)
+        probabilities = model._proba(batch.take(held_out))
+        confidences[held_out] = probabilities.max(axis=1)
+        correct[held_out] = [
+            model.labels[best] == labels[i] for best, i in zip(probabilities.argmax(axis=1), held_out, strict=True)
+        ]
+    model = NgramClassifier(label_set, threshold=calibrate_threshold(confidences, correct, target))
+    return model._fit(batch, labels, EPOCHS, LEARNING_RATE, L2)
+
+
+@functools.lru_cache(maxsize=8)
+def first_stage_for(classification_type: str) -> NgramClassifier:
+    """The first stage of a built-in classifier, trained on its ``train.json`` once per process."""
+    from .data_utils import prepare_datasets
+    from .types import CLASSIFICATION_CONFIGS, ClassificationType
+
+    classification_type = ClassificationType(classification_type)
+    trainset, _ = prepare_datasets(classification_type)
+    return train_first_stage(
+        [example.complaint for example in trainset],
+        [example.classification for example in trainset],
+        CLASSIFICATION_CONFIGS[classification_type].labels,
+    )
+
+
+__all__ = [
+    "N_FEATURES",
+    "TARGET_ACCURACY",
+    "NgramClassifier",
+    "calibrate_threshold",
+    "first_stage_for",
+    "train_first_stage",
+]
@@ -2,71 +2,38 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from typing import Any
+
 import dspy
-from pydantic import BaseModel
-
-from .types import ClassificationType
-
-
-class ClassificationConfig(BaseModel):
-    """Configuration for a single classification type."""
-
-    description: str
-    labels: list[str]
-
-    @property
-    def output_desc(self) -> str:
-        return f"One of: {', '.join(self.labels)}"
-
-
-CLASSIFICATION_CONFIGS: dict[ClassificationType, ClassificationConfig] = {
-    ClassificationType.AE_PC: ClassificationConfig(
-        description="Classify Ozempic-related complaints as Adverse Event or Product Complaint.",
-        labels=["Adverse Event", "Product Complaint"],
-    ),
-    ClassificationType.AE_CATEGORY: ClassificationConfig(
-        description="Classify adverse events into specific categories.",
-        labels=[
-            "Gastrointestinal disorders",
-            "Pancreatitis",
-            "Hepatobiliary (gallbladder) disease",
-            "Hypoglycemia",
-            "Eye disorders (Diabetic retinopathy complications)",
-            "Renal events (Acute kidney injury)",
-            "Hypersensitivity",
-            "Injection-site reactions",
-            "Cardiovascular signs",
-            "Peri-procedural aspiration risk",
-            "Gastrointestinal disorders (Gastroparesis)",
-        ],
-    ),
-    ClassificationType.PC_CATEGORY: ClassificationConfig(
-        description="Classify product complaints into specific categories.",
-        labels=[
-            "Stability/Appearance defect",
-            "Device malfunction",
-            "Storage/Temperature excursion",
-            "Labeling error",
-            "Contamination/Foreign matter",
-            "Packaging defect",
-            "Counterfeit/Unauthorized source",
-            "Potency/Assay defect",
-            "Distribution/Expiry",
-        ],
-    ),
+
+from .token_budget import acall_within_budget, call_within_budget
+from .types import CLASSIFICATION_CONFIGS, ClassificationConfig, ClassificationType, InferenceProfile
+
+# Output fields of the trained ChainOfThought program that each profile does not ask the LM for.
+_DROPPED_FIELDS: dict[InferenceProfile, tuple[str, ...]] = {
+    InferenceProfile.FULL: (),
+    InferenceProfile.NO_REASONING: ("reasoning",),
+    InferenceProfile.LABEL_ONLY: ("reasoning", "justification"),
+    InferenceProfile.LOGPROB: ("reasoning", "justification"),
 }
 
 
 def create_classification_signature(
-    classification_type: ClassificationType = ClassificationType.AE_PC,
+    classification_type: ClassificationType | str = ClassificationType.AE_PC,
+    config: ClassificationConfig | None = None,
 ) -> type[dspy.Signature]:
-    """Create a classification signature dynamically based on the classification type."""
-    if classification_type not in CLASSIFICATION_CONFIGS:
-        raise ValueError(
-            f"Invalid classification type: {classification_type}. "
-            f"Valid types: {', '.join(t.value for t in ClassificationType)}"
-        )
-    config = CLASSIFICATION_CONFIGS[classification_type]
+    """Create a classification signature dynamically based on the classification type.
+
+    Types outside :class:`ClassificationType` (e.g. artifacts discovered at runtime) must pass their ``config``.
+    """
+    if config is None:
+        if classification_type not in CLASSIFICATION_CONFIGS:
+            raise ValueError(
+                f"Invalid classification type: {classification_type}. "
+                f"Valid types: {', '.join(t.value for t in ClassificationType)}"
+            )
+        config = CLASSIFICATION_CONFIGS[ClassificationType(classification_type)]
 
     class ComplaintClassification(dspy.Signature):
         __doc__ = config.description
@@ -74,25 +41,106 @@ def create_classification_signature(
         classification = dspy.OutputField(desc=config.output_desc)
         justification = dspy.OutputField(desc="Brief explanation for the classification")
 
+    # The closed label set, for constrained decoding (src.common.constrained); it is not rendered into the prompt.
+    ComplaintClassification.output_fields["classification"].json_schema_extra["labels"] = list(config.labels)
     return ComplaintClassification
 
 
 class ComplaintClassifier(dspy.Module):
     """DSPy module wrapping the complaint classification prompt."""
 
-    def __init__(self, classification_type: ClassificationType = ClassificationType.AE_PC):
+    def __init__(
+        self,
+        classification_type: ClassificationType | str = ClassificationType.AE_PC,
+        config: ClassificationConfig | None = None,
+    ):
         super().__init__()
         self.classification_type = classification_type
-        signature = create_classification_signature(classification_type)
+        signature = create_classification_signature(classification_type, config)
         self.classify = dspy.ChainOfThought(signature)
+        # Completion budget from the artifact's metadata (src.common.token_budget); None keeps the LM's max_tokens.
+        self.max_tokens: int | None = None
+        # Temperature for logprob label scores from the artifact's metadata (src.common.label_scoring); None leaves them.
+        self.label_temperature: float | None = None
+        # Per-request demos (src.common.demo_retrieval) in place of the artifact's; None keeps the artifact's demos.
+        self.demo_retriever: Callable[[str], list[dict[str, Any]]] | None = None
+
+    def _inputs(self, complaint: str) -> dict[str, Any]:
+        if self.demo_retriever is None:
+            return {"complaint": complaint}
+        return {"complaint": complaint, "demos": self.demo_retriever(complaint)}
 
     def forward(self, complaint: str) -> dspy.Prediction:
-        result = self.classify(complaint=complaint)
+        result = call_within_budget(self.classify, self.max_tokens, **self._inputs(complaint))
+        return dspy.Prediction(
+            classification=result.classification,
+            justification=result.justification,
+        )
+
+    async def aforward(self, complaint: str) -> dspy.Prediction:
+        """Async counterpart of ``forward`` used by the serving layer (``await classifier.acall(...)``)."""
+        result = await acall_within_budget(self.classify, self.max_tokens, **self._inputs(complaint))
         return dspy.Prediction(
             classification=result.classification,
             justification=result.justification,
         )
 
+    def for_profile(self, profile: InferenceProfile | str) -> dspy.Module:
+        """Return the program to serve ``profile`` with: this classifier for ``full``, else a slimmer view of it."""
+        profile = InferenceProfile(profile)
+        if profile is InferenceProfile.FULL:
+            return self
+        if profile is InferenceProfile.LOGPROB:
+            from .label_scoring import LabelScorer
+
+            return LabelScorer(self)
+        return LeanComplaintClassifier(self, profile)
+
+
+class LeanComplaintClassifier(dspy.Module):
+    """Serve-time view of a loaded :class:`ComplaintClassifier` that asks the LM for fewer output fields.
+
+    Instructions, field descriptions and demos come from the loaded artifact; the fields the profile drops are removed
+    from the signature and from every demo (retrieved ones included), so the prompt is the optimized one without
+    them. A dropped ``justification`` comes back as an empty string.
+    """
+
+    def __init__(self, classifier: ComplaintClassifier, profile: InferenceProfile | str):
+        super().__init__()
+        self.profile = InferenceProfile(profile)
+        dropped = _DROPPED_FIELDS[self.profile]
+        source = classifier.classify.predict
+        signature = source.signature
+        for name in dropped:
+            signature = signature.delete(name)
+        self.classify = dspy.Predict(signature, **source.config)
+        self.dropped = dropped
+        self.classify.demos = self._without_dropped(source.demos)
+        self.classify.lm = source.lm
+        self.max_tokens = classifier.max_tokens
+        self.demo_retriever = classifier.demo_retriever
+
+    def _without_dropped(self, demos: list[Any]) -> list[Any]:
+        return [
+            demo.without(*(name for name in self.dropped if name in demo))
+            if isinstance(demo, dspy.Example)
+            else {key: value for key, value in demo.items() if key not in self.dropped}
+            for demo in demos
+        ]
+
+    def _inputs(self, complaint: str) -> dict[str, Any]:
+        if self.demo_retriever is None:
+            return {"complaint": complaint}
+        return {"complaint": complaint, "demos": self._without_dropped(self.demo_retriever(complaint))}
+
+    def forward(self, complaint: str) -> dspy.Prediction:
+        result = call_within_budget(self.classify, self.max_tokens, **self._inputs(complaint))
+        return dspy.Prediction(classification=result.classification, justification=result.get("justification", ""))
+
+    async def aforward(self, complaint: str) -> dspy.Prediction:
+        result = await acall_within_budget(self.classify, self.max_tokens, **self._inputs(complaint))
+        return dspy.Prediction(classification=result.classification, justification=result.get("justification", ""))
+
 
 def classification_metric(example: dspy.Example, pred: dspy.Prediction, trace=None) -> float:
     """Return 1.0 if the predicted label matches the ground truth."""
@@ -148,6 +196,8 @@ __all__ = [
     "CLASSIFICATION_CONFIGS",
     "create_classification_signature",
     "ComplaintClassifier",
+    "InferenceProfile",
+    "LeanComplaintClassifier",
     "classification_metric",
     "evaluate_model",
 ]
@@ -0,0 +1,149 @@
+"""Compact prompt format and a tolerant single-pass parser for the complaint classification signatures."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import dspy
+import json_repair
+from dspy.adapters.chat_adapter import FieldInfoWithName
+from dspy.adapters.utils import format_field_value
+from dspy.utils.exceptions import AdapterParseError
+
+from .llama_cpp import StablePrefixChatAdapter
+
+_STRIP = " \t\r\n\"'`*_."
+
+
+def _field_description(name: str, field: Any) -> str:
+    desc = (field.json_schema_extra or {}).get("desc", "")
+    return f"- {name}: {desc}" if desc and desc != f"${{{name}}}" else f"- {name}"
+
+
+def _normalize_label(value: str, labels: list[str]) -> str:
+    """Map a generated label onto the label set: exact match ignoring case, else the longest label it contains."""
+    value = value.strip().strip(_STRIP)
+    folded = value.casefold()
+    for label in labels:
+        if label.casefold() == folded:
+            return label
+    contained = [label for label in labels if label.casefold() in folded]
+    return max(contained, key=len) if contained else value
+
+
+class CompactChatAdapter(StablePrefixChatAdapter):
+    """Prompt format with a fraction of ``ChatAdapter``'s formatting tokens, and a parser that never re-calls the LM.
+
+    Fields are written as ``name: value`` lines: the system message lists them once and the demos and the request
+    carry no ``[[ ## field ## ]]`` markers, type notes or per-message format reminders. The prefix is rendered once per
+    predictor, as in :class:`~src.common.llama_cpp.StablePrefixChatAdapter`.
+
+    :meth:`parse` accepts ``name: value`` lines (also bold or bulleted), ``[[ ## name ## ]]`` sections or a JSON
+    object. The classification is mapped onto the signature's labels, a missing free-text field is empty, and a
+    completion without a classification is searched for a label. Only a completion that names no label fails to parse;
+    there is no second LM call.
+    """
+
+    def format_system_message(self, signature: type[dspy.Signature]) -> str:
+        parts = [signature.instructions.strip(), "Input fields:"]
+        parts.extend(_field_description(name, field) for name, field in signature.input_fields.items())
+        parts.append("Output fields:")
+        parts.extend(_field_description(name, field) for name, field in signature.output_fields.items())
+        parts.append("Reply with one `name: value` line per output field, in this order.")
+        return "\n".join(parts)
+
+    def format_user_message_content(
+        self,
+        signature: type[dspy.Signature],
+        inputs: dict[str, Any],
+        prefix: str = "",
+        suffix: str = "",
+        main_request: bool = False,
+    ) -> str:
+        lines = [prefix] if prefix else []
+        for name, field in signature.input_fields.items():
+            if name in inputs:
+                lines.append(f"{name}: {format_field_value(field_info=field, value=inputs[name])}")
+        if suffix:
+            lines.append(suffix)
+        return "\n".join(lines)
+
+    def format_assistant_message_content(
+        self,
+        signature: type[dspy.Signature],
+        outputs: dict[str, Any],
+        missing_field_message: str | None = None,
+    ) -> str:
+        return "\n".join(
+            f"{name}: {outputs[name] if outputs.get(name) is not None else missing_field_message}"
+            for name in signature.output_fields
+            if outputs.get(name) is not None or missing_field_message is not None
+        )
+
+    def format_field_with_value(self, fields_with_values: dict[FieldInfoWithName, Any]) -> str:
+        return "\n".join(
+            f"{field.name}: {format_field_value(field_info=field.info, value=value)}"
+            for field, value in fields_with_values.items()
+        )
+
+    def parse(self, signature: type[dspy.Signature], completion: str) -> dict[str, Any]:
+        names = list(signature.output_fields)
+        sections = self._json_sections(completion, names) or self._line_sections(completion, names)
+        fields = {name: sections.get(name, "").strip() for name in names}
+
+        labels = (signature.output_fields["classification"].json_schema_extra or {}).get("labels") or []
+        if "classification" in fields and labels:
+            value = fields["classification"]
+            if not value:
+                mentioned = [label for label in labels if label.casefold() in completion.casefold()]
+                value = max(mentioned, key=len) if mentioned else ""
+            fields["classification"] = _normalize_label(value, labels) if value else ""
+        if "classification" in fields and not fields["classification"]:
+            raise AdapterParseError(
+                adapter_name="CompactChatAdapter",
+                signature=signature,
+                lm_response=completion,
+                parsed_result=fields,
+                message="The completion does not name a classification",
+            )
+        return fields
+
+    @staticmethod
+    def _json_sections(completion: str, names: list[str]) -> dict[str, str]:
+        start, end = completion.find("{"), completion.rfind("}")
+        if start == -1 or end < start:
+            return {}
+        try:
+            parsed = json_repair.loads(completion[start : end + 1])
+        except Exception:
+            return {}
+        if not isinstance(parsed, dict):
+            return {}
+        by_name = {str(key).casefold(): value for key, value in parsed.items()}
+        return {name: str(by_name[name]) for name in names if by_name.get(name) is not None}
+
+    @staticmethod
+    def _line_sections(completion: str, names: list[str]) -> dict[str, str]:
+        header = re.compile(
+            r"^[\s>#*_`-]*(?:\[\[\s*##\s*(?P<marker>\w+)\s*##\s*\]\]|(?P<name>"
+            + "|".join(re.escape(name) for name in names)
+            + r")[*_`]*\s*:[*_`]*)(?P<rest>.*)$",
+            re.IGNORECASE,
+        )
+        sections: dict[str, list[str]] = {}
+        current: list[str] | None = None
+        for line in completion.splitlines():
+            match = header.match(line)
+            if match:
+                name = (match.group("marker") or match.group("name")).casefold()
+                # the first occurrence wins, as in ChatAdapter; unknown markers (``completed``) end the field
+                current = sections.setdefault(name, []) if name in names and name not in sections else None
+                if current is not None and match.group("rest").strip():
+                    current.append(match.group("rest"))
+            elif current is not None:
+                current.append(line)
+        return {name: "\n".join(lines) for name, lines in sections.items()}
+
+
+__all__ = ["CompactChatAdapter"]
@@ -2,19 +2,32 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING, Literal
 
-import dspy
-from pydantic import BaseModel, Field
+from loguru import logger
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .types import ConstrainedDecoding, InferenceProfile
+
+if TYPE_CHECKING:
+    import dspy
+
 DEFAULT_MODEL = "nvidia/nemotron-3-nano-30b-a3b:free"
 DEFAULT_LOCAL_MODEL = "Nemotron-3-Nano-30B-A3B-UD-Q3_K_XL.gguf"
 DEFAULT_OPENROUTER_BASE = "https://openrouter.ai/api/v1"
 DEFAULT_LOCAL_BASE = "http://localhost:8080/v1"
 DEFAULT_CACHE_DIR = Path("data/.dspy_cache")
+# Async LM calls no longer hold a threadpool worker, so the HTTP pool is the remaining concurrency ceiling.
+DEFAULT_MAX_CONNECTIONS = 512
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 128
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 120.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_READ_TIMEOUT_SECONDS = 600.0
 
 
 class EnvironmentSettings(BaseSettings):
@@ -31,8 +44,99 @@ class EnvironmentSettings(BaseSettings):
     openrouter_api_key: str | None = Field(None, alias="OPENROUTER_API_KEY")
     local_base: str | None = Field(None, alias="DSPY_LOCAL_BASE")
     raw_http_headers: str | None = Field(None, alias="DSPY_HTTP_HEADERS")
+    http_max_connections: int = Field(DEFAULT_MAX_CONNECTIONS, alias="DSPY_HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(
+        DEFAULT_MAX_KEEPALIVE_CONNECTIONS, alias="DSPY_HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        DEFAULT_KEEPALIVE_EXPIRY_SECONDS, alias="DSPY_HTTP_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    http_connect_timeout_seconds: float = Field(
+        DEFAULT_CONNECT_TIMEOUT_SECONDS, alias="DSPY_HTTP_CONNECT_TIMEOUT_SECONDS"
+    )
+    http_read_timeout_seconds: float = Field(DEFAULT_READ_TIMEOUT_SECONDS, alias="DSPY_HTTP_READ_TIMEOUT_SECONDS")
+    http2: bool = Field(False, alias="DSPY_HTTP2")
     openrouter_http_referer: str | None = Field(None, alias="OPENROUTER_HTTP_REFERER")
     openrouter_app_title: str | None = Field(None, alias="OPENROUTER_APP_TITLE")
+    batch_max_concurrency: int | None = Field(None, alias="DSPY_BATCH_MAX_CONCURRENCY")
+    pipeline_speculative: bool = Field(False, alias="DSPY_PIPELINE_SPECULATIVE")
+    prediction_cache_size: int = Field(4096, alias="DSPY_PREDICTION_CACHE_SIZE")
+    prediction_cache_ttl_seconds: float = Field(3600.0, alias="DSPY_PREDICTION_CACHE_TTL_SECONDS")
+    prediction_store_path: Path | None = Field(None, alias="DSPY_PREDICTION_STORE_PATH")
+    prediction_store_max_mb: int = Field(256, alias="DSPY_PREDICTION_STORE_MAX_MB")
+    micro_batch_max_wait_ms: float = Field(0.0, alias="DSPY_MICRO_BATCH_MAX_WAIT_MS")
+    micro_batch_max_size: int = Field(4, alias="DSPY_MICRO_BATCH_MAX_SIZE")
+    admission_max_in_flight: int = Field(0, alias="DSPY_ADMISSION_MAX_IN_FLIGHT")
+    admission_max_queue: int = Field(64, alias="DSPY_ADMISSION_MAX_QUEUE")
+    admission_max_queue_ms: float = Field(5000.0, alias="DSPY_ADMISSION_MAX_QUEUE_MS")
+    artifact_reload_interval_seconds: float = Field(0.0, alias="DSPY_ARTIFACT_RELOAD_INTERVAL_SECONDS")
+    admin_token: str | None = Field(None, alias="DSPY_ADMIN_TOKEN")
+    hedge_percentile: float = Field(0.0, alias="DSPY_HEDGE_PERCENTILE")
+    hedge_max_extra_ratio: float = Field(0.05, alias="DSPY_HEDGE_MAX_EXTRA_RATIO")
+    hedge_min_delay_ms: float = Field(50.0, alias="DSPY_HEDGE_MIN_DELAY_MS")
+    hedge_backup_base: str | None = Field(None, alias="DSPY_HEDGE_BACKUP_BASE")
+    raw_backends: str | None = Field(None, alias="DSPY_BACKENDS")
+    router_strategy: Literal["least_outstanding", "ewma"] = Field("least_outstanding", alias="DSPY_ROUTER_STRATEGY")
+    router_eject_after_failures: int = Field(3, alias="DSPY_ROUTER_EJECT_AFTER_FAILURES")
+    router_eject_seconds: float = Field(30.0, alias="DSPY_ROUTER_EJECT_SECONDS")
+    prefix_cache: bool = Field(False, alias="DSPY_PREFIX_CACHE")
+    llama_slots: int = Field(4, alias="DSPY_LLAMA_SLOTS")
+    inference_profile: InferenceProfile = Field(InferenceProfile.FULL, alias="DSPY_INFERENCE_PROFILE")
+    classifier_profiles: dict[str, InferenceProfile] = Field(default_factory=dict, alias="DSPY_CLASSIFIER_PROFILES")
+    constrained_decoding: ConstrainedDecoding = Field(ConstrainedDecoding.OFF, alias="DSPY_CONSTRAINED_DECODING")
+    adapter: Literal["chat", "compact"] = Field("chat", alias="DSPY_ADAPTER")
+    token_budgets: bool = Field(True, alias="DSPY_TOKEN_BUDGETS")
+    cascade: bool = Field(False, alias="DSPY_CASCADE")
+    cascade_threshold: float | None = Field(None, alias="DSPY_CASCADE_THRESHOLD")
+    retrieved_demos: dict[str, int] = Field(default_factory=dict, alias="DSPY_RETRIEVED_DEMOS")
+    near_duplicate_threshold: float = Field(0.0, alias="DSPY_NEAR_DUPLICATE_THRESHOLD")
+    near_duplicate_max_entries: int = Field(4096, alias="DSPY_NEAR_DUPLICATE_MAX_ENTRIES")
+    preload_classifiers: bool = Field(True, alias="DSPY_PRELOAD_CLASSIFIERS")
+    classifier_registry_max_loaded: int = Field(16, alias="DSPY_CLASSIFIER_REGISTRY_MAX_LOADED")
+    classifier_registry_max_mb: int = Field(256, alias="DSPY_CLASSIFIER_REGISTRY_MAX_MB")
+
+
+class HTTPClientConfig(BaseModel):
+    """Connection pool shared by every LM call in the process."""
+
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry_seconds: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS
+    connect_timeout_seconds: float = DEFAULT_CONNECT_TIMEOUT_SECONDS
+    read_timeout_seconds: float = DEFAULT_READ_TIMEOUT_SECONDS
+    http2: bool = False
+
+
+class BackendSpec(BaseModel):
+    """One entry of ``DSPY_BACKENDS``, before credentials and model prefixes are resolved."""
+
+    provider: Literal["local", "openrouter"] = "local"
+    api_base: str | None = None
+    model: str | None = None
+    name: str | None = None
+    weight: float = Field(1.0, gt=0)
+    max_in_flight: int | None = Field(
+        None, ge=0, description="Calls outstanding before the backend counts as saturated (0 = no cap)"
+    )
+    overflow: bool | None = Field(None, description="Only used when every other backend is saturated or ejected")
+
+
+class BackendConfig(BaseModel):
+    """A resolved member of the LM backend pool."""
+
+    name: str
+    lm: LLMConfig
+    weight: float = 1.0
+    max_in_flight: int = 4
+    overflow: bool = False
+
+
+class RouterConfig(BaseModel):
+    """How :class:`~src.common.router.RoutedLM` spreads calls over the backend pool."""
+
+    strategy: Literal["least_outstanding", "ewma"] = "least_outstanding"
+    eject_after_failures: int = 3
+    eject_seconds: float = 30.0
 
 
 class LLMConfig(BaseModel):
@@ -42,6 +146,10 @@ class LLMConfig(BaseModel):
     api_key: str | None = None
     api_base: str | None = None
     headers: dict[str, str] = Field(default_factory=dict)
+    http: HTTPClientConfig = Field(default_factory=HTTPClientConfig)
+    backends: list[BackendConfig] = Field(default_factory=list, description="Routed pool; empty for a single backend")
+    router: RouterConfig = Field(default_factory=RouterConfig)
+    prefix_cache: bool = Field(False, description="Ask the (llama.cpp) backend to reuse the prompt prefix's KV cache")
 
     @property
     def is_openrouter(self) -> bool:
@@ -73,6 +181,17 @@ def _load_extra_headers(env: EnvironmentSettings) -> dict[str, str]:
     return headers
 
 
+def _load_http_client_config(env: EnvironmentSettings) -> HTTPClientConfig:
+    return HTTPClientConfig(
+        max_connections=env.http_max_connections,
+        max_keepalive_connections=env.http_max_keepalive_connections,
+        keepalive_expiry_seconds=env.http_keepalive_expiry_seconds,
+        connect_timeout_seconds=env.http_connect_timeout_seconds,
+        read_timeout_seconds=env.http_read_timeout_seconds,
+        http2=env.http2,
+    )
+
+
 def _load_source_credentials() -> dict[str, object]:
     """Load compute module source credentials JSON, if present."""
 
@@ -81,7 +200,7 @@ def _load_source_credentials() -> dict[str, object]:
         return {}
 
     try:
-        with open(path, "r", encoding="utf-8") as handle:
+        with open(path, encoding="utf-8") as handle:
             data = json.load(handle)
     except FileNotFoundError:
         return {}
@@ -131,25 +250,22 @@ def _get_openrouter_api_key_from_sources() -> str | None:
     return None
 
 
-def load_llm_config() -> LLMConfig:
-    """Load LM configuration from environment variables."""
+def _local_llm_config(env: EnvironmentSettings, model_name: str | None, api_base: str | None) -> LLMConfig:
+    model_name = model_name or DEFAULT_LOCAL_MODEL
+    # LiteLLM requires openai/ prefix for OpenAI-compatible local servers
+    if not model_name.startswith("openai/"):
+        model_name = f"openai/{model_name}"
+    return LLMConfig(
+        model=model_name,
+        api_key="dummy",  # LiteLLM requires a non-None api_key for openai provider
+        api_base=api_base or DEFAULT_LOCAL_BASE,
+        headers={},
+        http=_load_http_client_config(env),
+        prefix_cache=env.prefix_cache,
+    )
 
-    env = EnvironmentSettings()  # pyright: ignore[reportCallIssue]
-    provider = env.provider.lower()
-
-    if provider == "local":
-        model_name = env.model_name or DEFAULT_LOCAL_MODEL
-        # LiteLLM requires openai/ prefix for OpenAI-compatible local servers
-        if not model_name.startswith("openai/"):
-            model_name = f"openai/{model_name}"
-        return LLMConfig(
-            model=model_name,
-            api_key="dummy",  # LiteLLM requires a non-None api_key for openai provider
-            api_base=env.local_base or DEFAULT_LOCAL_BASE,
-            headers={},
-        )
 
-    # OpenRouter provider (default)
+def _openrouter_llm_config(env: EnvironmentSettings, model_name: str | None) -> LLMConfig:
     openrouter_api_key = env.openrouter_api_key or _get_openrouter_api_key_from_sources()
     if not openrouter_api_key:
         raise RuntimeError(
@@ -157,7 +273,7 @@ def load_llm_config() -> LLMConfig:
             "additionalSecretOpenRouterApiKey, or use DSPY_PROVIDER=local."
         )
 
-    model_name = env.model_name or DEFAULT_MODEL
+    model_name = model_name or DEFAULT_MODEL
     # Ensure model has openrouter/ prefix for litellm provider routing
     if not model_name.startswith("openrouter/"):
         model_name = f"openrouter/{model_name}"
@@ -167,12 +283,77 @@ def load_llm_config() -> LLMConfig:
         api_key=openrouter_api_key,
         api_base=DEFAULT_OPENROUTER_BASE,
         headers=_load_extra_headers(env),
+        http=_load_http_client_config(env),
     )
 
 
+def _load_backends(env: EnvironmentSettings) -> list[BackendConfig]:
+    """Resolve ``DSPY_BACKENDS`` (a JSON list of :class:`BackendSpec`) into the routed backend pool."""
+    try:
+        specs = TypeAdapter(list[BackendSpec]).validate_json(env.raw_backends or "[]")
+    except ValidationError as exc:
+        raise ValueError(f"Invalid DSPY_BACKENDS: {exc}") from exc
+
+    backends: list[BackendConfig] = []
+    for index, spec in enumerate(specs):
+        # DSPY_MODEL_NAME names the model of DSPY_PROVIDER; other providers fall back to their own default
+        model_name = spec.model or (env.model_name if spec.provider == env.provider.lower() else None)
+        if spec.provider == "local":
+            lm = _local_llm_config(env, model_name, spec.api_base)
+        else:
+            lm = _openrouter_llm_config(env, model_name)
+            if spec.api_base:
+                lm.api_base = spec.api_base
+        backends.append(
+            BackendConfig(
+                name=spec.name or f"{spec.provider}-{index}",
+                lm=lm,
+                weight=spec.weight,
+                # llama.cpp serves -np 4 slots in serve.sh; a hosted provider has no such cap
+                max_in_flight=spec.max_in_flight if spec.max_in_flight is not None else 4 * (spec.provider == "local"),
+                # the paid provider is overflow unless said otherwise
+                overflow=spec.overflow if spec.overflow is not None else spec.provider == "openrouter",
+            )
+        )
+    if backends and all(backend.overflow for backend in backends):
+        raise ValueError("DSPY_BACKENDS needs at least one backend that is not overflow")
+    return backends
+
+
+def load_llm_config() -> LLMConfig:
+    """Load LM configuration from environment variables.
+
+    With ``DSPY_BACKENDS`` set, the returned config describes a routed pool: ``backends`` lists every endpoint and
+    ``model``/``api_base`` mirror the first non-overflow one (what the classifiers report as their model).
+    """
+
+    env = EnvironmentSettings()  # pyright: ignore[reportCallIssue]
+    if env.raw_backends:
+        backends = _load_backends(env)
+        primary = next(backend for backend in backends if not backend.overflow).lm
+        return primary.model_copy(
+            update={
+                "backends": backends,
+                "router": RouterConfig(
+                    strategy=env.router_strategy,
+                    eject_after_failures=env.router_eject_after_failures,
+                    eject_seconds=env.router_eject_seconds,
+                ),
+            }
+        )
+
+    if env.provider.lower() == "local":
+        return _local_llm_config(env, env.model_name, env.local_base)
+
+    # OpenRouter provider (default)
+    return _openrouter_llm_config(env, env.model_name)
+
+
 def get_display_model_name(model: str | None = None) -> str | None:
     """Strip LiteLLM provider routing prefixes (openai/, openrouter/, etc.) for display/storage."""
     if model is None:
+        import dspy
+
         model = dspy.settings.lm.model if dspy.settings.lm else None
 
     if model is None:
@@ -194,26 +375,111 @@ def ensure_dspy_cache_dir(cache_dir: Path | None = None) -> Path:
     return path
 
 
-def configure_lm() -> dspy.LM:
-    ensure_dspy_cache_dir()
-    cfg = load_llm_config()
-    lm = dspy.LM(
+def configure_http_clients(config: HTTPClientConfig) -> None:
+    """Install one pooled keep-alive HTTP client per process for LiteLLM's LM calls.
+
+    OpenAI-compatible backends (``openai/`` models such as llama.cpp) go through the OpenAI SDK, which uses
+    ``litellm.aclient_session`` and ``litellm.client_session``. OpenRouter goes through LiteLLM's own handler, which
+    keeps one aiohttp session per provider; its connector limit and keepalive are set from the same config (aiohttp
+    speaks HTTP/1.1 only). The first call wins, so every classifier in the process shares the pool.
+    """
+    import httpx
+    import litellm
+    from litellm.llms.custom_httpx import http_handler
+
+    if litellm.aclient_session is not None:
+        return
+    http2 = config.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("DSPY_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+    pool = {
+        "limits": httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry_seconds,
+        ),
+        "timeout": httpx.Timeout(config.read_timeout_seconds, connect=config.connect_timeout_seconds),
+        "http2": http2,
+        "follow_redirects": True,
+    }
+    litellm.aclient_session = httpx.AsyncClient(**pool)
+    litellm.client_session = httpx.Client(**pool)
+    # Read when LiteLLM creates its (cached) aiohttp transport, so these must be set before the first LM call.
+    http_handler.AIOHTTP_CONNECTOR_LIMIT = config.max_connections
+    http_handler.AIOHTTP_CONNECTOR_LIMIT_PER_HOST = config.max_connections
+    http_handler.AIOHTTP_KEEPALIVE_TIMEOUT = config.keepalive_expiry_seconds
+
+
+def create_lm(cfg: LLMConfig, num_retries: int = 3) -> dspy.BaseLM:
+    """Build the LM for ``cfg`` on the process-wide HTTP pool, without making it the default LM.
+
+    A config with ``backends`` becomes a :class:`~src.common.router.RoutedLM` over one ``dspy.LM`` per backend. Those
+    do not retry on their own, so a failing backend fails over to another one instead of being retried. With
+    ``prefix_cache`` the LM is a :class:`~src.common.llama_cpp.LlamaCppLM`, which sends llama.cpp's prompt-cache hints.
+    """
+    import dspy
+    import httpx
+
+    if cfg.backends:
+        from .router import RoutedLM
+
+        return RoutedLM(
+            [(backend, create_lm(backend.lm, num_retries=0)) for backend in cfg.backends],
+            cfg.router,
+        )
+
+    configure_http_clients(cfg.http)
+    lm_class = dspy.LM
+    if cfg.prefix_cache:
+        from .llama_cpp import LlamaCppLM
+
+        lm_class = LlamaCppLM
+    return lm_class(
         cfg.model,
         api_key=cfg.api_key,
         api_base=cfg.api_base,
         headers=cfg.headers or None,
         max_tokens=8000,
         cache=False,
+        num_retries=num_retries,
+        # LiteLLM applies a per-request timeout over the client's own; a float would also replace the connect timeout.
+        timeout=httpx.Timeout(cfg.http.read_timeout_seconds, connect=cfg.http.connect_timeout_seconds),
     )
-    dspy.configure(lm=lm)
+
+
+def configure_lm() -> dspy.BaseLM:
+    # DSPy and LiteLLM are imported here, not at module level, so the API can import (and serve its schema and
+    # health checks) without paying for them.
+    ensure_dspy_cache_dir()
+    import dspy
+
+    cfg = load_llm_config()
+    lm = create_lm(cfg)
+    prefix_cache = cfg.prefix_cache or any(backend.lm.prefix_cache for backend in cfg.backends)
+    adapter = None  # DSPy's default ChatAdapter
+    env = EnvironmentSettings()  # pyright: ignore[reportCallIssue]
+    compact = env.adapter == "compact"
+    if prefix_cache or compact or env.constrained_decoding is not ConstrainedDecoding.OFF:
+        from .constrained import constrained_adapter
+
+        adapter = constrained_adapter(env.constrained_decoding, prefix_cache=prefix_cache, compact=compact)
+    dspy.configure(lm=lm, adapter=adapter)
     return lm
 
 
 __all__ = [
     "DEFAULT_MODEL",
     "DEFAULT_CACHE_DIR",
+    "BackendConfig",
+    "BackendSpec",
+    "EnvironmentSettings",
+    "HTTPClientConfig",
     "LLMConfig",
+    "RouterConfig",
+    "configure_http_clients",
     "configure_lm",
+    "create_lm",
     "ensure_dspy_cache_dir",
     "get_display_model_name",
     "load_llm_config",
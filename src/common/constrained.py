@@ -0,0 +1,223 @@
+"""Constrained label decoding: hold the backend to a signature's closed label set while it decodes."""
+
+from __future__ import annotations
+
+import abc
+import functools
+import json
+from typing import Any
+
+import dspy
+import litellm
+from loguru import logger
+
+from .compact import CompactChatAdapter
+from .llama_cpp import StablePrefixChatAdapter
+from .types import ConstrainedDecoding
+
+
+def signature_labels(signature: type[dspy.Signature]) -> dict[str, tuple[str, ...]]:
+    """Output fields of ``signature`` that carry a closed label set (``json_schema_extra["labels"]``)."""
+    labels: dict[str, tuple[str, ...]] = {}
+    for name, field in signature.output_fields.items():
+        extra = field.json_schema_extra if isinstance(field.json_schema_extra, dict) else {}
+        if extra.get("labels"):
+            labels[name] = tuple(extra["labels"])
+    return labels
+
+
+def _gbnf_literal(text: str) -> str:
+    return json.dumps(text, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=64)
+def label_grammar(
+    fields: tuple[str, ...], labels: tuple[tuple[str, tuple[str, ...]], ...], compact: bool = False
+) -> str:
+    """GBNF grammar of a ``ChatAdapter`` completion: every field in order, labelled fields limited to their labels.
+
+    Free-text fields may contain anything but the ``[[`` that opens the next field header. With ``compact`` the
+    grammar follows :class:`~src.common.compact.CompactChatAdapter`'s ``name: value`` lines instead, and free-text
+    fields are a single line.
+    """
+    choices = dict(labels)
+    rules: list[str] = []
+    parts: list[str] = []
+    for index, name in enumerate(fields):
+        if compact and index:
+            parts.append(_gbnf_literal("\n"))
+        parts.append(_gbnf_literal(f"{name}: " if compact else f"[[ ## {name} ## ]]\n"))
+        if name in choices:
+            rule = f"{name.replace('_', '-')}-label"
+            rules.append(f"{rule} ::= " + " | ".join(_gbnf_literal(label) for label in choices[name]))
+            parts.append(rule)
+        else:
+            parts.append("text")
+        if not compact:
+            parts.append(_gbnf_literal("\n\n"))
+    if compact:
+        return "\n".join([f"root ::= {' '.join(parts)}", *rules, "text ::= [^\\n]+"])
+    parts.append(_gbnf_literal("[[ ## completed ## ]]"))
+    return "\n".join([f"root ::= {' '.join(parts)}", *rules, 'text ::= ([^\\[] | "[" [^\\[])+'])
+
+
+@functools.lru_cache(maxsize=64)
+def label_json_schema(fields: tuple[str, ...], labels: tuple[tuple[str, tuple[str, ...]], ...]) -> dict[str, Any]:
+    """OpenAI ``response_format`` for a JSON object with every field, labelled fields as an enum of their labels."""
+    choices = dict(labels)
+    properties = {
+        name: {"type": "string", "enum": list(choices[name])} if name in choices else {"type": "string"}
+        for name in fields
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "classification",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(fields),
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+class _LabelConstrainedAdapter(abc.ABC):
+    """Adds a decoding constraint to calls of signatures with labelled output fields.
+
+    A backend that rejects the constraint (HTTP 400) is called again without it; once that succeeds, the model is
+    remembered and later calls to it go out unconstrained.
+    """
+
+    constraint: ConstrainedDecoding
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._unsupported: set[str] = set()
+
+    @abc.abstractmethod
+    def _constraint_kwargs(self, signature: type[dspy.Signature], lm_kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Request kwargs that hold the backend to the labels of ``signature`` (merged over ``lm_kwargs``)."""
+
+    def _constrained(self, lm: dspy.BaseLM, lm_kwargs: dict[str, Any], signature: type[dspy.Signature]):
+        if lm.model in self._unsupported or not signature_labels(signature):
+            return None
+        return {**lm_kwargs, **self._constraint_kwargs(signature, lm_kwargs)}
+
+    def _mark_unsupported(self, lm: dspy.BaseLM, exc: Exception) -> None:
+        self._unsupported.add(lm.model)
+        logger.warning(
+            "Backend for {} rejected {} constrained decoding; sending unconstrained requests ({})",
+            lm.model,
+            self.constraint,
+            exc,
+        )
+
+    def __call__(self, lm, lm_kwargs, signature, demos, inputs):
+        constrained = self._constrained(lm, lm_kwargs, signature)
+        if constrained is None:
+            return super().__call__(lm, lm_kwargs, signature, demos, inputs)
+        try:
+            return super().__call__(lm, constrained, signature, demos, inputs)
+        except litellm.BadRequestError as exc:
+            result = super().__call__(lm, lm_kwargs, signature, demos, inputs)
+            self._mark_unsupported(lm, exc)
+            return result
+
+    async def acall(self, lm, lm_kwargs, signature, demos, inputs):
+        constrained = self._constrained(lm, lm_kwargs, signature)
+        if constrained is None:
+            return await super().acall(lm, lm_kwargs, signature, demos, inputs)
+        try:
+            return await super().acall(lm, constrained, signature, demos, inputs)
+        except litellm.BadRequestError as exc:
+            result = await super().acall(lm, lm_kwargs, signature, demos, inputs)
+            self._mark_unsupported(lm, exc)
+            return result
+
+
+class _GrammarConstrainedAdapter(_LabelConstrainedAdapter):
+    constraint = ConstrainedDecoding.GRAMMAR
+    compact = False
+
+    def _constraint_kwargs(self, signature: type[dspy.Signature], lm_kwargs: dict[str, Any]) -> dict[str, Any]:
+        grammar = label_grammar(
+            tuple(signature.output_fields), tuple(signature_labels(signature).items()), compact=self.compact
+        )
+        return {"extra_body": {**lm_kwargs.get("extra_body", {}), "grammar": grammar}}
+
+
+class ConstrainedChatAdapter(_GrammarConstrainedAdapter, dspy.ChatAdapter):
+    """``ChatAdapter`` that sends llama.cpp a grammar of its own output format with the labels as the only choices.
+
+    The prompt is unchanged. The completion always parses, so there is no ``JSONAdapter`` fallback.
+    """
+
+    def __init__(self, callbacks=None):
+        super().__init__(callbacks=callbacks, use_json_adapter_fallback=False)
+
+
+class ConstrainedStablePrefixChatAdapter(_GrammarConstrainedAdapter, StablePrefixChatAdapter):
+    """:class:`~src.common.llama_cpp.StablePrefixChatAdapter` with the label grammar of :class:`ConstrainedChatAdapter`."""
+
+
+class ConstrainedCompactChatAdapter(_GrammarConstrainedAdapter, CompactChatAdapter):
+    """:class:`~src.common.compact.CompactChatAdapter` with a label grammar of its ``name: value`` lines."""
+
+    compact = True
+
+
+class ConstrainedJSONAdapter(_LabelConstrainedAdapter, dspy.JSONAdapter):
+    """``JSONAdapter`` that asks for a JSON-schema ``response_format`` whose labelled fields are enums of the labels.
+
+    The schema is sent whatever LiteLLM knows about the model, since OpenAI-compatible servers such as llama.cpp and
+    vLLM accept it; signatures without labels get ``JSONAdapter``'s own structured-output handling.
+    """
+
+    constraint = ConstrainedDecoding.JSON_SCHEMA
+
+    def _constraint_kwargs(self, signature: type[dspy.Signature], lm_kwargs: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "response_format": label_json_schema(
+                tuple(signature.output_fields), tuple(signature_labels(signature).items())
+            )
+        }
+
+    def _json_adapter_call_common(self, lm, lm_kwargs, signature, demos, inputs, call_fn):
+        if isinstance(lm_kwargs.get("response_format"), dict):
+            return call_fn(lm, lm_kwargs, signature, demos, inputs)
+        return super()._json_adapter_call_common(lm, lm_kwargs, signature, demos, inputs, call_fn)
+
+
+def constrained_adapter(
+    mode: ConstrainedDecoding, prefix_cache: bool = False, compact: bool = False
+) -> dspy.Adapter | None:
+    """The adapter for ``mode``, or ``None`` (DSPy's default) when decoding is not constrained.
+
+    ``compact`` selects :class:`~src.common.compact.CompactChatAdapter`'s prompt format; it does not apply to the
+    JSON-schema mode, whose prompt is ``JSONAdapter``'s.
+    """
+    mode = ConstrainedDecoding(mode)
+    if mode is ConstrainedDecoding.JSON_SCHEMA:
+        return ConstrainedJSONAdapter()
+    if mode is ConstrainedDecoding.GRAMMAR:
+        if compact:
+            return ConstrainedCompactChatAdapter()
+        return ConstrainedStablePrefixChatAdapter() if prefix_cache else ConstrainedChatAdapter()
+    if compact:
+        return CompactChatAdapter()
+    return StablePrefixChatAdapter() if prefix_cache else None
+
+
+__all__ = [
+    "ConstrainedChatAdapter",
+    "ConstrainedCompactChatAdapter",
+    "ConstrainedJSONAdapter",
+    "ConstrainedStablePrefixChatAdapter",
+    "constrained_adapter",
+    "label_grammar",
+    "label_json_schema",
+    "signature_labels",
+]
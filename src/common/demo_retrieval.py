@@ -0,0 +1,170 @@
+"""Per-request few-shot demos: the labelled training examples most similar to a complaint, from a precomputed index.
+
+:func:`build_demo_index` turns a classifier's ``train.json`` into hashed TF-IDF vectors over word unigrams and
+bigrams. They are saved as a feature-major NumPy matrix (``vectors.npy``, one row per feature, one column per
+example) with the IDF weights and the examples beside it. :class:`DemoIndex` memory-maps the matrix, so a lookup only
+reads the rows of the features the complaint contains, and scores every example with one small matrix product.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import re
+import zlib
+from collections import Counter
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+N_FEATURES = 1 << 13
+INDEX_VERSION = 1
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def _feature_counts(text: str, n_features: int) -> Counter[int]:
+    words = _WORD.findall(text.lower())
+    features = [*words, *(f"{first} {second}" for first, second in zip(words, words[1:], strict=False))]
+    return Counter(zlib.crc32(feature.encode()) % n_features for feature in features)
+
+
+def _source_digest(examples: Sequence[dict[str, str]]) -> str:
+    return hashlib.sha256(json.dumps(examples, sort_keys=True).encode()).hexdigest()
+
+
+def training_examples(path: Path) -> list[dict[str, str]]:
+    """``complaint``, ``classification`` and ``justification`` of each item in a ``train.json``.
+
+    The datasets' one-sentence ``reasoning`` becomes the justification, which keeps the demos short.
+    """
+    items = json.loads(path.read_text(encoding="utf-8"))
+    return [
+        {
+            "complaint": item.get("complaint") or item.get("narrative", ""),
+            "classification": item.get("label") or item.get("category", ""),
+            "justification": item.get("reasoning", ""),
+        }
+        for item in items
+    ]
+
+
+def build_demo_index(examples: Sequence[dict[str, str]], directory: Path, n_features: int = N_FEATURES) -> Path:
+    """Write the index of ``examples`` (see :func:`training_examples`) to ``directory`` and return it."""
+    counts = [_feature_counts(example["complaint"], n_features) for example in examples]
+    document_frequency = np.zeros(n_features, dtype=np.float32)
+    for row in counts:
+        document_frequency[list(row)] += 1
+    idf = (np.log((1 + len(examples)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    vectors = np.zeros((n_features, len(examples)), dtype=np.float32)
+    for column, row in enumerate(counts):
+        features = np.fromiter(row, dtype=np.int64)
+        weights = (1 + np.log(np.fromiter(row.values(), dtype=np.float32))) * idf[features]
+        norm = np.linalg.norm(weights)
+        vectors[features, column] = weights / norm if norm else weights
+
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "version": INDEX_VERSION,
+        "n_features": n_features,
+        "source_sha256": _source_digest(examples),
+        "examples": list(examples),
+    }
+    # each file is replaced whole, and the manifest last, so a reader never maps a half-written matrix
+    for name, write in (
+        ("vectors.npy", lambda fp: np.save(fp, vectors)),
+        ("idf.npy", lambda fp: np.save(fp, idf)),
+        ("examples.json", lambda fp: fp.write(json.dumps(manifest).encode())),
+    ):
+        partial = directory / f".{name}.{os.getpid()}"
+        with partial.open("wb") as fp:
+            write(fp)
+        os.replace(partial, directory / name)
+    return directory
+
+
+class DemoIndex:
+    """A built index, with the vector matrix memory-mapped read-only."""
+
+    def __init__(self, directory: Path):
+        manifest = json.loads((directory / "examples.json").read_text(encoding="utf-8"))
+        if manifest.get("version") != INDEX_VERSION:
+            raise ValueError(f"Demo index {directory} has version {manifest.get('version')}, expected {INDEX_VERSION}")
+        self.directory = directory
+        self.n_features: int = manifest["n_features"]
+        self.source_sha256: str = manifest["source_sha256"]
+        self.examples: list[dict[str, str]] = manifest["examples"]
+        self.vectors = np.load(directory / "vectors.npy", mmap_mode="r")
+        self.idf = np.load(directory / "idf.npy")
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+    def scores(self, complaint: str) -> np.ndarray:
+        """Cosine similarity of ``complaint`` to every example."""
+        row = _feature_counts(complaint, self.n_features)
+        if not row:
+            return np.zeros(len(self.examples), dtype=np.float32)
+        features = np.fromiter(sorted(row), dtype=np.int64)
+        weights = (1 + np.log(np.array([row[feature] for feature in features], dtype=np.float32))) * self.idf[features]
+        return (weights / np.linalg.norm(weights)) @ self.vectors[features]
+
+    def top_k(self, complaint: str, k: int) -> list[dict[str, str]]:
+        """The ``k`` examples most similar to ``complaint``, most similar first, skipping the complaint itself."""
+        if k <= 0:
+            return []
+        order = np.argsort(-self.scores(complaint), kind="stable")
+        picked: list[dict[str, str]] = []
+        for position in order:
+            example = self.examples[int(position)]
+            if example["complaint"] != complaint:
+                picked.append(example)
+                if len(picked) == k:
+                    break
+        return picked
+
+
+class DemoRetriever:
+    """Callable giving a complaint its ``k`` retrieved demos, in the order the prompt shows them."""
+
+    def __init__(self, index: DemoIndex, k: int):
+        self.index = index
+        self.k = k
+
+    def __call__(self, complaint: str) -> list[dict[str, Any]]:
+        # the most similar demo goes last, right before the complaint
+        return list(reversed(self.index.top_k(complaint, self.k)))
+
+
+@functools.lru_cache(maxsize=8)
+def demo_index_for(classification_type: str) -> DemoIndex:
+    """The index of a built-in classifier's ``train.json``, (re)built when missing or older than the data."""
+    from .paths import get_demo_index_dir, get_train_data_path
+    from .types import ClassificationType
+
+    classification_type = ClassificationType(classification_type)
+    directory = get_demo_index_dir(classification_type)
+    examples = training_examples(get_train_data_path(classification_type))
+    try:
+        index = DemoIndex(directory)
+    except (OSError, ValueError, KeyError):
+        index = None
+    if index is None or index.source_sha256 != _source_digest(examples):
+        index = DemoIndex(build_demo_index(examples, directory))
+    return index
+
+
+__all__ = [
+    "INDEX_VERSION",
+    "N_FEATURES",
+    "DemoIndex",
+    "DemoRetriever",
+    "build_demo_index",
+    "demo_index_for",
+    "training_examples",
+]
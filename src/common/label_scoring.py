@@ -0,0 +1,235 @@
+"""Logprob label scoring: pick the label from the backend's next-token log-probabilities instead of generating one."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+import dspy
+from dspy.utils.exceptions import AdapterParseError
+
+from .llama_cpp import StablePrefixChatAdapter
+from .types import InferenceProfile
+
+if TYPE_CHECKING:
+    from .classifier import ComplaintClassifier
+
+# (token, logprob, [(alternative token, logprob), ...]) for each generated token
+TokenLogprobs = tuple[str, float, list[tuple[str, float]]]
+
+_LABEL_HEADER = "[[ ## classification ## ]]"
+
+# temperatures tried by fit_temperature, log-spaced from 0.05 to 20
+_TEMPERATURE_GRID = tuple(math.exp(math.log(0.05) + step * math.log(400) / 240) for step in range(241))
+# probability a label with no score is given when its log-likelihood is measured
+_PROBABILITY_FLOOR = 1e-6
+
+
+def _get(item: Any, name: str) -> Any:
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+def token_logprobs(logprobs: Any) -> list[TokenLogprobs]:
+    """Flatten OpenAI-style ``choices[0].logprobs`` (objects or dicts) into :data:`TokenLogprobs`."""
+    steps: list[TokenLogprobs] = []
+    for entry in _get(logprobs, "content") or []:
+        alternatives = [(_get(alt, "token"), _get(alt, "logprob")) for alt in _get(entry, "top_logprobs") or []]
+        steps.append((_get(entry, "token"), _get(entry, "logprob"), alternatives))
+    return steps
+
+
+def _matches(label: str, candidate: str) -> bool:
+    """``candidate`` is a prefix of ``label``, or ``label`` followed by whitespace (the end of the field)."""
+    return label.startswith(candidate) or (
+        candidate.startswith(label) and candidate[len(label) : len(label) + 1].isspace()
+    )
+
+
+def label_probabilities(steps: Sequence[TokenLogprobs], labels: Sequence[str]) -> dict[str, float]:
+    """Probability of each label, read off the logprobs of a completion that wrote one of them.
+
+    Scoring starts after the ``classification`` field header (or at the first token if there is none). At each token
+    of the label, the probability of every alternative token that starts another label goes to that label, and the
+    completion's own path goes to the label it spells out once no other label shares its prefix. Labels the backend
+    never offered get zero; the rest are normalized over the label set, so mass on tokens that start no label is
+    dropped. Matching ignores case.
+    """
+    folded = {label: label.casefold() for label in labels}
+    text = ""
+    start = 0
+    for index, (token, _, _) in enumerate(steps):
+        text += token
+        if _LABEL_HEADER in text:
+            start = index + 1
+            break
+
+    scores = dict.fromkeys(labels, 0.0)
+    prefix = ""
+    path = 0.0  # logprob of the label tokens generated so far
+    live = list(labels)
+    for token, logprob, alternatives in steps[start:]:
+        if not prefix and not token.strip():
+            continue  # the newline between header and label
+        for alternative, alternative_logprob in alternatives:
+            if alternative == token:
+                continue
+            candidate = (prefix + alternative if prefix else alternative.lstrip()).casefold()
+            group = [label for label in live if candidate and _matches(folded[label], candidate)]
+            for label in group:
+                scores[label] += math.exp(path + alternative_logprob) / len(group)
+
+        prefix = prefix + token if prefix else token.lstrip()
+        candidate = prefix.casefold()
+        group = [label for label in live if _matches(folded[label], candidate)]
+        if not group:
+            break  # the completion left the label set
+        path += logprob
+        live = group
+        if len(live) == 1:
+            scores[live[0]] += math.exp(path)
+            break
+    else:
+        if prefix:
+            # ran out of tokens with several labels still sharing the prefix: credit the one spelled out, if any
+            complete = [label for label in live if folded[label] == prefix.strip().casefold()] or live
+            for label in complete:
+                scores[label] += math.exp(path) / len(complete)
+
+    total = sum(scores.values())
+    return {label: score / total for label, score in scores.items()} if total > 0 else scores
+
+
+def apply_temperature(probabilities: dict[str, float], temperature: float) -> dict[str, float]:
+    """Temperature-scaled ``probabilities``: each raised to ``1 / temperature`` and renormalized over the labels.
+
+    This is the softmax of the label log-probabilities divided by ``temperature``, so ``temperature > 1`` flattens an
+    overconfident distribution and ``temperature < 1`` sharpens it. Labels with no probability keep none.
+    """
+    if temperature == 1.0:
+        return dict(probabilities)
+    scaled = {label: p ** (1 / temperature) if p > 0 else 0.0 for label, p in probabilities.items()}
+    total = sum(scaled.values())
+    return {label: p / total for label, p in scaled.items()} if total > 0 else scaled
+
+
+def _negative_log_likelihood(
+    probability_sets: Sequence[dict[str, float]], truths: Sequence[str], temperature: float
+) -> float:
+    return -sum(
+        math.log(max(_PROBABILITY_FLOOR, apply_temperature(probabilities, temperature).get(truth, 0.0)))
+        for probabilities, truth in zip(probability_sets, truths, strict=True)
+    ) / len(truths)
+
+
+def fit_temperature(probability_sets: Sequence[dict[str, float]], truths: Sequence[str]) -> float:
+    """The temperature that minimizes the negative log-likelihood of ``truths`` (temperature scaling).
+
+    ``probability_sets`` are the unscaled :func:`label_probabilities` of a held-out split and ``truths`` its labels.
+    """
+    if not truths:
+        raise ValueError("No scored examples to fit a temperature on")
+    best = min(_TEMPERATURE_GRID, key=lambda t: _negative_log_likelihood(probability_sets, truths, t))
+    return round(best, 3)
+
+
+def expected_calibration_error(
+    probability_sets: Sequence[dict[str, float]], truths: Sequence[str], bins: int = 10
+) -> float:
+    """Mean gap between confidence and accuracy of the top label, over ``bins`` equal-width confidence bins."""
+    binned: list[list[tuple[float, bool]]] = [[] for _ in range(bins)]
+    for probabilities, truth in zip(probability_sets, truths, strict=True):
+        label, confidence = max(probabilities.items(), key=lambda item: item[1])
+        binned[min(bins - 1, int(confidence * bins))].append((confidence, label == truth))
+    return sum(
+        abs(sum(c for c, _ in members) - sum(correct for _, correct in members)) for members in binned if members
+    ) / len(truths)
+
+
+def label_calibration_metadata(probability_sets: Sequence[dict[str, float]], truths: Sequence[str]) -> dict[str, Any]:
+    """Artifact metadata for the temperature fitted on a held-out split, and the calibration it buys there."""
+    temperature = fit_temperature(probability_sets, truths)
+    scaled = [apply_temperature(probabilities, temperature) for probabilities in probability_sets]
+    return {
+        "label_temperature": temperature,
+        "label_calibration": {
+            "samples": len(truths),
+            "nll_before": round(_negative_log_likelihood(probability_sets, truths, 1.0), 4),
+            "nll_after": round(_negative_log_likelihood(probability_sets, truths, temperature), 4),
+            "ece_before": round(expected_calibration_error(probability_sets, truths), 4),
+            "ece_after": round(expected_calibration_error(scaled, truths), 4),
+        },
+    }
+
+
+class LabelScorer(dspy.Module):
+    """Serve-time view of a loaded :class:`~src.common.classifier.ComplaintClassifier` that scores labels.
+
+    The prompt is the optimized ``label-only`` one, with the artifact's demos or the retrieved ones. The backend is asked
+    for a short completion with ``top_logprobs`` (llama.cpp's OpenAI endpoint maps them to ``n_probs``), and the label
+    with the highest :func:`label_probabilities` wins. With a ``label_temperature`` in the artifact's metadata (see
+    :func:`fit_temperature`) the probabilities are temperature-scaled first; the justification reports them.
+    """
+
+    def __init__(self, classifier: ComplaintClassifier, top_logprobs: int = 20, max_tokens: int = 48):
+        super().__init__()
+        lean = classifier.for_profile(InferenceProfile.LABEL_ONLY)
+        self.classify = lean.classify
+        self._inputs = lean._inputs
+        self.labels = list(self.classify.signature.output_fields["classification"].json_schema_extra["labels"])
+        self.top_logprobs = top_logprobs
+        self.max_tokens = max_tokens
+        self.temperature = classifier.label_temperature
+        self._adapter = StablePrefixChatAdapter()
+
+    def _request(self, complaint: str) -> tuple[dspy.BaseLM, dict[str, Any]]:
+        lm = self.classify.lm or dspy.settings.lm
+        inputs = self._inputs(complaint)
+        demos = inputs.pop("demos", self.classify.demos)
+        messages = self._adapter.format(self.classify.signature, demos, inputs)
+        return lm, {
+            "messages": messages,
+            "logprobs": True,
+            "top_logprobs": self.top_logprobs,
+            "max_tokens": self.max_tokens,
+        }
+
+    def _prediction(self, output: dict[str, Any] | str) -> dspy.Prediction:
+        text = output if isinstance(output, str) else output.get("text") or ""
+        logprobs = None if isinstance(output, str) else output.get("logprobs")
+        probabilities = label_probabilities(token_logprobs(logprobs), self.labels)
+        if not any(probabilities.values()):
+            raise AdapterParseError(
+                adapter_name="LabelScorer",
+                signature=self.classify.signature,
+                lm_response=text,
+                message="The backend returned no logprobs for any label",
+            )
+        if self.temperature is not None:
+            probabilities = apply_temperature(probabilities, self.temperature)
+        ranked = sorted(probabilities.items(), key=lambda item: item[1], reverse=True)
+        return dspy.Prediction(
+            classification=ranked[0][0],
+            justification="Label probabilities: " + ", ".join(f"{label} {p:.3f}" for label, p in ranked if p > 0),
+            probabilities=probabilities,
+        )
+
+    def forward(self, complaint: str) -> dspy.Prediction:
+        lm, request = self._request(complaint)
+        return self._prediction(lm(**request)[0])
+
+    async def aforward(self, complaint: str) -> dspy.Prediction:
+        lm, request = self._request(complaint)
+        return self._prediction((await lm.acall(**request))[0])
+
+
+__all__ = [
+    "LabelScorer",
+    "TokenLogprobs",
+    "apply_temperature",
+    "expected_calibration_error",
+    "fit_temperature",
+    "label_calibration_metadata",
+    "label_probabilities",
+    "token_logprobs",
+]
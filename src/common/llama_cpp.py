@@ -0,0 +1,85 @@
+"""Prompt-prefix caching for llama.cpp backends: a byte-stable prompt layout and per-call cache/slot hints."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+import dspy
+from dspy.adapters.types.base_type import split_message_content_for_custom_types
+
+from .slots import llama_slot
+
+_MAX_CACHED_PREFIXES = 64
+
+
+def _llama_cpp_kwargs(lm_kwargs: dict[str, Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+    extra_body = {**lm_kwargs.get("extra_body", {}), **kwargs.get("extra_body", {}), "cache_prompt": True}
+    slot = llama_slot.get()
+    if slot is not None:
+        extra_body["id_slot"] = slot
+    return {**kwargs, "extra_body": extra_body}
+
+
+class LlamaCppLM(dspy.LM):
+    """``dspy.LM`` for a llama.cpp server that asks it to reuse the KV cache of the prompt prefix.
+
+    Every request carries ``cache_prompt: true``, and ``id_slot`` when a :class:`~src.common.slots.SlotPinner` pinned
+    the call, so llama.cpp only processes the tokens after the longest prefix the slot has already seen.
+    """
+
+    def forward(self, prompt: str | None = None, messages: list[dict[str, Any]] | None = None, **kwargs):
+        return super().forward(prompt=prompt, messages=messages, **_llama_cpp_kwargs(self.kwargs, kwargs))
+
+    async def aforward(self, prompt: str | None = None, messages: list[dict[str, Any]] | None = None, **kwargs):
+        return await super().aforward(prompt=prompt, messages=messages, **_llama_cpp_kwargs(self.kwargs, kwargs))
+
+
+class StablePrefixChatAdapter(dspy.ChatAdapter):
+    """``ChatAdapter`` whose system message and demos are rendered once per predictor and reused verbatim.
+
+    The messages are the ones ``ChatAdapter`` would send; only the complaint's user message is rendered per call, so
+    every call of a predictor starts with the same bytes. There is no fallback to ``JSONAdapter`` on a failed call: its
+    different system prompt would replace the cached prefix in the slot, and a parse failure surfaces as an error
+    instead.
+    """
+
+    def __init__(self, callbacks=None):
+        super().__init__(callbacks=callbacks, use_json_adapter_fallback=False)
+        # (signature, id(demos)) -> (demos, demo count, rendered prefix); holding the list keeps its id from being reused
+        self._prefixes: OrderedDict[tuple[type[dspy.Signature], int], tuple[list, int, list[dict[str, Any]]]] = (
+            OrderedDict()
+        )
+
+    def _prefix(self, signature: type[dspy.Signature], demos: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        key = (signature, id(demos))
+        cached = self._prefixes.get(key)
+        if cached is not None and cached[0] is demos and cached[1] == len(demos):
+            self._prefixes.move_to_end(key)
+            return cached[2]
+        prefix = [{"role": "system", "content": self.format_system_message(signature)}]
+        prefix.extend(self.format_demos(signature, demos))
+        self._prefixes[key] = (demos, len(demos), prefix)
+        if len(self._prefixes) > _MAX_CACHED_PREFIXES:
+            self._prefixes.popitem(last=False)
+        return prefix
+
+    def format(
+        self,
+        signature: type[dspy.Signature],
+        demos: list[dict[str, Any]],
+        inputs: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        if self._get_history_field_name(signature):
+            return super().format(signature, demos, inputs)
+        messages = [dict(message) for message in self._prefix(signature, demos)]
+        messages.append(
+            {"role": "user", "content": self.format_user_message_content(signature, dict(inputs), main_request=True)}
+        )
+        return split_message_content_for_custom_types(messages)
+
+
+__all__ = [
+    "LlamaCppLM",
+    "StablePrefixChatAdapter",
+]
@@ -39,6 +39,11 @@ def get_test_data_path(classification_type: ClassificationType = DEFAULT_CLASSIF
     return get_classification_data_dir(classification_type) / "test.json"
 
 
+def get_demo_index_dir(classification_type: ClassificationType = DEFAULT_CLASSIFICATION_TYPE) -> Path:
+    """Get the directory of the retrieval index over the training set (see ``src/common/demo_retrieval.py``)."""
+    return get_classification_data_dir(classification_type) / "demo_index"
+
+
 def get_classifier_artifact_path(classification_type: ClassificationType = DEFAULT_CLASSIFICATION_TYPE) -> Path:
     """Get the artifact path for a specific classification type."""
     type_slug = CLASSIFICATION_TYPES[classification_type].replace("-classification", "")
@@ -54,5 +59,6 @@ __all__ = [
     "get_classification_data_dir",
     "get_train_data_path",
     "get_test_data_path",
+    "get_demo_index_dir",
     "get_classifier_artifact_path",
 ]
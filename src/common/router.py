@@ -0,0 +1,191 @@
+"""LM that routes each call to one backend of a pool, balancing load and failing over around unhealthy backends."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+import dspy
+import litellm
+
+from .config import BackendConfig, RouterConfig
+
+_EWMA_SMOOTHING = 0.3
+
+
+class BackendUnavailable(RuntimeError):
+    """Raised when every backend in the pool failed the call."""
+
+
+def _is_backend_failure(exc: BaseException) -> bool:
+    # a request the model rejects (bad parameters, context too long) would fail on every backend
+    return isinstance(exc, Exception) and not isinstance(exc, litellm.BadRequestError)
+
+
+class _Backend:
+    """Routing state for one pool member; guarded by the router's lock."""
+
+    def __init__(self, config: BackendConfig, lm: dspy.BaseLM):
+        self.config = config
+        self.lm = lm
+        self.outstanding = 0
+        self.ewma_seconds: float | None = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def saturated(self) -> bool:
+        return 0 < self.config.max_in_flight <= self.outstanding
+
+    def score(self, strategy: str) -> float:
+        load = (self.outstanding + 1) / self.config.weight
+        if strategy == "ewma":
+            # expected wait: recent latency times the calls it would queue behind; unmeasured backends go first
+            return load * (self.ewma_seconds or 0.0)
+        return load
+
+    def stats(self, now: float) -> dict[str, Any]:
+        return {
+            "model": self.lm.model,
+            "api_base": self.config.lm.api_base,
+            "overflow": self.config.overflow,
+            "weight": self.config.weight,
+            "max_in_flight": self.config.max_in_flight,
+            "outstanding": self.outstanding,
+            "ewma_ms": None if self.ewma_seconds is None else round(self.ewma_seconds * 1000, 1),
+            "calls": self.calls,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "ejected": self.ejected_until > now,
+        }
+
+
+class RoutedLM(dspy.BaseLM):
+    """Spread LM calls over a pool of backends.
+
+    Each call goes to the best non-overflow backend that is neither ejected nor saturated (``max_in_flight`` calls
+    outstanding): the one with the fewest outstanding calls per unit of ``weight``, or with ``strategy="ewma"`` the
+    lowest EWMA latency times queue position. Overflow backends (e.g. OpenRouter behind local llama.cpp boxes) only
+    take calls while every local backend is saturated or ejected; when everything is saturated the call queues on the
+    least-loaded local backend rather than spilling over. A backend that fails ``eject_after_failures`` calls in a row
+    is skipped for ``eject_seconds``, and a failed call is retried on the next-best backend that has not seen it.
+
+    DSPy sees this as a single LM: ``model`` and ``kwargs`` are those of the first backend, and usage is reported by
+    the backend that served the call.
+    """
+
+    def __init__(self, backends: Sequence[tuple[BackendConfig, dspy.BaseLM]], config: RouterConfig | None = None):
+        if not backends:
+            raise ValueError("RoutedLM needs at least one backend")
+        self.config = config or RouterConfig()
+        self._backends = [_Backend(backend, lm) for backend, lm in backends]
+        primary = self._backends[0].lm
+        super().__init__(model=primary.model, model_type=primary.model_type, cache=False)
+        self.kwargs = dict(primary.kwargs)
+        self._lock = threading.Lock()
+        self._rotation = itertools.count()
+
+    def _ranked(self, tried: set[int]) -> list[_Backend]:
+        """Backends in the order this call should try them (at least one, unless all were tried)."""
+        now = time.monotonic()
+        offset = next(self._rotation)
+        # rotate before sorting so equally good backends take turns
+        order = [self._backends[(offset + i) % len(self._backends)] for i in range(len(self._backends))]
+        candidates = [backend for backend in order if id(backend) not in tried]
+        healthy = [backend for backend in candidates if backend.ejected_until <= now]
+        if not healthy:
+            # everything left is ejected: try the one that comes back first rather than failing outright
+            return sorted(candidates, key=lambda backend: backend.ejected_until)
+
+        # local with room, then overflow with room, then queue locally, then queue on overflow
+        tiers: tuple[list[_Backend], ...] = ([], [], [], [])
+        for backend in healthy:
+            tiers[2 * backend.saturated() + backend.config.overflow].append(backend)
+        return [
+            backend
+            for tier in tiers
+            for backend in sorted(tier, key=lambda backend: backend.score(self.config.strategy))
+        ]
+
+    @contextmanager
+    def _route(self, tried: set[int]) -> Iterator[_Backend]:
+        with self._lock:
+            backend = self._ranked(tried)[0]
+            backend.outstanding += 1
+            backend.calls += 1
+        tried.add(id(backend))
+        started = time.perf_counter()
+        try:
+            yield backend
+        except BaseException as exc:
+            with self._lock:
+                backend.outstanding -= 1
+                if _is_backend_failure(exc):
+                    self._record_failure(backend)
+            raise
+        with self._lock:
+            backend.outstanding -= 1
+            elapsed = time.perf_counter() - started
+            if backend.ewma_seconds is None:
+                backend.ewma_seconds = elapsed
+            else:
+                backend.ewma_seconds += _EWMA_SMOOTHING * (elapsed - backend.ewma_seconds)
+            backend.consecutive_failures = 0
+
+    def _record_failure(self, backend: _Backend) -> None:
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        if backend.consecutive_failures >= self.config.eject_after_failures:
+            backend.ejected_until = time.monotonic() + self.config.eject_seconds
+            backend.consecutive_failures = 0
+            backend.ejections += 1
+
+    def forward(self, prompt: str | None = None, messages: list[dict[str, Any]] | None = None, **kwargs):
+        tried: set[int] = set()
+        errors: list[Exception] = []
+        while len(tried) < len(self._backends):
+            try:
+                with self._route(tried) as backend:
+                    return backend.lm.forward(prompt=prompt, messages=messages, **kwargs)
+            except Exception as exc:
+                if not _is_backend_failure(exc):
+                    raise
+                errors.append(exc)
+        raise BackendUnavailable(f"All {len(self._backends)} LM backends failed: {errors[-1]}") from errors[-1]
+
+    async def aforward(self, prompt: str | None = None, messages: list[dict[str, Any]] | None = None, **kwargs):
+        tried: set[int] = set()
+        errors: list[Exception] = []
+        while len(tried) < len(self._backends):
+            try:
+                with self._route(tried) as backend:
+                    return await backend.lm.aforward(prompt=prompt, messages=messages, **kwargs)
+            except Exception as exc:
+                if not _is_backend_failure(exc):
+                    raise
+                errors.append(exc)
+        raise BackendUnavailable(f"All {len(self._backends)} LM backends failed: {errors[-1]}") from errors[-1]
+
+    def copy(self, **kwargs) -> RoutedLM:
+        """Copy every backend LM with ``kwargs``; the copy starts with fresh routing state."""
+        return RoutedLM([(backend.config, backend.lm.copy(**kwargs)) for backend in self._backends], self.config)
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "strategy": self.config.strategy,
+                "backends": {backend.config.name: backend.stats(now) for backend in self._backends},
+            }
+
+
+__all__ = [
+    "BackendUnavailable",
+    "RoutedLM",
+]
@@ -0,0 +1,67 @@
+"""Pin each classifier's LM calls to a subset of llama.cpp server slots so its prompt prefix stays in their KV cache."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Slot the current LM call should run in; read by ``LlamaCppLM`` when it builds the request.
+llama_slot: ContextVar[int | None] = ContextVar("llama_slot", default=None)
+
+
+def assign_slots(classification_types: Sequence[str], slots: int) -> dict[str, tuple[int, ...]]:
+    """Split ``slots`` server slots between ``classification_types``, round-robin in the order given.
+
+    With at least as many slots as types every type gets its own slots (4 slots over 3 types: ``(0, 3)``, ``(1,)``,
+    ``(2,)``); with fewer, types share them.
+    """
+    if slots <= 0 or not classification_types:
+        return {}
+    assigned: dict[str, list[int]] = {str(classification_type): [] for classification_type in classification_types}
+    names = list(assigned)
+    for slot in range(max(slots, len(names))):
+        assigned[names[slot % len(names)]].append(slot % slots)
+    return {name: tuple(sorted(set(owned))) for name, owned in assigned.items()}
+
+
+class SlotPinner:
+    """Route one classifier's LM calls to the least busy of its ``slots``.
+
+    A slot that keeps serving the same classifier keeps that classifier's system prompt and demos in its KV cache, so
+    llama.cpp only has to process the complaint. Calls are counted per slot while they run.
+    """
+
+    def __init__(self, slots: Sequence[int]):
+        if not slots:
+            raise ValueError("SlotPinner needs at least one slot")
+        self.slots = tuple(slots)
+        self._outstanding = dict.fromkeys(self.slots, 0)
+        self._calls = dict.fromkeys(self.slots, 0)
+
+    @contextmanager
+    def pin(self) -> Iterator[int]:
+        """Set :data:`llama_slot` for the LM calls made inside the block."""
+        slot = min(self.slots, key=self._outstanding.__getitem__)
+        self._outstanding[slot] += 1
+        self._calls[slot] += 1
+        token = llama_slot.set(slot)
+        try:
+            yield slot
+        finally:
+            llama_slot.reset(token)
+            self._outstanding[slot] -= 1
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "slots": list(self.slots),
+            "calls": {str(slot): calls for slot, calls in self._calls.items()},
+            "outstanding": {str(slot): count for slot, count in self._outstanding.items()},
+        }
+
+
+__all__ = [
+    "SlotPinner",
+    "assign_slots",
+    "llama_slot",
+]
@@ -0,0 +1,123 @@
+"""Per-classifier ``max_tokens`` budgets learned from the completion lengths a classifier actually produces."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from typing import Any
+
+import dspy
+from dspy.utils.exceptions import AdapterParseError
+from loguru import logger
+
+BUDGET_QUANTILE = 0.99
+BUDGET_MARGIN = 1.5
+MIN_BUDGET = 64
+
+
+class CompletionLengths:
+    """Usage tracker that records the completion tokens of every LM call and forwards each entry to ``parent``."""
+
+    def __init__(self, parent: Any | None = None):
+        self.parent = parent
+        self.lengths: list[int] = []
+
+    def add_usage(self, lm: str, usage_entry: dict[str, Any]) -> None:
+        self.lengths.append(usage_entry.get("completion_tokens") or 0)
+        if self.parent is not None:
+            self.parent.add_usage(lm, usage_entry)
+
+    def truncated(self, max_tokens: int) -> bool:
+        """Whether a recorded call used its whole ``max_tokens`` (the backend stopped it, not the model)."""
+        return any(length >= max_tokens for length in self.lengths)
+
+
+def _quantile(values: Sequence[int], quantile: float) -> int:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))]
+
+
+def completion_budget(
+    lengths: Sequence[int],
+    quantile: float = BUDGET_QUANTILE,
+    margin: float = BUDGET_MARGIN,
+    minimum: int = MIN_BUDGET,
+) -> int:
+    """``max_tokens`` for a classifier: the ``quantile`` of its completion lengths times ``margin``, rounded up to 16."""
+    if not lengths:
+        raise ValueError("No completion lengths to derive a budget from")
+    budget = max(minimum, math.ceil(_quantile(lengths, quantile) * margin))
+    return -(-budget // 16) * 16
+
+
+def token_budget_metadata(lengths: Sequence[int]) -> dict[str, Any]:
+    """Artifact metadata for the budget learned from ``lengths``: ``max_tokens`` and the distribution behind it."""
+    return {
+        "max_tokens": completion_budget(lengths),
+        "completion_tokens": {
+            "samples": len(lengths),
+            "p50": _quantile(lengths, 0.5),
+            "p99": _quantile(lengths, BUDGET_QUANTILE),
+            "max": max(lengths),
+            "quantile": BUDGET_QUANTILE,
+            "margin": BUDGET_MARGIN,
+        },
+    }
+
+
+def _retry_budget(max_tokens: int, exc: AdapterParseError | None) -> None:
+    logger.info(
+        "Completion reached its budget of {} tokens{}; retrying with the LM's max_tokens",
+        max_tokens,
+        " and did not parse" if exc is not None else "",
+    )
+
+
+def call_within_budget(predictor: dspy.Module, max_tokens: int | None, **inputs: Any) -> dspy.Prediction:
+    """Call ``predictor`` with at most ``max_tokens`` completion tokens, and once more without the budget if cut off."""
+    if max_tokens is None:
+        return predictor(**inputs)
+    lengths = CompletionLengths(dspy.settings.usage_tracker)
+    error: AdapterParseError | None = None
+    with dspy.settings.context(usage_tracker=lengths):
+        try:
+            result = predictor(config={"max_tokens": max_tokens}, **inputs)
+        except AdapterParseError as exc:
+            error = exc
+    if not lengths.truncated(max_tokens):
+        if error is not None:
+            raise error
+        return result
+    _retry_budget(max_tokens, error)
+    return predictor(**inputs)
+
+
+async def acall_within_budget(predictor: dspy.Module, max_tokens: int | None, **inputs: Any) -> dspy.Prediction:
+    """Async counterpart of :func:`call_within_budget`."""
+    if max_tokens is None:
+        return await predictor.acall(**inputs)
+    lengths = CompletionLengths(dspy.settings.usage_tracker)
+    error: AdapterParseError | None = None
+    with dspy.settings.context(usage_tracker=lengths):
+        try:
+            result = await predictor.acall(config={"max_tokens": max_tokens}, **inputs)
+        except AdapterParseError as exc:
+            error = exc
+    if not lengths.truncated(max_tokens):
+        if error is not None:
+            raise error
+        return result
+    _retry_budget(max_tokens, error)
+    return await predictor.acall(**inputs)
+
+
+__all__ = [
+    "BUDGET_MARGIN",
+    "BUDGET_QUANTILE",
+    "MIN_BUDGET",
+    "CompletionLengths",
+    "acall_within_budget",
+    "call_within_budget",
+    "completion_budget",
+    "token_budget_metadata",
+]
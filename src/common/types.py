@@ -1,9 +1,11 @@
-"""Shared typing helpers."""
+"""Shared types and classification configs; importable without loading DSPy."""
 
 from __future__ import annotations
 
 from enum import StrEnum
 
+from pydantic import BaseModel
+
 
 class ClassificationType(StrEnum):
     AE_PC = "ae-pc"
@@ -11,4 +13,85 @@ class ClassificationType(StrEnum):
     PC_CATEGORY = "pc-category"
 
 
-__all__ = ["ClassificationType"]
+class InferenceProfile(StrEnum):
+    """How much of the optimized program runs at serve time.
+
+    ``full`` is the program as trained (reasoning, label, justification); ``no-reasoning`` skips the chain-of-thought
+    field and ``label-only`` also skips the justification. ``logprob`` renders the ``label-only`` prompt and picks the
+    label from the backend's token log-probabilities instead of parsing a generated one.
+    """
+
+    FULL = "full"
+    NO_REASONING = "no-reasoning"
+    LABEL_ONLY = "label-only"
+    LOGPROB = "logprob"
+
+
+class ConstrainedDecoding(StrEnum):
+    """How the backend is held to the label set when it decodes the ``classification`` field.
+
+    ``grammar`` sends a GBNF grammar of the chat-adapter output (llama.cpp); ``json-schema`` asks for a JSON object
+    whose label is an enum of the labels (OpenAI-compatible ``response_format``).
+    """
+
+    OFF = "off"
+    GRAMMAR = "grammar"
+    JSON_SCHEMA = "json-schema"
+
+
+class ClassificationConfig(BaseModel):
+    """Configuration for a single classification type."""
+
+    description: str
+    labels: list[str]
+
+    @property
+    def output_desc(self) -> str:
+        return f"One of: {', '.join(self.labels)}"
+
+
+CLASSIFICATION_CONFIGS: dict[ClassificationType, ClassificationConfig] = {
+    ClassificationType.AE_PC: ClassificationConfig(
+        description="Classify Ozempic-related complaints as Adverse Event or Product Complaint.",
+        labels=["Adverse Event", "Product Complaint"],
+    ),
+    ClassificationType.AE_CATEGORY: ClassificationConfig(
+        description="Classify adverse events into specific categories.",
+        labels=[
+            "Gastrointestinal disorders",
+            "Pancreatitis",
+            "Hepatobiliary (gallbladder) disease",
+            "Hypoglycemia",
+            "Eye disorders (Diabetic retinopathy complications)",
+            "Renal events (Acute kidney injury)",
+            "Hypersensitivity",
+            "Injection-site reactions",
+            "Cardiovascular signs",
+            "Peri-procedural aspiration risk",
+            "Gastrointestinal disorders (Gastroparesis)",
+        ],
+    ),
+    ClassificationType.PC_CATEGORY: ClassificationConfig(
+        description="Classify product complaints into specific categories.",
+        labels=[
+            "Stability/Appearance defect",
+            "Device malfunction",
+            "Storage/Temperature excursion",
+            "Labeling error",
+            "Contamination/Foreign matter",
+            "Packaging defect",
+            "Counterfeit/Unauthorized source",
+            "Potency/Assay defect",
+            "Distribution/Expiry",
+        ],
+    ),
+}
+
+
+__all__ = [
+    "CLASSIFICATION_CONFIGS",
+    "ClassificationConfig",
+    "ClassificationType",
+    "ConstrainedDecoding",
+    "InferenceProfile",
+]
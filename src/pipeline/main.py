@@ -21,12 +21,14 @@ from ..common.classifier import (
 )
 from ..common.config import configure_lm, get_display_model_name
 from ..common.data_utils import prepare_datasets
+from ..common.demo_retrieval import demo_index_for
 from ..common.paths import (
     ARTIFACTS_DIR,
     CLASSIFICATION_TYPES,
     DEFAULT_CLASSIFICATION_TYPE,
     get_classifier_artifact_path,
 )
+from ..common.token_budget import CompletionLengths, token_budget_metadata
 from ..common.types import ClassificationType
 
 # MLflow configuration - SQLite backend for easy querying
@@ -98,8 +100,20 @@ def run_pipeline(
         )
 
         print("  Evaluating optimized...")
-        optimized_accuracy = evaluate_model(optimized_classifier, testset, "Test Set", verbose=verbose)
+        completion_lengths = CompletionLengths(dspy.settings.usage_tracker)
+        with dspy.settings.context(usage_tracker=completion_lengths):
+            optimized_accuracy = evaluate_model(optimized_classifier, testset, "Test Set", verbose=verbose)
         mlflow.log_metric("optimized_accuracy", optimized_accuracy)
+        # no usage (e.g. a provider that reports none) leaves the classifier on the LM's max_tokens
+        token_budget = token_budget_metadata(completion_lengths.lengths) if any(completion_lengths.lengths) else {}
+        if token_budget:
+            mlflow.log_metrics(
+                {
+                    "max_tokens": token_budget["max_tokens"],
+                    "completion_tokens_p50": token_budget["completion_tokens"]["p50"],
+                    "completion_tokens_p99": token_budget["completion_tokens"]["p99"],
+                }
+            )
 
         improvement = optimized_accuracy - baseline_accuracy
         mlflow.log_metric("improvement", improvement)
@@ -118,13 +132,22 @@ def run_pipeline(
             artifact_data["metadata"]["classification_type"] = classification_type
             artifact_data["metadata"]["classification_config"] = config.model_dump()
             artifact_data["metadata"]["mlflow_run_id"] = run_id
+            artifact_data["metadata"].update(token_budget)
             with open(artifact_path, "w") as f:
                 json.dump(artifact_data, f, indent=2)
 
         mlflow.log_artifact(str(artifact_path))
+        # precomputed here so serving with DSPY_RETRIEVED_DEMOS only memory-maps it
+        demo_index = demo_index_for(classification_type)
 
         print(f"\nResults: {baseline_accuracy:.1%} → {optimized_accuracy:.1%} ({improvement:+.1%})")
         print(f"Artifact: {artifact_path}")
+        print(f"Demo index: {demo_index.directory} ({len(demo_index)} examples)")
+        if token_budget:
+            print(
+                f"Token budget: max_tokens={token_budget['max_tokens']} "
+                f"(p99 completion {token_budget['completion_tokens']['p99']} tokens)"
+            )
         active_run = mlflow.active_run()
         if active_run:
             print(f"MLflow: sqlite:///{MLFLOW_DB_PATH} (run: {active_run.info.run_id})")
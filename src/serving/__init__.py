@@ -1,16 +1,23 @@
 """Serving helpers for exposing optimized classifiers."""
 
+from .pipeline import PipelineRequest, PipelineResponse, run_pipeline
 from .service import (
     AECategoryRequest,
     AEPCRequest,
+    BatchComplaintRequest,
+    BatchComplaintResponse,
     ComplaintRequest,
     ComplaintResponse,
     PCCategoryRequest,
+    SingleFlight,
+    classify_batch,
     get_ae_category_classifier,
     get_ae_pc_classifier,
+    get_async_classification_function,
     get_classification_function,
     get_pc_category_classifier,
 )
+from .streaming import ClassificationStreamEvent, get_streaming_classification_function
 
 __all__ = [
     "ComplaintRequest",
@@ -18,8 +25,18 @@ __all__ = [
     "AECategoryRequest",
     "PCCategoryRequest",
     "ComplaintResponse",
+    "BatchComplaintRequest",
+    "BatchComplaintResponse",
+    "classify_batch",
+    "SingleFlight",
+    "PipelineRequest",
+    "PipelineResponse",
+    "run_pipeline",
     "get_ae_pc_classifier",
     "get_ae_category_classifier",
     "get_pc_category_classifier",
     "get_classification_function",
+    "get_async_classification_function",
+    "ClassificationStreamEvent",
+    "get_streaming_classification_function",
 ]
@@ -0,0 +1,148 @@
+"""Admission control: cap in-flight LM calls per classifier and shed load once a bounded wait queue is full."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_MAX_QUEUE_MS = 5000.0
+_SERVICE_TIME_SMOOTHING = 0.2
+_INITIAL_SERVICE_SECONDS = 1.0
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the HTTP status and ``Retry-After`` seconds to send back."""
+
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """Bound concurrent LM calls for one classifier, with a FIFO wait queue in front of them.
+
+    Up to ``max_in_flight`` calls run at once. Further callers wait in a queue of at most ``max_queue`` entries for
+    up to ``max_queue_ms``; a caller arriving to a full queue is rejected immediately with 429, and a caller that
+    times out in the queue is rejected with 503. Both carry a ``Retry-After`` estimated from the smoothed service time
+    and the current backlog.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_queue_ms: float = DEFAULT_MAX_QUEUE_MS,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be non-negative")
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_ms = max_queue_ms
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._service_seconds = _INITIAL_SERVICE_SECONDS
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_queue_timeout = 0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def saturated(self) -> bool:
+        """Every slot is taken and the queue is full, so the next caller would be shed."""
+        return self.in_flight >= self.max_in_flight and self.waiting >= self.max_queue
+
+    def retry_after(self) -> int:
+        backlog = self.in_flight + self.waiting
+        return max(1, math.ceil(self._service_seconds * backlog / self.max_in_flight))
+
+    async def acquire(self) -> None:
+        """Take an in-flight slot, waiting in the queue if needed; raises :class:`AdmissionRejected` when shedding."""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if self.waiting >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(429, self.retry_after(), "Classifier queue is full")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            async with asyncio.timeout(self.max_queue_ms / 1000):
+                await waiter
+        except TimeoutError:
+            if not waiter.done() or waiter.cancelled():
+                self._discard(waiter)
+                self.rejected_queue_timeout += 1
+                raise AdmissionRejected(503, self.retry_after(), "Timed out waiting for a classifier slot") from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over just as the caller went away
+            else:
+                self._discard(waiter)
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Return a slot, handing it directly to the oldest live waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block and fold its duration into the service-time estimate."""
+        await self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._service_seconds += _SERVICE_TIME_SMOOTHING * (elapsed - self._service_seconds)
+            self.release()
+
+    def stats(self) -> dict[str, int | float | bool]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "max_queue_ms": self.max_queue_ms,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "saturated": self.saturated,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_queue_timeout": self.rejected_queue_timeout,
+            "retry_after_seconds": self.retry_after(),
+        }
+
+
+__all__ = [
+    "DEFAULT_MAX_QUEUE",
+    "DEFAULT_MAX_QUEUE_MS",
+    "AdmissionController",
+    "AdmissionRejected",
+]
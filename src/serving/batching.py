@@ -0,0 +1,99 @@
+"""Micro-batching scheduler that groups LM calls per classifier before dispatching them."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from .metrics import Histogram
+
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_BATCH_SIZE = 4  # matches the llama.cpp slot count in serve.sh (-np 4)
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+
+def _settle[T](future: asyncio.Future[T], task: asyncio.Task[T]) -> None:
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif (exc := task.exception()) is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(task.result())
+
+
+class MicroBatcher[T]:
+    """Collect calls for up to ``max_wait_ms`` (or until ``max_batch_size`` are queued) and start them together.
+
+    Each LM request is still its own HTTP call; a batch only reaches the backend at the same moment. Backends with
+    continuous batching (llama.cpp) already decode concurrent requests together, so this is off unless configured and
+    should stay off until ``scripts/bench/micro_batching.py`` shows a gain over plain concurrency. A lone request waits
+    at most ``max_wait_ms``. ``queue_depth`` records how many calls were already waiting when one arrived and
+    ``batch_size`` records the size of every dispatched batch.
+    """
+
+    def __init__(self, max_wait_ms: float = DEFAULT_MAX_WAIT_MS, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[Callable[[], Coroutine[Any, Any, T]], asyncio.Future[T], contextvars.Context]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.batches = 0
+        self.queue_depth = Histogram(QUEUE_DEPTH_BUCKETS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    async def submit(self, call: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Queue ``call`` for the next batch and return its result.
+
+        The call runs in the submitter's context (so DSPy usage tracking still attributes its tokens), and
+        cancelling the submitter cancels the call.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        self.queue_depth.observe(len(self._pending))
+        self._pending.append((call, future, contextvars.copy_context()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch = [item for item in self._pending if not item[1].done()]
+        self._pending = []
+        if not batch:
+            return
+        self.batches += 1
+        self.batch_size.observe(len(batch))
+        loop = asyncio.get_running_loop()
+        for call, future, context in batch:
+            task = loop.create_task(call(), context=context)
+            task.add_done_callback(lambda done, future=future: _settle(future, done))
+            future.add_done_callback(lambda waiter, task=task: task.cancel() if waiter.cancelled() else None)
+
+    def stats(self) -> dict[str, float | int | dict]:
+        return {
+            "max_wait_ms": self.max_wait_ms,
+            "max_batch_size": self.max_batch_size,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "queue_depth": self.queue_depth.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+        }
+
+
+__all__ = [
+    "DEFAULT_MAX_BATCH_SIZE",
+    "DEFAULT_MAX_WAIT_MS",
+    "MicroBatcher",
+]
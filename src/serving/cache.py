@@ -0,0 +1,190 @@
+"""Bounded in-process prediction cache for the serving layer."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from .store import PersistentPredictionStore
+
+DEFAULT_CACHE_MAX_ENTRIES = 4096
+DEFAULT_CACHE_TTL_SECONDS = 3600.0
+
+
+def normalize_complaint(complaint: str) -> str:
+    """Collapse whitespace and case so trivially different resubmissions share a cache entry."""
+    return " ".join(complaint.split()).casefold()
+
+
+def artifact_fingerprint(model_path: Path) -> str:
+    """Content hash of an artifact JSON; a retrained artifact gets a new fingerprint."""
+    return hashlib.sha256(model_path.read_bytes()).hexdigest()[:16]
+
+
+def prediction_cache_key(complaint: str, classification_type: str, fingerprint: str, model: str | None) -> str:
+    """Key a prediction on the normalized complaint, the classifier, the loaded artifact, and the serving model.
+
+    Keys are prefixed with the artifact fingerprint so every entry of a replaced artifact can be retired at once.
+    """
+    material = "\x1f".join((classification_type, fingerprint, model or "", normalize_complaint(complaint)))
+    return f"{fingerprint}:{hashlib.sha256(material.encode('utf-8')).hexdigest()}"
+
+
+class PredictionCache[ResponseT: BaseModel]:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss/eviction counters.
+
+    ``max_entries`` bounds memory; entries older than ``ttl_seconds`` are dropped on access (``ttl_seconds <= 0``
+    disables expiry). With a ``store`` attached, in-memory misses read through to the shared persistent store (and
+    warm this process on a hit), and every ``put`` is also written behind to the store. ``max_entries=0`` disables
+    the in-memory layer so the cache only fronts the store.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        store: PersistentPredictionStore | None = None,
+        response_model: type[ResponseT] | None = None,
+    ):
+        if max_entries < 0 or (max_entries == 0 and store is None):
+            raise ValueError("max_entries must be at least 1 unless a persistent store is attached")
+        if store is not None and response_model is None:
+            raise ValueError("response_model is required to decode entries from a persistent store")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self.response_model = response_model
+        self._entries: OrderedDict[str, tuple[float, ResponseT]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.retired = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> ResponseT | None:
+        response = self._lookup_local(key)
+        if response is not None:
+            return response
+        return self._record_stored(key, self._get_stored(key))
+
+    async def aget(self, key: str) -> ResponseT | None:
+        """:meth:`get` for the event loop: a read through to the store runs in a worker thread."""
+        response = self._lookup_local(key)
+        if response is not None:
+            return response
+        stored = await asyncio.to_thread(self._get_stored, key) if self.store is not None else None
+        return self._record_stored(key, stored)
+
+    def _lookup_local(self, key: str) -> ResponseT | None:
+        with self._lock:
+            response = self._get_local(key)
+            if response is None:
+                return None
+            self.hits += 1
+            return response.model_copy()
+
+    def _record_stored(self, key: str, response: ResponseT | None) -> ResponseT | None:
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.store_hits += 1
+            self._put_local(key, response)
+        return response
+
+    def put(self, key: str, response: ResponseT) -> None:
+        with self._lock:
+            self._put_local(key, response.model_copy())
+        if self.store is not None:
+            self.store.put(key, response.model_dump_json())
+
+    def _get_local(self, key: str) -> ResponseT | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def _get_stored(self, key: str) -> ResponseT | None:
+        if self.store is None or self.response_model is None:
+            return None
+        payload = self.store.get(key, max_age_seconds=self.ttl_seconds)
+        if payload is None:
+            return None
+        try:
+            return self.response_model.model_validate_json(payload)
+        except ValueError:
+            return None
+
+    def _put_local(self, key: str, response: ResponseT) -> None:
+        if self.max_entries == 0:
+            return
+        self._entries[key] = (time.monotonic(), response.model_copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def retire(self, fingerprint: str) -> int:
+        """Drop every entry keyed by artifact ``fingerprint`` (here and in the store); returns how many were dropped."""
+        prefix = f"{fingerprint}:"
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            self.retired += len(stale)
+        retired = len(stale)
+        if self.store is not None:
+            retired += self.store.delete_prefix(prefix)
+        return retired
+
+    def stats(self) -> dict[str, int | float | dict]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats: dict[str, int | float | dict] = {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "retired": self.retired,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        if self.store is not None:
+            stats["store_hits"] = self.store_hits
+            stats["store"] = self.store.stats()
+        return stats
+
+
+__all__ = [
+    "DEFAULT_CACHE_MAX_ENTRIES",
+    "DEFAULT_CACHE_TTL_SECONDS",
+    "PredictionCache",
+    "artifact_fingerprint",
+    "normalize_complaint",
+    "prediction_cache_key",
+]
@@ -0,0 +1,129 @@
+"""Request hedging: re-send an LM call that is slower than recent calls and keep whichever copy answers first."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .metrics import ClassifierMetrics
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_MAX_EXTRA_RATIO = 0.05
+DEFAULT_MIN_DELAY_MS = 50.0
+DEFAULT_WINDOW = 256
+DEFAULT_MIN_SAMPLES = 20
+
+
+class RequestHedger:
+    """Hedge one classifier's LM calls against its own recent latency.
+
+    A call that has not finished after the ``percentile`` latency of the last ``window`` calls (never less than
+    ``min_delay_ms``) is sent again, to ``backup`` when one is given; the first successful answer wins and the other
+    copy is cancelled. Hedges are paid from a budget that grows by ``max_extra_ratio`` per call and holds at most
+    ``max_extra_ratio * window`` hedges, so hedging never adds more than that share of backend calls. Nothing is hedged
+    until ``min_samples`` latencies have been seen.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        max_extra_ratio: float = DEFAULT_MAX_EXTRA_RATIO,
+        min_delay_ms: float = DEFAULT_MIN_DELAY_MS,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if max_extra_ratio < 0:
+            raise ValueError("max_extra_ratio must be non-negative")
+        self.percentile = percentile
+        self.max_extra_ratio = max_extra_ratio
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._budget = 0.0
+        self._max_budget = max(1.0, max_extra_ratio * window)
+        self.calls = 0
+        self.fired = 0
+        self.won = 0
+        self.skipped_budget = 0
+
+    def delay_seconds(self) -> float | None:
+        """How long a call may run before it is hedged, or ``None`` while there are too few samples."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return max(ordered[index], self.min_delay_ms / 1000)
+
+    async def run[T](
+        self,
+        call: Callable[[], Awaitable[T]],
+        backup: Callable[[], Awaitable[T]] | None = None,
+        metrics: ClassifierMetrics | None = None,
+    ) -> T:
+        """Await ``call``, racing it against ``backup`` (or a second ``call``) once it runs past the hedge delay."""
+        self.calls += 1
+        self._budget = min(self._budget + self.max_extra_ratio, self._max_budget)
+        delay = self.delay_seconds()
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(call())
+        hedge: asyncio.Future[T] | None = None
+        try:
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+            if primary.done() or delay is None:
+                return await primary
+            if self._budget < 1:
+                self.skipped_budget += 1
+                return await primary
+
+            self._budget -= 1
+            self.fired += 1
+            if metrics is not None:
+                metrics.hedges_fired.inc()
+            hedge = asyncio.ensure_future((backup or call)())
+            pending: set[asyncio.Future[T]] = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None or not pending:
+                    break
+            if winner is None:
+                return primary.result()  # both failed: surface the primary's error
+            if winner is hedge:
+                self.won += 1
+                if metrics is not None:
+                    metrics.hedges_won.inc()
+            return winner.result()
+        finally:
+            # when the hedge wins this undercounts the primary, which only makes later hedges fire a little sooner
+            self._latencies.append(time.perf_counter() - started)
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict[str, float | int | None]:
+        delay = self.delay_seconds()
+        return {
+            "percentile": self.percentile,
+            "max_extra_ratio": self.max_extra_ratio,
+            "delay_ms": None if delay is None else round(delay * 1000, 1),
+            "calls": self.calls,
+            "fired": self.fired,
+            "won": self.won,
+            "skipped_budget": self.skipped_budget,
+        }
+
+
+__all__ = [
+    "DEFAULT_HEDGE_PERCENTILE",
+    "DEFAULT_MAX_EXTRA_RATIO",
+    "DEFAULT_MIN_DELAY_MS",
+    "RequestHedger",
+]
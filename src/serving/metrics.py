@@ -0,0 +1,272 @@
+"""Always-on serving metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms are sharded per thread: each thread increments its own cell without a lock, and
+cells are only summed when ``/metrics`` is scraped. Label sets are bound once per classifier (see
+:meth:`MetricsRegistry.classifier`), so recording a request allocates no label dicts.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Sharded:
+    """Per-thread list cells, registered once per thread and summed on read."""
+
+    def __init__(self, width: int):
+        self._width = width
+        self._local = threading.local()
+        self._cells: list[list[float]] = []
+        self._register_lock = threading.Lock()
+
+    def _cell(self) -> list[float]:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = [0.0] * self._width
+            with self._register_lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+        return cell
+
+    def _totals(self) -> list[float]:
+        totals = [0.0] * self._width
+        for cell in list(self._cells):
+            for index, value in enumerate(cell):
+                totals[index] += value
+        return totals
+
+
+class Counter(_Sharded):
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+
+class Gauge(Counter):
+    def dec(self, amount: float = 1.0) -> None:
+        self._cell()[0] -= amount
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class Histogram(_Sharded):
+    """Fixed-bucket histogram; ``snapshot`` reports cumulative counts per upper bound ``le`` like Prometheus."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_SECONDS):
+        self.buckets = tuple(sorted(buckets))
+        # one count per bucket, one for +Inf, then the running sum
+        super().__init__(len(self.buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        cell = self._cell()
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    @property
+    def count(self) -> int:
+        return int(sum(self._totals()[:-1]))
+
+    @property
+    def sum(self) -> float:
+        return self._totals()[-1]
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        totals = self._totals()
+        running = 0
+        result: list[tuple[str, int]] = []
+        for bound, bucket_count in zip((*self.buckets, "+Inf"), totals[:-1], strict=True):
+            running += int(bucket_count)
+            result.append((_format_bound(bound), running))
+        return result
+
+    def snapshot(self) -> dict[str, float | dict[str, int]]:
+        cumulative = dict(self.cumulative())
+        return {"count": cumulative["+Inf"], "sum": self.sum, "buckets": cumulative}
+
+
+def _format_bound(bound: float | str) -> str:
+    if isinstance(bound, str):
+        return bound
+    return _format_value(float(bound))
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class ClassifierMetrics:
+    """Metrics for one (classification type, model) pair; the label string is rendered once here."""
+
+    def __init__(self, classification_type: str, model: str):
+        self.labels = f'classification_type="{_escape(classification_type)}",model="{_escape(model)}"'
+        self.requests = Counter()
+        self.cache_hits = Counter()
+        self.first_stage_answers = Counter()
+        self.near_duplicate_hits = Counter()
+        self.coalesced = Counter()
+        self.errors = Counter()
+        self.parse_failures = Counter()
+        self.adapter_fallbacks = Counter()
+        self.hedges_fired = Counter()
+        self.hedges_won = Counter()
+        self.prompt_tokens = Counter()
+        self.cached_prompt_tokens = Counter()
+        self.completion_tokens = Counter()
+        self.in_flight = Gauge()
+        self.lm_in_flight = Gauge()
+        self.request_seconds = Histogram()
+        self.lm_seconds = Histogram()
+        self.overhead_seconds = Histogram()
+
+    def record_usage(self, tracker: ForwardingUsageTracker) -> None:
+        self.prompt_tokens.inc(tracker.prompt_tokens)
+        self.cached_prompt_tokens.inc(tracker.cached_prompt_tokens)
+        self.completion_tokens.inc(tracker.completion_tokens)
+        if tracker.calls > 1:
+            self.adapter_fallbacks.inc()
+
+
+class ForwardingUsageTracker:
+    """Stand-in for DSPy's ``UsageTracker`` that tallies tokens and forwards every entry to an enclosing tracker.
+
+    DSPy only calls ``add_usage`` on the active tracker, so this does not need to import DSPy; the enclosing tracker
+    (e.g. the pipeline's per-branch ``track_usage``) still sees every entry.
+    """
+
+    def __init__(self, parent: Any | None):
+        self.parent = parent
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+
+    def add_usage(self, lm: str, usage_entry: dict[str, Any]) -> None:
+        self.calls += 1
+        self.prompt_tokens += usage_entry.get("prompt_tokens") or 0
+        # LiteLLM passes the OpenAI ``prompt_tokens_details`` through as an object; a plain dict also counts
+        details = usage_entry.get("prompt_tokens_details")
+        cached = details.get("cached_tokens") if isinstance(details, dict) else getattr(details, "cached_tokens", None)
+        self.cached_prompt_tokens += cached or 0
+        self.completion_tokens += usage_entry.get("completion_tokens") or 0
+        if self.parent is not None:
+            self.parent.add_usage(lm, usage_entry)
+
+
+# (attribute, metric name, type, help)
+_FAMILIES: tuple[tuple[str, str, str, str], ...] = (
+    ("requests", "dspy_classifier_requests_total", "counter", "Classification requests received."),
+    ("cache_hits", "dspy_classifier_cache_hits_total", "counter", "Requests answered from the prediction cache."),
+    (
+        "first_stage_answers",
+        "dspy_classifier_first_stage_answers_total",
+        "counter",
+        "Requests answered by the first-stage n-gram model without an LM call.",
+    ),
+    (
+        "near_duplicate_hits",
+        "dspy_classifier_near_duplicate_hits_total",
+        "counter",
+        "Requests answered from the cached prediction of a near-duplicate complaint.",
+    ),
+    ("coalesced", "dspy_classifier_coalesced_total", "counter", "Requests that joined an identical in-flight call."),
+    ("errors", "dspy_classifier_errors_total", "counter", "Requests that raised an error."),
+    ("parse_failures", "dspy_classifier_parse_failures_total", "counter", "LM outputs the adapter could not parse."),
+    (
+        "adapter_fallbacks",
+        "dspy_classifier_adapter_fallbacks_total",
+        "counter",
+        "Predictions that took more than one LM call (JSONAdapter fallback or truncation retry).",
+    ),
+    ("hedges_fired", "dspy_classifier_hedges_fired_total", "counter", "Slow LM calls that were sent a second time."),
+    ("hedges_won", "dspy_classifier_hedges_won_total", "counter", "Hedged LM calls answered first by the second copy."),
+    ("prompt_tokens", "dspy_classifier_prompt_tokens_total", "counter", "Prompt tokens reported by the LM."),
+    (
+        "cached_prompt_tokens",
+        "dspy_classifier_cached_prompt_tokens_total",
+        "counter",
+        "Prompt tokens the LM served from its prompt (KV) cache.",
+    ),
+    (
+        "completion_tokens",
+        "dspy_classifier_completion_tokens_total",
+        "counter",
+        "Completion tokens reported by the LM.",
+    ),
+    ("in_flight", "dspy_classifier_in_flight", "gauge", "Requests currently being served."),
+    ("lm_in_flight", "dspy_classifier_lm_in_flight", "gauge", "LM calls currently open."),
+    ("request_seconds", "dspy_classifier_request_latency_seconds", "histogram", "End-to-end request latency."),
+    ("lm_seconds", "dspy_classifier_lm_latency_seconds", "histogram", "Time spent in the LM call (incl. parsing)."),
+    (
+        "overhead_seconds",
+        "dspy_classifier_overhead_latency_seconds",
+        "histogram",
+        "Request latency outside the LM call (queueing, batching, caching) for requests that called the LM.",
+    ),
+)
+
+
+class MetricsRegistry:
+    """Holds one :class:`ClassifierMetrics` per (classification type, model) and renders them for scraping."""
+
+    def __init__(self) -> None:
+        self._classifiers: dict[tuple[str, str], ClassifierMetrics] = {}
+        self._lock = threading.Lock()
+
+    def classifier(self, classification_type: str, model: str | None) -> ClassifierMetrics:
+        key = (str(classification_type), model or "unknown")
+        with self._lock:
+            metrics = self._classifiers.get(key)
+            if metrics is None:
+                metrics = self._classifiers[key] = ClassifierMetrics(*key)
+            return metrics
+
+    def render(self) -> str:
+        with self._lock:
+            classifiers = list(self._classifiers.values())
+        lines: list[str] = []
+        for attribute, name, kind, help_text in _FAMILIES:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for metrics in classifiers:
+                metric = getattr(metrics, attribute)
+                if isinstance(metric, Histogram):
+                    for bound, count in metric.cumulative():
+                        lines.append(f'{name}_bucket{{{metrics.labels},le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{metrics.labels}}} {_format_value(metric.sum)}")
+                    lines.append(f"{name}_count{{{metrics.labels}}} {metric.count}")
+                else:
+                    lines.append(f"{name}{{{metrics.labels}}} {_format_value(metric.value)}")
+        return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "LATENCY_BUCKETS_SECONDS",
+    "ClassifierMetrics",
+    "Counter",
+    "ForwardingUsageTracker",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+]
@@ -0,0 +1,209 @@
+"""Near-duplicate lookup for the prediction cache: MinHash signatures of complaints, bucketed by LSH bands."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_NEAR_DUPLICATE_MAX_ENTRIES = 4096
+
+# Disfluencies a phone transcript adds (see scripts/datagen/ae_pc_classification_sample_data.py); dropping them from
+# every complaint before shingling makes two transcripts of the same call differ only where the words do. Words that
+# carry meaning in a written complaint ("like new", "I know the pen leaked") are kept, and "you know" / "I mean" are
+# dropped only as whole phrases.
+FILLER_WORDS = frozenset({"um", "uh", "er", "ah", "hmm"})
+FILLER_PHRASES = frozenset({("you", "know"), ("i", "mean")})
+
+_WORD = re.compile(r"[a-z0-9]+")
+# largest prime below 2**32: a * x + b for 32-bit a, b and shingle hashes x stays within 64 bits
+_PRIME = np.uint64((1 << 32) - 5)
+
+
+def _content_words(text: str) -> list[str]:
+    words: list[str] = []
+    for word in _WORD.findall(text.casefold()):
+        if word in FILLER_WORDS:
+            continue
+        if words and (words[-1], word) in FILLER_PHRASES:
+            words.pop()
+            continue
+        words.append(word)
+    return words
+
+
+def shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> set[str]:
+    """Word ``size``-grams of ``text``, lowercased, without punctuation, filler words and filler phrases."""
+    words = _content_words(text)
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard(left: set[str], right: set[str]) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def lsh_bands(threshold: float, num_perm: int = DEFAULT_NUM_PERM) -> tuple[int, int]:
+    """``(bands, rows)`` whose LSH S-curve, ``(1 / bands) ** (1 / rows)``, rises just below ``threshold``.
+
+    Pairs at the threshold then share a band with high probability; the signature comparison after the lookup
+    removes the extra candidates this lets in.
+    """
+    best: tuple[int, int] | None = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        if midpoint <= threshold - 0.1 and (best is None or midpoint > (1 / best[0]) ** (1 / best[1])):
+            best = (bands, rows)
+    return best or (num_perm, 1)
+
+
+class MinHasher:
+    """MinHash signatures under ``num_perm`` universal hash functions ``(a * x + b) mod (2**32 - 5)``."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def signature(self, text: str) -> np.ndarray:
+        hashed = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little")
+                for shingle in shingles(text, self.shingle_size)
+            ),
+            dtype=np.uint64,
+        )
+        if not len(hashed):
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        return ((np.outer(hashed, self._a) + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """Bounded LSH index from complaint signatures to the prediction-cache key of an earlier complaint.
+
+    :meth:`add` records a complaint under a ``scope`` (the classifier, artifact, model and profile); :meth:`find`
+    returns the key of the most similar complaint in the same scope whose estimated Jaccard similarity (the share of
+    equal MinHash values) reaches ``threshold``, or ``None``. A lookup hashes one signature and reads one bucket per
+    band, whatever the number of entries. At most ``max_entries`` complaints are kept, least recently used first out;
+    the predictions themselves stay in the :class:`~src.serving.cache.PredictionCache`, which may have dropped one
+    the index still points to.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        max_entries: int = DEFAULT_NEAR_DUPLICATE_MAX_ENTRIES,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        # cache key -> (band keys, signature)
+        self._entries: OrderedDict[str, tuple[list[bytes], np.ndarray]] = OrderedDict()
+        self._buckets: dict[bytes, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, scope: str, signature: np.ndarray) -> list[bytes]:
+        prefix = scope.encode() + b"\x1f"
+        return [
+            hashlib.blake2b(
+                prefix + band.to_bytes(2, "little") + signature[band * self.rows : (band + 1) * self.rows].tobytes(),
+                digest_size=12,
+            ).digest()
+            for band in range(self.bands)
+        ]
+
+    def add(self, scope: str, complaint: str, key: str) -> None:
+        signature = self.hasher.signature(complaint)
+        band_keys = self._band_keys(scope, signature)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (band_keys, signature)
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def find(self, scope: str, complaint: str) -> str | None:
+        signature = self.hasher.signature(complaint)
+        band_keys = self._band_keys(scope, signature)
+        with self._lock:
+            candidates = set().union(*(self._buckets.get(band_key, ()) for band_key in band_keys))
+            best_key, best_similarity = None, self.threshold
+            for candidate in candidates:
+                similarity = float(np.mean(self._entries[candidate][1] == signature))
+                if similarity >= best_similarity:
+                    best_key, best_similarity = candidate, similarity
+            if best_key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return best_key
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band_key in entry[0]:
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "bands": self.bands,
+                "rows": self.rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+__all__ = [
+    "DEFAULT_NEAR_DUPLICATE_MAX_ENTRIES",
+    "DEFAULT_NUM_PERM",
+    "DEFAULT_SHINGLE_SIZE",
+    "FILLER_WORDS",
+    "MinHasher",
+    "NearDuplicateIndex",
+    "jaccard",
+    "lsh_bands",
+    "shingles",
+]
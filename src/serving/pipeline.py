@@ -0,0 +1,170 @@
+"""Server-side two-stage pipeline: AE/PC router followed by the matching category classifier."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..common.types import ClassificationType
+from .service import AsyncClassificationFunction, ComplaintRequest, ComplaintResponse
+
+ADVERSE_EVENT_LABEL = "Adverse Event"
+
+
+class PipelineRequest(ComplaintRequest):
+    """Request for running the full AE/PC router + category pipeline."""
+
+    speculative: bool | None = Field(
+        None,
+        description=(
+            "Start both category classifiers alongside the router and drop the branch the router rules out. "
+            "Defaults to the deployment setting (DSPY_PIPELINE_SPECULATIVE)."
+        ),
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "complaint": "After my first Ozempic injection I developed severe hives and my throat started swelling.",
+                "speculative": True,
+            }
+        }
+    )
+
+
+class TokenUsage(BaseModel):
+    """Prompt/completion token counts reported by the LM backend."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+    def __add__(self, other: TokenUsage) -> TokenUsage:
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            total_tokens=self.total_tokens + other.total_tokens,
+        )
+
+    @classmethod
+    def from_tracker_totals(cls, totals: dict[str, dict]) -> TokenUsage:
+        usage = cls()
+        for entry in totals.values():
+            prompt = int(entry.get("prompt_tokens") or 0)
+            completion = int(entry.get("completion_tokens") or 0)
+            usage += cls(
+                prompt_tokens=prompt,
+                completion_tokens=completion,
+                total_tokens=int(entry.get("total_tokens") or prompt + completion),
+            )
+        return usage
+
+
+class PipelineResponse(BaseModel):
+    """Stage-1 route, stage-2 category, and the token cost of producing them."""
+
+    route: ComplaintResponse = Field(..., description="Stage-1 AE vs PC classification")
+    category: ComplaintResponse = Field(..., description="Stage-2 category classification for the chosen branch")
+    speculative: bool = Field(..., description="Whether both stage-2 branches were started alongside the router")
+    latency_ms: float = Field(..., description="End-to-end server-side latency")
+    tokens: TokenUsage = Field(..., description="Tokens spent on the router and the chosen stage-2 branch")
+    speculative_overhead_tokens: TokenUsage = Field(
+        default_factory=TokenUsage,
+        description=(
+            "Tokens spent on the discarded stage-2 branch. Only completed calls report usage, so a branch cancelled "
+            "mid-generation counts as zero here (see discarded_branch_cancelled)."
+        ),
+    )
+    discarded_branch: str | None = Field(None, description="Stage-2 classification type that was dropped")
+    discarded_branch_cancelled: bool = Field(
+        False, description="True when the dropped branch was cancelled before it finished"
+    )
+
+
+async def _tracked(
+    predictor: AsyncClassificationFunction,
+    request: ComplaintRequest,
+) -> tuple[ComplaintResponse, TokenUsage]:
+    """Run ``predictor`` with a dedicated DSPy usage tracker so concurrent branches are accounted separately."""
+    from dspy.utils.usage_tracker import track_usage
+
+    with track_usage() as tracker:
+        response = await predictor(request)
+    return response, TokenUsage.from_tracker_totals(tracker.get_total_tokens())
+
+
+def _branch_for(route: ComplaintResponse) -> ClassificationType:
+    is_ae = route.classification.strip().lower() == ADVERSE_EVENT_LABEL.lower()
+    return ClassificationType.AE_CATEGORY if is_ae else ClassificationType.PC_CATEGORY
+
+
+async def run_pipeline(
+    router: AsyncClassificationFunction,
+    ae_category: AsyncClassificationFunction,
+    pc_category: AsyncClassificationFunction,
+    request: ComplaintRequest,
+    speculative: bool = False,
+) -> PipelineResponse:
+    """Classify a complaint as AE/PC, then into the matching category.
+
+    With ``speculative=True`` both category classifiers start at the same time as the router. Once the router
+    answers, the ruled-out branch is cancelled if it is still running (or its finished result discarded), so
+    end-to-end latency approaches a single LLM call at the cost of the extra branch's tokens.
+    """
+    started = time.perf_counter()
+    stage2 = {ClassificationType.AE_CATEGORY: ae_category, ClassificationType.PC_CATEGORY: pc_category}
+
+    if not speculative:
+        route, route_usage = await _tracked(router, request)
+        branch = _branch_for(route)
+        category, category_usage = await _tracked(stage2[branch], request)
+        return PipelineResponse(
+            route=route,
+            category=category,
+            speculative=False,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            tokens=route_usage + category_usage,
+        )
+
+    branch_tasks = {
+        branch_type: asyncio.create_task(_tracked(predictor, request)) for branch_type, predictor in stage2.items()
+    }
+    try:
+        route, route_usage = await _tracked(router, request)
+    except BaseException:
+        for task in branch_tasks.values():
+            task.cancel()
+        raise
+
+    branch = _branch_for(route)
+    loser_type = next(branch_type for branch_type in branch_tasks if branch_type != branch)
+    loser = branch_tasks.pop(loser_type)
+
+    overhead = TokenUsage()
+    loser_cancelled = not loser.done()
+    if loser_cancelled:
+        loser.cancel()
+    elif not loser.cancelled() and loser.exception() is None:
+        overhead = loser.result()[1]
+
+    category, category_usage = await branch_tasks[branch]
+    return PipelineResponse(
+        route=route,
+        category=category,
+        speculative=True,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        tokens=route_usage + category_usage,
+        speculative_overhead_tokens=overhead,
+        discarded_branch=loser_type,
+        discarded_branch_cancelled=loser_cancelled,
+    )
+
+
+__all__ = [
+    "PipelineRequest",
+    "PipelineResponse",
+    "TokenUsage",
+    "run_pipeline",
+]
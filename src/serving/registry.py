@@ -0,0 +1,193 @@
+"""Lazy registry of classifiers discovered from artifact metadata, loaded on first use and evicted when cold."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from ..common.paths import ARTIFACTS_DIR
+from ..common.types import ClassificationConfig
+from .cache import PredictionCache
+from .service import SingleFlight
+
+DEFAULT_REGISTRY_MAX_LOADED = 16
+DEFAULT_REGISTRY_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_REFRESH_INTERVAL_SECONDS = 5.0
+
+
+class UnknownClassificationType(LookupError):
+    """Raised when no artifact under the registry's directory declares the requested classification type."""
+
+
+class ArtifactEntry(BaseModel):
+    """What the registry keeps about an artifact it has not necessarily loaded."""
+
+    classification_type: str
+    path: Path
+    config: ClassificationConfig
+    fingerprint: str
+    size: int
+
+
+def read_artifact_entry(path: Path) -> ArtifactEntry | None:
+    """Describe ``path`` from its ``metadata`` block, or return ``None`` if it does not declare a classifier."""
+    try:
+        raw = path.read_bytes()
+        metadata = json.loads(raw).get("metadata")
+        classification_type = metadata["classification_type"]
+        config = ClassificationConfig.model_validate(metadata["classification_config"])
+    except (OSError, ValueError, AttributeError, KeyError, TypeError, ValidationError):
+        return None
+    if not isinstance(classification_type, str) or not classification_type:
+        return None
+    return ArtifactEntry(
+        classification_type=classification_type,
+        path=path,
+        config=config,
+        # same digest as cache.artifact_fingerprint, without reading the file twice
+        fingerprint=hashlib.sha256(raw).hexdigest()[:16],
+        size=len(raw),
+    )
+
+
+class ClassifierRegistry[T]:
+    """Serve any number of classification types from the artifacts in ``artifacts_dir``.
+
+    The directory is indexed lazily: the first lookup (and any lookup once the index is older than
+    ``refresh_interval_seconds``) stats the ``*.json`` files and re-reads only the ones whose size or mtime changed,
+    keeping just their metadata. A classifier is built with ``build`` (in a worker thread) on first use; concurrent
+    first uses share one load. Loaded classifiers are kept in LRU order and the coldest are evicted once more than
+    ``max_loaded`` are resident or their artifacts add up to more than ``max_bytes`` (artifact size is the memory
+    proxy: demos dominate a loaded classifier). When an artifact changes or disappears its loaded classifier is
+    dropped and, with a ``prediction_cache``, the predictions keyed by its old fingerprint are retired. Requests that
+    already hold an evicted classifier finish on it.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[ArtifactEntry], T],
+        artifacts_dir: Path = ARTIFACTS_DIR,
+        max_loaded: int = DEFAULT_REGISTRY_MAX_LOADED,
+        max_bytes: int = DEFAULT_REGISTRY_MAX_BYTES,
+        refresh_interval_seconds: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+        prediction_cache: PredictionCache[Any] | None = None,
+    ):
+        if max_loaded < 1:
+            raise ValueError("max_loaded must be at least 1")
+        self._build = build
+        self.artifacts_dir = Path(artifacts_dir)
+        self.max_loaded = max_loaded
+        self.max_bytes = max_bytes
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.prediction_cache = prediction_cache
+        self._index: dict[str, ArtifactEntry] = {}
+        self._scanned: dict[Path, tuple[int, int, ArtifactEntry | None]] = {}
+        self._refreshed_at: float | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._loaded: OrderedDict[str, tuple[ArtifactEntry, T]] = OrderedDict()
+        self._loads: SingleFlight[T] = SingleFlight()
+        self.hits = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def _scan(self) -> dict[str, ArtifactEntry]:
+        """Index the directory, re-reading only files whose (mtime, size) changed since the last scan."""
+        scanned: dict[Path, tuple[int, int, ArtifactEntry | None]] = {}
+        index: dict[str, ArtifactEntry] = {}
+        for path in sorted(self.artifacts_dir.glob("*.json")):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            previous = self._scanned.get(path)
+            if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                entry = previous[2]
+            else:
+                entry = read_artifact_entry(path)
+            scanned[path] = (stat.st_mtime_ns, stat.st_size, entry)
+            if entry is not None:
+                index.setdefault(entry.classification_type, entry)
+        self._scanned = scanned
+        return index
+
+    def _is_fresh(self) -> bool:
+        return self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh_interval_seconds
+
+    async def refresh(self, force: bool = False) -> None:
+        """Re-index the directory (unless another caller just did) and drop classifiers whose artifact changed."""
+        async with self._refresh_lock:
+            if self._is_fresh() and not force:
+                return
+            index = await asyncio.to_thread(self._scan)
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+            self._index = index
+
+            for classification_type, (entry, _) in list(self._loaded.items()):
+                current = index.get(classification_type)
+                if current is None or current.fingerprint != entry.fingerprint:
+                    del self._loaded[classification_type]
+                    if self.prediction_cache is not None:
+                        await asyncio.to_thread(self.prediction_cache.retire, entry.fingerprint)
+
+    async def get(self, classification_type: str) -> T:
+        """Return the classifier for ``classification_type``, loading it on first use."""
+        if not self._is_fresh():
+            await self.refresh()
+        loaded = self._loaded.get(classification_type)
+        if loaded is not None:
+            self._loaded.move_to_end(classification_type)
+            self.hits += 1
+            return loaded[1]
+        entry = self._index.get(classification_type)
+        if entry is None:
+            raise UnknownClassificationType(classification_type)
+        return await self._loads.run(f"{classification_type}:{entry.fingerprint}", lambda: self._load(entry))
+
+    async def _load(self, entry: ArtifactEntry) -> T:
+        built = await asyncio.to_thread(self._build, entry)
+        if self._index.get(entry.classification_type) is entry:
+            self._loaded[entry.classification_type] = (entry, built)
+            self._evict()
+        return built
+
+    def _loaded_bytes(self) -> int:
+        return sum(entry.size for entry, _ in self._loaded.values())
+
+    def _evict(self) -> None:
+        while len(self._loaded) > 1 and (len(self._loaded) > self.max_loaded or self._loaded_bytes() > self.max_bytes):
+            self._loaded.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int | list[str]]:
+        return {
+            "indexed": len(self._index),
+            "loaded": len(self._loaded),
+            "loaded_bytes": self._loaded_bytes(),
+            "max_loaded": self.max_loaded,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "loads": self._loads.calls,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "resident": list(self._loaded),
+        }
+
+
+__all__ = [
+    "DEFAULT_REFRESH_INTERVAL_SECONDS",
+    "DEFAULT_REGISTRY_MAX_BYTES",
+    "DEFAULT_REGISTRY_MAX_LOADED",
+    "ArtifactEntry",
+    "ClassifierRegistry",
+    "UnknownClassificationType",
+    "read_artifact_entry",
+]
@@ -0,0 +1,192 @@
+"""Hot reload of classifier artifacts: load and validate a new artifact off the event loop, then swap it in."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from ..common.types import CLASSIFICATION_CONFIGS, ClassificationType
+from .cache import PredictionCache, artifact_fingerprint
+from .service import _resolve_artifact_path, _resolve_classifier
+
+if TYPE_CHECKING:
+    from ..common.classifier import ComplaintClassifier
+
+_VALIDATION_COMPLAINT = "Artifact validation probe: my pen arrived cracked."
+
+
+class ArtifactValidationError(ValueError):
+    """Raised when a classifier artifact cannot be served (wrong type, label set drift, unrenderable prompt)."""
+
+
+class ReloadResult(BaseModel):
+    """Outcome of reloading one classifier."""
+
+    classification_type: str
+    status: Literal["reloaded", "unchanged", "failed"]
+    fingerprint: str = Field("", description="Fingerprint of the artifact now being served")
+    previous_fingerprint: str = Field("", description="Fingerprint served before the reload")
+    retired_cache_entries: int = Field(0, description="Cached predictions of the previous artifact that were dropped")
+    error: str = Field("", description="Why the reload failed (the previous artifact keeps serving)")
+
+
+class ReloadResponse(BaseModel):
+    """Per-classifier outcomes of an admin reload."""
+
+    results: list[ReloadResult]
+
+
+def validate_artifact(model_path: Path, classification_type: ClassificationType) -> None:
+    """Check the artifact's saved metadata against the classifier it is about to replace."""
+    try:
+        artifact = json.loads(model_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise ArtifactValidationError(f"{model_path.name} is not valid JSON: {exc}") from exc
+    metadata = artifact.get("metadata") if isinstance(artifact, dict) else None
+    if not isinstance(metadata, dict):
+        return
+
+    saved_type = metadata.get("classification_type")
+    if saved_type is not None and saved_type != classification_type.value:
+        raise ArtifactValidationError(f"{model_path.name} was trained for {saved_type}, not {classification_type}")
+    saved_config = metadata.get("classification_config")
+    saved_labels = saved_config.get("labels") if isinstance(saved_config, dict) else None
+    if saved_labels is not None and saved_labels != CLASSIFICATION_CONFIGS[classification_type].labels:
+        raise ArtifactValidationError(f"{model_path.name} was trained on a different label set")
+
+
+def validate_classifier(classifier: ComplaintClassifier, classification_type: ClassificationType) -> None:
+    """Render a prompt with every loaded predictor so a bad signature or demo fails here, not on live traffic."""
+    import dspy
+
+    adapter = dspy.settings.adapter or dspy.ChatAdapter()
+    labels = set(CLASSIFICATION_CONFIGS[classification_type].labels)
+    for name, predictor in classifier.named_predictors():
+        for demo in predictor.demos:
+            label = demo.get("classification") if hasattr(demo, "get") else None
+            if label is not None and label not in labels:
+                raise ArtifactValidationError(f"Demo in {name} has unknown label {label!r}")
+        try:
+            adapter.format(predictor.signature, predictor.demos, {"complaint": _VALIDATION_COMPLAINT})
+        except Exception as exc:
+            raise ArtifactValidationError(f"Cannot render the {name} prompt: {exc}") from exc
+
+
+class ArtifactReloader[T]:
+    """Swap freshly loaded classifiers into the serving state without dropping in-flight requests.
+
+    ``build`` turns the artifact currently on disk into whatever the app serves (e.g. predictor and streamer) and
+    ``install`` publishes it with a single assignment. Loading, validation and ``build`` run in a worker thread; only
+    ``install`` runs on the event loop, so requests already holding the previous objects finish on them. After a
+    swap, ``prediction_cache`` entries keyed by the previous artifact fingerprint are retired. A failed reload leaves
+    the previous artifact serving.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[ClassificationType], T],
+        install: Callable[[ClassificationType, T], None],
+        prediction_cache: PredictionCache[Any] | None = None,
+    ):
+        self._build = build
+        self._install = install
+        self.prediction_cache = prediction_cache
+        self.fingerprints: dict[ClassificationType, str] = {}
+        self._failed: dict[ClassificationType, str] = {}
+        self._locks: dict[ClassificationType, asyncio.Lock] = {}
+        self.reloads = 0
+        self.failures = 0
+
+    def _prepare(self, classification_type: ClassificationType) -> tuple[str, T]:
+        model_path = _resolve_artifact_path(classification_type)
+        validate_artifact(model_path, classification_type)
+        validate_classifier(_resolve_classifier(model_path, classification_type), classification_type)
+        fingerprint = artifact_fingerprint(model_path)
+        built = self._build(classification_type)
+        if artifact_fingerprint(model_path) != fingerprint:
+            raise ArtifactValidationError(f"{model_path.name} changed while it was being loaded")
+        return fingerprint, built
+
+    async def reload(self, classification_type: ClassificationType, force: bool = False) -> ReloadResult:
+        """Reload ``classification_type`` if its artifact changed (or always with ``force``)."""
+        lock = self._locks.setdefault(classification_type, asyncio.Lock())
+        async with lock:
+            previous = self.fingerprints.get(classification_type, "")
+            result = ReloadResult(
+                classification_type=classification_type, status="unchanged", previous_fingerprint=previous
+            )
+            try:
+                current = await asyncio.to_thread(artifact_fingerprint, _resolve_artifact_path(classification_type))
+                if current == previous and not force:
+                    result.fingerprint = previous
+                    return result
+                fingerprint, built = await asyncio.to_thread(self._prepare, classification_type)
+            except (OSError, ValueError) as exc:
+                self.failures += 1
+                self._failed[classification_type] = _safe_fingerprint(classification_type)
+                result.status, result.fingerprint, result.error = "failed", previous, str(exc)
+                logger.warning("Reload of {} failed, keeping the previous artifact: {}", classification_type, exc)
+                return result
+
+            self._install(classification_type, built)
+            self.fingerprints[classification_type] = fingerprint
+            self._failed.pop(classification_type, None)
+            result.status, result.fingerprint = "reloaded", fingerprint
+            if previous:
+                self.reloads += 1
+                logger.info("Reloaded {} artifact {} -> {}", classification_type, previous, fingerprint)
+                if previous != fingerprint and self.prediction_cache is not None:
+                    result.retired_cache_entries = await asyncio.to_thread(self.prediction_cache.retire, previous)
+            return result
+
+    async def reload_all(self, force: bool = False) -> list[ReloadResult]:
+        return list(await asyncio.gather(*(self.reload(ct, force) for ct in CLASSIFICATION_CONFIGS)))
+
+    async def watch(self, interval_seconds: float) -> None:
+        """Poll the artifacts every ``interval_seconds`` and reload the ones whose content changed.
+
+        An artifact that failed to reload is retried only once its content changes again. Classifiers that were
+        never loaded (lazy loading) are left for their first request.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            for classification_type in CLASSIFICATION_CONFIGS:
+                if classification_type not in self.fingerprints and classification_type not in self._failed:
+                    continue
+                current = await asyncio.to_thread(_safe_fingerprint, classification_type)
+                if not current or current in (
+                    self.fingerprints.get(classification_type),
+                    self._failed.get(classification_type),
+                ):
+                    continue
+                await self.reload(classification_type)
+
+    def stats(self) -> dict[str, int | dict[str, str]]:
+        return {
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "fingerprints": {ct.value: fingerprint for ct, fingerprint in self.fingerprints.items()},
+        }
+
+
+def _safe_fingerprint(classification_type: ClassificationType) -> str:
+    try:
+        return artifact_fingerprint(_resolve_artifact_path(classification_type))
+    except OSError:
+        return ""
+
+
+__all__ = [
+    "ArtifactReloader",
+    "ArtifactValidationError",
+    "ReloadResponse",
+    "ReloadResult",
+    "validate_artifact",
+    "validate_classifier",
+]
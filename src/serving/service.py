@@ -2,25 +2,51 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-from collections.abc import Callable
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import nullcontext
 from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-import dspy
+from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field
+from pydantic.json_schema import SkipJsonSchema
 
-from ..common.classifier import CLASSIFICATION_CONFIGS, ComplaintClassifier
-from ..common.config import get_display_model_name
+from ..common.config import EnvironmentSettings, get_display_model_name
 from ..common.paths import get_classifier_artifact_path
-from ..common.types import ClassificationType
+from ..common.slots import SlotPinner
+from ..common.types import CLASSIFICATION_CONFIGS, ClassificationConfig, ClassificationType, InferenceProfile
+from .admission import AdmissionController
+from .batching import MicroBatcher
+from .cache import PredictionCache, artifact_fingerprint, prediction_cache_key
+from .hedging import RequestHedger
+from .metrics import ForwardingUsageTracker, MetricsRegistry
+
+if TYPE_CHECKING:
+    import dspy
+
+    from ..common.cascade import NgramClassifier
+    from ..common.classifier import ComplaintClassifier
+    from .near_duplicates import NearDuplicateIndex
 
 
 class ComplaintRequest(BaseModel):
     """Inbound payload for running a classification."""
 
     complaint: str = Field(..., description="Raw complaint text")
+    # SkipJsonSchema keeps ``null`` out of the schema: Foundry's OpenAPI contract cannot express anyOf
+    profile: InferenceProfile | SkipJsonSchema[None] = Field(
+        None,
+        description=(
+            "Inference profile: `full` (reasoning, label and justification), `no-reasoning` or `label-only` "
+            "(empty justification). Defaults to the deployment setting (DSPY_INFERENCE_PROFILE). Streaming routes "
+            "always run `full`."
+        ),
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -75,6 +101,92 @@ class ComplaintResponse(BaseModel):
     classification_type: str = Field(..., description="The type of classification performed")
 
 
+MAX_BATCH_SIZE = 500
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+class BatchComplaintRequest(BaseModel):
+    """Inbound payload for classifying a burst of complaints in one call."""
+
+    items: list[ComplaintRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="Complaints to classify; results are returned in the same order",
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {"complaint": "My Ozempic pen arrived with a cracked cartridge and leaked everywhere."},
+                    {"complaint": "I experienced severe nausea and vomiting after taking Ozempic."},
+                ]
+            }
+        }
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Outcome for a single batch item; failures are reported per item instead of failing the batch."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    ok: bool = Field(..., description="Whether the item was classified successfully")
+    classification: str = Field("", description="Predicted label (empty when the item failed)")
+    justification: str = Field("", description="Model justification (empty when the item failed)")
+    error: str = Field("", description="Error message (empty when the item succeeded)")
+
+
+class BatchComplaintResponse(BaseModel):
+    """Structured batch prediction response."""
+
+    classification_type: str = Field(..., description="The type of classification performed")
+    results: list[BatchItemResult] = Field(..., description="One result per request item, in input order")
+    succeeded: int = Field(..., description="Number of items classified successfully")
+    failed: int = Field(..., description="Number of items that failed")
+
+
+AsyncClassificationFunction = Callable[[ComplaintRequest], Awaitable[ComplaintResponse]]
+
+
+class SingleFlight[T]:
+    """Coalesce concurrent calls that share a key onto one in-flight task.
+
+    The first caller for a key starts the work; callers arriving while it runs await the same task instead of
+    starting their own. The task is shielded, so a cancelled caller (e.g. a dropped connection) does not cancel the
+    computation the others are waiting on. ``calls`` counts computations started, ``coalesced`` counts callers
+    that joined one.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[str, asyncio.Task[T]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task[T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter was cancelled
+
+    def is_running(self, key: str) -> bool:
+        return key in self._in_flight
+
+    def stats(self) -> dict[str, int]:
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._in_flight)}
+
+
 def _update_artifact_model_metadata(model_path: Path, current_model: str) -> None:
     try:
         artifact_data = json.loads(model_path.read_text(encoding="utf-8"))
@@ -109,10 +221,58 @@ def _artifact_auto_update_enabled() -> bool:
     return flag in {"1", "true", "yes", "on"}
 
 
-def _load_classifier(model_path: Path, classification_type: ClassificationType) -> ComplaintClassifier:
-    """Load a classifier for a specific classification type."""
-    classifier = ComplaintClassifier(classification_type)
+def _artifact_metadata(model_path: Path) -> dict[str, Any]:
+    try:
+        metadata = json.loads(model_path.read_text(encoding="utf-8")).get("metadata")
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def _artifact_max_tokens(model_path: Path) -> int | None:
+    """The completion budget stored in the artifact's metadata, unless ``DSPY_TOKEN_BUDGETS`` turns budgets off."""
+    if not EnvironmentSettings().token_budgets:  # pyright: ignore[reportCallIssue]
+        return None
+    max_tokens = _artifact_metadata(model_path).get("max_tokens")
+    if isinstance(max_tokens, int) and max_tokens > 0:
+        return max_tokens
+    logger.info(
+        "{} has no metadata.max_tokens; its calls keep the LM's max_tokens until it is retrained or "
+        "scripts/bench/token_budgets.py --write measures a budget",
+        model_path.name,
+    )
+    return None
+
+
+def _artifact_label_temperature(model_path: Path) -> float | None:
+    """The ``logprob`` profile's calibration temperature stored in the artifact's metadata, if one was fitted."""
+    temperature = _artifact_metadata(model_path).get("label_temperature")
+    return float(temperature) if isinstance(temperature, int | float) and temperature > 0 else None
+
+
+def _demo_retriever(classification_type: ClassificationType | str) -> Callable[[str], list[dict]] | None:
+    """Retrieved demos for the classifier when ``DSPY_RETRIEVED_DEMOS`` gives it a count (built-in types only)."""
+    k = EnvironmentSettings().retrieved_demos.get(str(classification_type), 0)  # pyright: ignore[reportCallIssue]
+    if k <= 0 or classification_type not in CLASSIFICATION_CONFIGS:
+        return None
+    from ..common.demo_retrieval import DemoRetriever, demo_index_for
+
+    return DemoRetriever(demo_index_for(classification_type), k)
+
+
+def _load_classifier(
+    model_path: Path,
+    classification_type: ClassificationType | str,
+    config: ClassificationConfig | None = None,
+) -> ComplaintClassifier:
+    """Load a classifier for a specific classification type (the first load is what imports DSPy)."""
+    from ..common.classifier import ComplaintClassifier
+
+    classifier = ComplaintClassifier(classification_type, config)
     classifier.load(str(model_path))
+    classifier.max_tokens = _artifact_max_tokens(model_path)
+    classifier.label_temperature = _artifact_label_temperature(model_path)
+    classifier.demo_retriever = _demo_retriever(classification_type)
     current_model = get_display_model_name()
     if current_model and _artifact_auto_update_enabled():
         _update_artifact_model_metadata(model_path, current_model)
@@ -120,41 +280,271 @@ def _load_classifier(model_path: Path, classification_type: ClassificationType)
 
 
 @lru_cache(maxsize=3)
-def _cached_classifier(model_path: Path, classification_type: ClassificationType) -> ComplaintClassifier:
-    """Cache classifiers by both path and classification type."""
+def _cached_classifier(
+    model_path: Path, classification_type: ClassificationType, fingerprint: str
+) -> ComplaintClassifier:
+    """Cache classifiers by path, classification type and artifact fingerprint, so a replaced artifact is reloaded."""
     return _load_classifier(model_path, classification_type)
 
 
-def _create_classification_function(
-    classification_type: ClassificationType,
-    use_cache: bool = True,
-) -> Callable[[ComplaintRequest], ComplaintResponse]:
-    """Create a classification function for a specific classification type."""
+def _resolve_artifact_path(classification_type: ClassificationType | str) -> Path:
+    """Validate the classification type and return the resolved path of its optimized artifact."""
     if classification_type not in CLASSIFICATION_CONFIGS:
         raise ValueError(
             f"Invalid classification type: {classification_type}. "
             f"Valid types: {', '.join(t.value for t in ClassificationType)}"
         )
+    return get_classifier_artifact_path(ClassificationType(classification_type)).expanduser().resolve()
+
+
+def _resolve_classifier(
+    model_path: Path,
+    classification_type: ClassificationType | str,
+    use_cache: bool = True,
+    config: ClassificationConfig | None = None,
+) -> ComplaintClassifier:
+    """Load (or reuse) the optimized classifier stored at ``model_path``.
+
+    Classifiers with an explicit ``config`` (registry-discovered types) are never put in the built-in cache; the
+    registry that asked for them manages their lifetime.
+    """
+    if use_cache and config is None:
+        return _cached_classifier(model_path, classification_type, artifact_fingerprint(model_path))
+    return _load_classifier(model_path, classification_type, config)
+
+
+def _prediction_key_factory(
+    classification_type: ClassificationType | str, model_path: Path
+) -> Callable[[str, InferenceProfile], str]:
+    """Bind the artifact fingerprint and serving model so a new artifact or model never reuses old predictions."""
+    fingerprint = artifact_fingerprint(model_path)
+    model = get_display_model_name()
 
-    model_path = get_classifier_artifact_path(classification_type)
-    resolved_path = model_path.expanduser().resolve()
+    def _key(complaint: str, profile: InferenceProfile = InferenceProfile.FULL) -> str:
+        # full predictions keep the key they had before profiles existed, so persisted entries stay valid
+        scope = classification_type if profile is InferenceProfile.FULL else f"{classification_type}:{profile}"
+        return prediction_cache_key(complaint, scope, fingerprint, model)
 
-    if use_cache:
-        classifier = _cached_classifier(resolved_path, classification_type)
-    else:
-        classifier = _load_classifier(resolved_path, classification_type)
+    return _key
+
+
+def _create_classification_function(
+    classification_type: ClassificationType,
+    use_cache: bool = True,
+    prediction_cache: PredictionCache[ComplaintResponse] | None = None,
+) -> Callable[[ComplaintRequest], ComplaintResponse]:
+    """Create a classification function for a specific classification type."""
+    model_path = _resolve_artifact_path(classification_type)
+    classifier = _resolve_classifier(model_path, classification_type, use_cache)
+    cache_key = _prediction_key_factory(classification_type, model_path) if prediction_cache is not None else None
+
+    programs: dict[InferenceProfile, dspy.Module] = {InferenceProfile.FULL: classifier}
 
     def _predict(request: ComplaintRequest) -> ComplaintResponse:
-        prediction: dspy.Prediction = classifier(complaint=request.complaint)
-        return ComplaintResponse(
+        profile = request.profile or InferenceProfile.FULL
+        key = cache_key(request.complaint, profile) if cache_key is not None else None
+        if key is not None and prediction_cache is not None:
+            cached = prediction_cache.get(key)
+            if cached is not None:
+                return cached
+
+        program = programs.get(profile)
+        if program is None:
+            program = programs[profile] = classifier.for_profile(profile)
+        prediction: dspy.Prediction = program(complaint=request.complaint)
+        response = ComplaintResponse(
             classification=prediction.classification,
             justification=prediction.justification,
             classification_type=classification_type,
         )
+        if key is not None and prediction_cache is not None:
+            prediction_cache.put(key, response)
+        return response
 
     return _predict
 
 
+def _create_async_classification_function(
+    classification_type: ClassificationType | str,
+    use_cache: bool = True,
+    prediction_cache: PredictionCache[ComplaintResponse] | None = None,
+    single_flight: SingleFlight[ComplaintResponse] | None = None,
+    micro_batcher: MicroBatcher[dspy.Prediction] | None = None,
+    admission: AdmissionController | None = None,
+    metrics_registry: MetricsRegistry | None = None,
+    model_path: Path | None = None,
+    classification_config: ClassificationConfig | None = None,
+    hedger: RequestHedger | None = None,
+    hedge_lm: dspy.BaseLM | None = None,
+    slot_pinner: SlotPinner | None = None,
+    default_profile: InferenceProfile = InferenceProfile.FULL,
+    first_stage: NgramClassifier | None = None,
+    near_duplicates: NearDuplicateIndex | None = None,
+) -> AsyncClassificationFunction:
+    """Create an awaitable classification function for a specific classification type.
+
+    The returned coroutine function goes through DSPy's async module path (``acall`` -> ``aforward``), which uses the
+    async LiteLLM client instead of a blocking HTTP call, so an in-flight prediction does not occupy a worker thread.
+    """
+    import dspy
+    from dspy.utils.exceptions import AdapterParseError
+
+    if model_path is None:
+        model_path = _resolve_artifact_path(classification_type)
+    classifier = _resolve_classifier(model_path, classification_type, use_cache, classification_config)
+    needs_key = prediction_cache is not None or single_flight is not None
+    cache_key = _prediction_key_factory(classification_type, model_path) if needs_key else None
+    if prediction_cache is None:
+        near_duplicates = None
+    near_scope = (
+        f"{artifact_fingerprint(model_path)}:{get_display_model_name()}:{classification_type}"
+        if near_duplicates is not None
+        else ""
+    )
+    metrics = (
+        metrics_registry.classifier(classification_type, get_display_model_name())
+        if metrics_registry is not None
+        else None
+    )
+
+    # the slimmer programs are built from the loaded classifier on first use
+    programs: dict[InferenceProfile, dspy.Module] = {InferenceProfile.FULL: classifier}
+
+    def _program(profile: InferenceProfile) -> dspy.Module:
+        program = programs.get(profile)
+        if program is None:
+            program = programs[profile] = classifier.for_profile(profile)
+        return program
+
+    async def _acall(program: dspy.Module, complaint: str, lm: dspy.BaseLM | None) -> dspy.Prediction:
+        with slot_pinner.pin() if slot_pinner is not None else nullcontext():
+            if lm is None:
+                return await program.acall(complaint=complaint)
+            with dspy.settings.context(lm=lm):
+                return await program.acall(complaint=complaint)
+
+    async def _timed_acall(
+        program: dspy.Module, complaint: str, lm_elapsed: list[float], lm: dspy.BaseLM | None = None
+    ) -> dspy.Prediction:
+        if metrics is None:
+            return await _acall(program, complaint, lm)
+        tracker = ForwardingUsageTracker(dspy.settings.usage_tracker)
+        started = time.perf_counter()
+        try:
+            with metrics.lm_in_flight.track(), dspy.settings.context(usage_tracker=tracker):
+                return await _acall(program, complaint, lm)
+        except AdapterParseError:
+            metrics.parse_failures.inc()
+            raise
+        finally:
+            lm_elapsed[0] = time.perf_counter() - started
+            metrics.lm_seconds.observe(lm_elapsed[0])
+            metrics.record_usage(tracker)
+
+    async def _dispatch(
+        program: dspy.Module, complaint: str, lm_elapsed: list[float], lm: dspy.BaseLM | None = None
+    ) -> dspy.Prediction:
+        if micro_batcher is None:
+            return await _timed_acall(program, complaint, lm_elapsed, lm)
+        return await micro_batcher.submit(lambda: _timed_acall(program, complaint, lm_elapsed, lm))
+
+    async def _call_lm(program: dspy.Module, complaint: str, lm_elapsed: list[float]) -> dspy.Prediction:
+        if hedger is None:
+            return await _dispatch(program, complaint, lm_elapsed)
+        return await hedger.run(
+            lambda: _dispatch(program, complaint, lm_elapsed),
+            lambda: _dispatch(program, complaint, lm_elapsed, hedge_lm),
+            metrics,
+        )
+
+    async def _compute(
+        program: dspy.Module, complaint: str, key: str | None, lm_elapsed: list[float], profile: InferenceProfile
+    ) -> ComplaintResponse:
+        prediction: dspy.Prediction
+        if admission is None:
+            prediction = await _call_lm(program, complaint, lm_elapsed)
+        else:
+            async with admission.slot():
+                prediction = await _call_lm(program, complaint, lm_elapsed)
+        response = ComplaintResponse(
+            classification=prediction.classification,
+            justification=prediction.justification,
+            classification_type=classification_type,
+        )
+        if key is not None and prediction_cache is not None:
+            prediction_cache.put(key, response)
+            if near_duplicates is not None:
+                near_duplicates.add(f"{near_scope}:{profile}", complaint, key)
+        return response
+
+    async def _near_duplicate(complaint: str, profile: InferenceProfile) -> ComplaintResponse | None:
+        if near_duplicates is None or prediction_cache is None:
+            return None
+        near_key = near_duplicates.find(f"{near_scope}:{profile}", complaint)
+        if near_key is None:
+            return None
+        cached = await prediction_cache.aget(near_key)
+        if cached is None:
+            # the prediction expired or was evicted; the index entry is of no more use
+            near_duplicates.discard(near_key)
+            return None
+        if metrics is not None:
+            metrics.near_duplicate_hits.inc()
+        return cached
+
+    async def _serve(request: ComplaintRequest, lm_elapsed: list[float]) -> ComplaintResponse:
+        profile = request.profile or default_profile
+        key = cache_key(request.complaint, profile) if cache_key is not None else None
+        if key is not None and prediction_cache is not None:
+            cached = await prediction_cache.aget(key)
+            if cached is not None:
+                if metrics is not None:
+                    metrics.cache_hits.inc()
+                return cached
+            near = await _near_duplicate(request.complaint, profile)
+            if near is not None:
+                return near
+        if first_stage is not None:
+            answered = first_stage.answer(request.complaint)
+            if answered is not None:
+                if metrics is not None:
+                    metrics.first_stage_answers.inc()
+                return ComplaintResponse(
+                    classification=answered[0],
+                    justification=f"Answered by the first-stage n-gram model (confidence {answered[1]:.2f}).",
+                    classification_type=classification_type,
+                )
+
+        program = _program(profile)
+        if key is None or single_flight is None:
+            return await _compute(program, request.complaint, key, lm_elapsed, profile)
+        if metrics is not None and single_flight.is_running(key):
+            metrics.coalesced.inc()
+        response = await single_flight.run(key, lambda: _compute(program, request.complaint, key, lm_elapsed, profile))
+        return response.model_copy()
+
+    async def _apredict(request: ComplaintRequest) -> ComplaintResponse:
+        lm_elapsed = [0.0]
+        if metrics is None:
+            return await _serve(request, lm_elapsed)
+
+        metrics.requests.inc()
+        started = time.perf_counter()
+        try:
+            with metrics.in_flight.track():
+                return await _serve(request, lm_elapsed)
+        except Exception:
+            metrics.errors.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.request_seconds.observe(elapsed)
+            if lm_elapsed[0] > 0:
+                metrics.overhead_seconds.observe(max(elapsed - lm_elapsed[0], 0.0))
+
+    return _apredict
+
+
 def get_ae_pc_classifier(use_cache: bool = True) -> Callable[[AEPCRequest], ComplaintResponse]:
     """Get classifier for Adverse Event vs Product Complaint classification."""
     return _create_classification_function(ClassificationType.AE_PC, use_cache)
@@ -173,9 +563,102 @@ def get_pc_category_classifier(use_cache: bool = True) -> Callable[[PCCategoryRe
 def get_classification_function(
     classification_type: ClassificationType = ClassificationType.AE_PC,
     use_cache: bool = True,
+    prediction_cache: PredictionCache[ComplaintResponse] | None = None,
 ) -> Callable[[ComplaintRequest], ComplaintResponse]:
     """Get a classification function for the requested classification type."""
-    return _create_classification_function(classification_type, use_cache)
+    return _create_classification_function(classification_type, use_cache, prediction_cache)
+
+
+def get_async_classification_function(
+    classification_type: ClassificationType | str = ClassificationType.AE_PC,
+    use_cache: bool = True,
+    prediction_cache: PredictionCache[ComplaintResponse] | None = None,
+    single_flight: SingleFlight[ComplaintResponse] | None = None,
+    micro_batcher: MicroBatcher[dspy.Prediction] | None = None,
+    admission: AdmissionController | None = None,
+    metrics_registry: MetricsRegistry | None = None,
+    model_path: Path | None = None,
+    classification_config: ClassificationConfig | None = None,
+    hedger: RequestHedger | None = None,
+    hedge_lm: dspy.BaseLM | None = None,
+    slot_pinner: SlotPinner | None = None,
+    default_profile: InferenceProfile = InferenceProfile.FULL,
+    first_stage: NgramClassifier | None = None,
+    near_duplicates: NearDuplicateIndex | None = None,
+) -> AsyncClassificationFunction:
+    """Get an awaitable classification function for the requested classification type.
+
+    Pass a shared ``prediction_cache`` to answer repeated complaints without another LM call, and a shared
+    ``single_flight`` to make identical complaints that arrive while one is in flight wait for that call. A
+    ``micro_batcher`` (one per classifier) groups this classifier's LM calls into batches before dispatch, and an
+    ``admission`` controller (one per classifier) caps its in-flight LM calls, raising ``AdmissionRejected`` when the
+    wait queue is full or a call waits too long. Cache hits and coalesced callers never take a slot. A ``hedger``
+    (one per classifier) re-sends LM calls that run past its latency percentile, to ``hedge_lm`` when given, and keeps
+    the first answer; the hedge shares the original call's admission slot. A ``slot_pinner`` (one per classifier) sends
+    each LM call to one of the classifier's llama.cpp slots, whose KV cache already holds its prompt prefix. Requests,
+    latency (LM vs overhead), tokens, hedges and parse failures are recorded in ``metrics_registry`` when one is given.
+    Requests run the :class:`~src.common.types.InferenceProfile` they name, else ``default_profile``; each profile is
+    cached separately. A ``first_stage`` model answers the complaints it is confident about before any of that, without
+    an LM call (see :mod:`src.common.cascade`); the rest escalate to the DSPy program. With a ``prediction_cache``, a
+    shared ``near_duplicates`` index also answers a complaint from the cached prediction of an earlier one whose text
+    is nearly the same (see :mod:`src.serving.near_duplicates`).
+
+    Classification types outside :class:`ClassificationType` pass their artifact ``model_path`` and
+    ``classification_config`` explicitly (see :class:`~src.serving.registry.ClassifierRegistry`).
+    """
+    return _create_async_classification_function(
+        classification_type,
+        use_cache,
+        prediction_cache,
+        single_flight,
+        micro_batcher,
+        admission,
+        metrics_registry,
+        model_path,
+        classification_config,
+        hedger,
+        hedge_lm,
+        slot_pinner,
+        default_profile,
+        first_stage,
+        near_duplicates,
+    )
+
+
+async def classify_batch(
+    predictor: AsyncClassificationFunction,
+    requests: Sequence[ComplaintRequest],
+    classification_type: ClassificationType,
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> BatchComplaintResponse:
+    """Fan a batch out to ``predictor`` with at most ``max_concurrency`` calls in flight.
+
+    Results keep input order. An exception from one item is recorded on that item's result; it does not fail
+    the batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _run(index: int, request: ComplaintRequest) -> BatchItemResult:
+        async with semaphore:
+            try:
+                response = await predictor(request)
+            except Exception as exc:  # noqa: BLE001 - surfaced on the item, the rest of the batch proceeds
+                return BatchItemResult(index=index, ok=False, error=f"{type(exc).__name__}: {exc}")
+        return BatchItemResult(
+            index=index,
+            ok=True,
+            classification=response.classification,
+            justification=response.justification,
+        )
+
+    results = await asyncio.gather(*(_run(index, request) for index, request in enumerate(requests)))
+    succeeded = sum(1 for result in results if result.ok)
+    return BatchComplaintResponse(
+        classification_type=classification_type,
+        results=list(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+    )
 
 
 __all__ = [
@@ -184,8 +667,15 @@ __all__ = [
     "AECategoryRequest",
     "PCCategoryRequest",
     "ComplaintResponse",
+    "BatchComplaintRequest",
+    "BatchComplaintResponse",
+    "BatchItemResult",
+    "MAX_BATCH_SIZE",
+    "AsyncClassificationFunction",
+    "classify_batch",
     "get_ae_pc_classifier",
     "get_ae_category_classifier",
     "get_pc_category_classifier",
     "get_classification_function",
+    "get_async_classification_function",
 ]
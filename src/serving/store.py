@@ -0,0 +1,241 @@
+"""Persistent prediction store shared by uvicorn workers and across restarts."""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..common.paths import DATA_DIR
+
+DEFAULT_STORE_PATH = DATA_DIR / "prediction_store.sqlite3"
+DEFAULT_STORE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_WRITE_QUEUE_SIZE = 10_000
+_WRITE_BATCH_SIZE = 256
+_EVICTION_CHECK_INTERVAL_SECONDS = 5.0
+_EVICTION_TARGET_RATIO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_created_at ON predictions (created_at);
+CREATE TABLE IF NOT EXISTS predictions_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO predictions_totals SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM predictions
+    WHERE NOT EXISTS (SELECT 1 FROM predictions_totals);
+CREATE TRIGGER IF NOT EXISTS predictions_totals_insert AFTER INSERT ON predictions BEGIN
+    UPDATE predictions_totals SET entries = entries + 1, bytes = bytes + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS predictions_totals_update AFTER UPDATE OF size ON predictions BEGIN
+    UPDATE predictions_totals SET bytes = bytes - old.size + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS predictions_totals_delete AFTER DELETE ON predictions BEGIN
+    UPDATE predictions_totals SET entries = entries - 1, bytes = bytes - old.size;
+END;
+"""
+_TOTALS = "SELECT entries, bytes FROM predictions_totals"
+# a key range, unlike substr(), is answered from the primary-key index instead of a table scan
+_DELETE_KEY_RANGE = "DELETE FROM predictions WHERE key >= ? AND key < ?"
+
+
+def _prefix_range(prefix: str) -> tuple[str, str]:
+    """The ``[start, end)`` range of the keys that start with ``prefix``: UTF-8 text compares by code point."""
+    if not prefix:
+        raise ValueError("prefix must not be empty")
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PersistentPredictionStore:
+    """SQLite (WAL) key/value store for serialized predictions with write-behind and size-based eviction.
+
+    Every worker process opens the same database file. Reads go straight to SQLite on the caller's thread (WAL
+    readers never block on the writer). Writes are queued and committed in batches by a background thread with
+    ``synchronous=NORMAL``, so the request path never waits on a commit or fsync; if the queue is full the write is
+    dropped and counted. Once the stored payloads exceed ``max_bytes`` the oldest entries are deleted. Triggers keep
+    the row and byte totals in ``predictions_totals``; :meth:`stats` reports them as of this worker's last write.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_STORE_PATH,
+        max_bytes: int = DEFAULT_STORE_MAX_BYTES,
+        write_queue_size: int = DEFAULT_WRITE_QUEUE_SIZE,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._local = threading.local()
+        self._queue: queue.Queue[tuple[str, str, float] | None] = queue.Queue(maxsize=write_queue_size)
+        self._closed = False
+        self._committed = threading.Condition()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.dropped_writes = 0
+        self.evictions = 0
+        self.entries = 0
+        self.bytes = 0
+
+        conn = self._connect()
+        try:
+            conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+            self._refresh_totals(conn)
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="prediction-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, max_age_seconds: float = 0) -> str | None:
+        """Return the stored payload for ``key``; entries older than ``max_age_seconds`` (if > 0) are misses."""
+        try:
+            row = self._reader().execute("SELECT payload, created_at FROM predictions WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None or (max_age_seconds > 0 and time.time() - row[1] > max_age_seconds):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, payload: str) -> None:
+        """Queue a write; never blocks the caller."""
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait((key, payload, time.time()))
+        except queue.Full:
+            self.dropped_writes += 1
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        last_eviction_check = 0.0
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch = [item]
+            while len(batch) < _WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = None in batch
+            rows = [(key, payload, created_at, len(payload)) for key, payload, created_at in filter(None, batch)]
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO predictions (key, payload, created_at, size) VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT (key) DO UPDATE SET "
+                            "payload = excluded.payload, created_at = excluded.created_at, size = excluded.size",
+                            rows,
+                        )
+                    self.writes += len(rows)
+                except sqlite3.Error:
+                    self.dropped_writes += len(rows)
+
+            now = time.monotonic()
+            if stopping or now - last_eviction_check >= _EVICTION_CHECK_INTERVAL_SECONDS:
+                last_eviction_check = now
+                self._evict(conn)
+            self._refresh_totals(conn)
+            with self._committed:
+                for _ in batch:
+                    self._queue.task_done()
+                self._committed.notify_all()
+        conn.close()
+
+    def _refresh_totals(self, conn: sqlite3.Connection) -> None:
+        try:
+            self.entries, self.bytes = conn.execute(_TOTALS).fetchone()
+        except sqlite3.Error:
+            self.entries, self.bytes = -1, -1
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        try:
+            count, total = conn.execute(_TOTALS).fetchone()
+            if total <= self.max_bytes or count == 0:
+                return
+            target = int(self.max_bytes * _EVICTION_TARGET_RATIO)
+            average = max(1, total // count)
+            to_delete = min(count, (total - target) // average + 1)
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM predictions WHERE key IN (SELECT key FROM predictions ORDER BY created_at LIMIT ?)",
+                    (to_delete,),
+                ).rowcount
+            self.evictions += deleted
+        except sqlite3.Error:
+            return
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every entry whose key starts with ``prefix``; returns the number of rows deleted."""
+        self.flush()
+        conn = self._reader()
+        try:
+            with conn:
+                deleted = conn.execute(_DELETE_KEY_RANGE, _prefix_range(prefix)).rowcount
+        except sqlite3.Error:
+            return 0
+        self._refresh_totals(conn)
+        return deleted
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait (up to ``timeout``) until queued writes have been committed; blocks, so keep it off the event loop."""
+        with self._committed:
+            self._committed.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._writer.join(timeout)
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "path": str(self.path),
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "pending_writes": self._queue.qsize(),
+            "dropped_writes": self.dropped_writes,
+            "evictions": self.evictions,
+        }
+
+
+__all__ = [
+    "DEFAULT_STORE_MAX_BYTES",
+    "DEFAULT_STORE_PATH",
+    "PersistentPredictionStore",
+]
@@ -0,0 +1,201 @@
+"""Streaming classification: emit the label as soon as it is decoded, then the justification as it is generated."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from ..common.config import get_display_model_name
+from ..common.types import ClassificationType
+from .cache import PredictionCache
+from .metrics import MetricsRegistry
+from .service import (
+    ComplaintRequest,
+    ComplaintResponse,
+    _prediction_key_factory,
+    _resolve_artifact_path,
+    _resolve_classifier,
+)
+
+StreamEventName = Literal["classification", "justification", "done", "error"]
+
+
+class ClassificationStreamEvent(BaseModel):
+    """One Server-Sent Event of a streamed classification.
+
+    ``classification`` carries the full label once its field is complete, ``justification`` carries a text delta,
+    ``done`` carries the final :class:`ComplaintResponse` and ``error`` carries an error message.
+    """
+
+    event: StreamEventName
+    data: dict[str, str] = Field(default_factory=dict)
+
+    def encode(self) -> str:
+        return f"event: {self.event}\ndata: {json.dumps(self.data)}\n\n"
+
+
+StreamingClassificationFunction = Callable[[ComplaintRequest], AsyncIterator[ClassificationStreamEvent]]
+
+
+def _final_events(response: ComplaintResponse) -> list[ClassificationStreamEvent]:
+    return [
+        ClassificationStreamEvent(event="classification", data={"classification": response.classification}),
+        ClassificationStreamEvent(event="justification", data={"delta": response.justification}),
+        ClassificationStreamEvent(event="done", data=response.model_dump(mode="json")),
+    ]
+
+
+def _label_event(label_parts: list[str]) -> ClassificationStreamEvent:
+    return ClassificationStreamEvent(event="classification", data={"classification": "".join(label_parts).strip()})
+
+
+async def stream_prediction_events(
+    chunks: AsyncIterator[Any],
+    classification_type: ClassificationType,
+) -> AsyncIterator[ClassificationStreamEvent]:
+    """Translate a ``dspy.streamify`` output stream into classification stream events.
+
+    The label is emitted once it is complete (its last chunk, or the first justification chunk), not token by token;
+    justification chunks are forwarded as they arrive. When the listeners saw nothing (e.g. an LM cache hit) the
+    fields are emitted from the final prediction.
+    """
+    import dspy
+    from dspy.streaming import StreamResponse
+
+    label_parts: list[str] = []
+    label_sent = False
+    justification_streamed = False
+    prediction: dspy.Prediction | None = None
+
+    async for chunk in chunks:
+        if isinstance(chunk, StreamResponse):
+            if chunk.signature_field_name == "classification" and not label_sent:
+                label_parts.append(chunk.chunk)
+                if chunk.is_last_chunk:
+                    label_sent = True
+                    yield _label_event(label_parts)
+            elif chunk.signature_field_name == "justification" and chunk.chunk:
+                # The listener does not always flag the label's last chunk; justification starting means it is done.
+                if label_parts and not label_sent:
+                    label_sent = True
+                    yield _label_event(label_parts)
+                justification_streamed = True
+                yield ClassificationStreamEvent(event="justification", data={"delta": chunk.chunk})
+        elif isinstance(chunk, dspy.Prediction):
+            prediction = chunk
+
+    if prediction is None:
+        raise RuntimeError("Stream ended without a final prediction")
+
+    response = ComplaintResponse(
+        classification=prediction.classification,
+        justification=prediction.justification,
+        classification_type=classification_type,
+    )
+    if not label_sent:
+        yield ClassificationStreamEvent(event="classification", data={"classification": response.classification})
+    if not justification_streamed:
+        yield ClassificationStreamEvent(event="justification", data={"delta": response.justification})
+    yield ClassificationStreamEvent(event="done", data=response.model_dump(mode="json"))
+
+
+def _stream_listeners(*fields: str) -> list[Any]:
+    """``StreamListener``s on ``fields`` that accept the configured adapter.
+
+    DSPy's listeners know its own adapters by class name and reject any other, so the adapters of this package
+    (``StablePrefixChatAdapter``, the constrained and compact ones) are registered under the DSPy adapter they
+    subclass. The compact adapter writes no ``[[ ## field ## ]]`` markers, so its fields are never streamed: the
+    listeners stay idle and the final prediction is sent as complete events.
+    """
+    import dspy
+    from dspy.streaming import StreamListener
+
+    listeners = [StreamListener(field) for field in fields]
+    adapter = dspy.settings.adapter
+    if adapter is None:
+        return listeners
+    for listener in listeners:
+        identifiers = listener.adapter_identifiers
+        base = next((cls.__name__ for cls in type(adapter).__mro__ if cls.__name__ in identifiers), None)
+        if base is not None:
+            identifiers.setdefault(type(adapter).__name__, identifiers[base])
+    return listeners
+
+
+def get_streaming_classification_function(
+    classification_type: ClassificationType = ClassificationType.AE_PC,
+    use_cache: bool = True,
+    prediction_cache: PredictionCache[ComplaintResponse] | None = None,
+    metrics_registry: MetricsRegistry | None = None,
+) -> StreamingClassificationFunction:
+    """Get a streaming classification function for the requested classification type.
+
+    Built on ``dspy.streamify`` with ``StreamListener``s on the ``classification`` and ``justification`` fields. A
+    ``prediction_cache`` hit is replayed as a complete stream, and a finished stream is stored in the cache.
+    """
+    import dspy
+
+    model_path = _resolve_artifact_path(classification_type)
+    classifier = _resolve_classifier(model_path, classification_type, use_cache)
+    cache_key = _prediction_key_factory(classification_type, model_path) if prediction_cache is not None else None
+    metrics = (
+        metrics_registry.classifier(classification_type, get_display_model_name())
+        if metrics_registry is not None
+        else None
+    )
+
+    async def _events(request: ComplaintRequest) -> AsyncIterator[ClassificationStreamEvent]:
+        key = cache_key(request.complaint) if cache_key is not None else None
+        if key is not None and prediction_cache is not None:
+            cached = await prediction_cache.aget(key)
+            if cached is not None:
+                if metrics is not None:
+                    metrics.cache_hits.inc()
+                for event in _final_events(cached):
+                    yield event
+                return
+
+        # Listeners hold per-stream state, so each request gets its own pair.
+        streamer = dspy.streamify(
+            classifier,
+            stream_listeners=_stream_listeners("classification", "justification"),
+            is_async_program=True,
+        )
+        async for event in stream_prediction_events(streamer(complaint=request.complaint), classification_type):
+            if event.event == "done" and key is not None and prediction_cache is not None:
+                prediction_cache.put(key, ComplaintResponse.model_validate(event.data))
+            yield event
+
+    async def _stream(request: ComplaintRequest) -> AsyncIterator[ClassificationStreamEvent]:
+        if metrics is None:
+            async for event in _events(request):
+                yield event
+            return
+
+        # Only request-level metrics here: a DSPy settings context cannot safely span the generator's yields, so
+        # streamed calls do not report tokens.
+        metrics.requests.inc()
+        started = time.perf_counter()
+        try:
+            with metrics.in_flight.track():
+                async for event in _events(request):
+                    yield event
+        except Exception:
+            metrics.errors.inc()
+            raise
+        finally:
+            metrics.request_seconds.observe(time.perf_counter() - started)
+
+    return _stream
+
+
+__all__ = [
+    "ClassificationStreamEvent",
+    "StreamingClassificationFunction",
+    "get_streaming_classification_function",
+    "stream_prediction_events",
+]
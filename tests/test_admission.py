@@ -0,0 +1,116 @@
+"""Tests for per-classifier admission control."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.serving.admission import AdmissionController, AdmissionRejected
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    async with controller.slot():
+        await release.wait()
+
+
+def test_caps_in_flight_and_queues_in_order():
+    controller = AdmissionController(max_in_flight=2, max_queue=4, max_queue_ms=1000)
+    order: list[int] = []
+
+    async def _work(index: int) -> None:
+        async with controller.slot():
+            order.append(index)
+            await asyncio.sleep(0.01)
+
+    async def _run() -> int:
+        peak = 0
+
+        async def _watch() -> None:
+            nonlocal peak
+            while True:
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.001)
+
+        watcher = asyncio.create_task(_watch())
+        await asyncio.gather(*(_work(index) for index in range(6)))
+        watcher.cancel()
+        return peak
+
+    assert asyncio.run(_run()) == 2
+    assert order == list(range(6))
+    stats = controller.stats()
+    assert (stats["admitted"], stats["queued"], stats["in_flight"], stats["waiting"]) == (6, 4, 0, 0)
+
+
+def test_full_queue_is_rejected_immediately_with_429():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, max_queue_ms=1000)
+
+    async def _run() -> AdmissionRejected:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        queued = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0.01)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        release.set()
+        await asyncio.gather(holder, queued)
+        return rejected.value
+
+    rejected = asyncio.run(_run())
+    assert rejected.status_code == 429
+    assert rejected.retry_after >= 1
+    assert controller.rejected_queue_full == 1
+    assert controller.in_flight == 0
+
+
+def test_queue_timeout_is_rejected_with_503_and_frees_the_queue():
+    controller = AdmissionController(max_in_flight=1, max_queue=4, max_queue_ms=20)
+
+    async def _run() -> AdmissionRejected:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0.001)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        assert controller.waiting == 0
+        release.set()
+        await holder
+        return rejected.value
+
+    assert asyncio.run(_run()).status_code == 503
+    assert controller.rejected_queue_timeout == 1
+    assert controller.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    controller = AdmissionController(max_in_flight=1, max_queue=4, max_queue_ms=1000)
+
+    async def _run() -> None:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        waiter = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        release.set()
+        await holder
+
+    asyncio.run(_run())
+    assert (controller.in_flight, controller.waiting) == (0, 0)
+
+
+def test_without_a_queue_only_a_full_controller_is_saturated():
+    controller = AdmissionController(max_in_flight=1, max_queue=0)
+
+    async def _run() -> list[bool]:
+        seen = [controller.saturated]
+        await controller.acquire()
+        seen.append(controller.saturated)
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        controller.release()
+        return [*seen, controller.saturated]
+
+    assert asyncio.run(_run()) == [False, True, False]
+    assert controller.stats()["saturated"] is False
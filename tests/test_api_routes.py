@@ -0,0 +1,278 @@
+"""Route tests for the FastAPI app using stub predictors (no LLM calls)."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.app import _install_classifier, _stream_classification, app
+from src.common.types import ClassificationType
+from src.serving.admission import AdmissionController, AdmissionRejected
+from src.serving.registry import UnknownClassificationType
+from src.serving.reload import ReloadResult
+from src.serving.service import ComplaintRequest, ComplaintResponse
+from src.serving.streaming import ClassificationStreamEvent
+
+
+def _stub_predictor(classification_type: ClassificationType, label: str = "Product Complaint", delay: float = 0.0):
+    calls: list[str] = []
+
+    async def _apredict(request: ComplaintRequest) -> ComplaintResponse:
+        calls.append(request.complaint)
+        if delay:
+            await asyncio.sleep(delay)
+        return ComplaintResponse(
+            classification=label,
+            justification=f"stub for {request.complaint}",
+            classification_type=classification_type,
+        )
+
+    _apredict.calls = calls  # type: ignore[attr-defined]
+    return _apredict
+
+
+def _stub_streamer(label: str, fail: bool = False):
+    async def _stream(request: ComplaintRequest):
+        yield ClassificationStreamEvent(event="classification", data={"classification": label})
+        if fail:
+            raise RuntimeError("backend went away")
+        yield ClassificationStreamEvent(event="justification", data={"delta": f"stub for {request.complaint}"})
+        yield ClassificationStreamEvent(event="done", data={"classification": label})
+
+    return _stream
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # app.state is shared by every test module; monkeypatch restores (or removes) each attribute afterwards, including
+    # the ones a test reassigns
+    stubs = {
+        "errors": {},
+        "ae_pc_predictor": _stub_predictor(ClassificationType.AE_PC),
+        "ae_category_predictor": _stub_predictor(ClassificationType.AE_CATEGORY, "Hypoglycemia"),
+        "pc_category_predictor": _stub_predictor(ClassificationType.PC_CATEGORY, "Device malfunction"),
+        "streamers": {ClassificationType.AE_PC: _stub_streamer("Product Complaint")},
+        "admission": {},
+        "admin_token": None,
+        "reloader": None,
+        "classifier_registry": None,
+    }
+    for name, value in stubs.items():
+        monkeypatch.setattr(app.state, name, value, raising=False)
+    yield TestClient(app)
+
+
+def test_classify_route_awaits_async_predictor(client: TestClient):
+    resp = client.post("/classify/ae-pc", json={"complaint": "Pen arrived cracked."})
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "classification": "Product Complaint",
+        "justification": "stub for Pen arrived cracked.",
+        "classification_type": "ae-pc",
+    }
+    assert app.state.ae_pc_predictor.calls == ["Pen arrived cracked."]
+
+
+def test_classify_route_returns_503_when_predictor_missing(client: TestClient):
+    app.state.pc_category_predictor = None
+    app.state.errors = {ClassificationType.PC_CATEGORY: "artifact missing"}
+
+    resp = client.post("/classify/pc-category", json={"complaint": "Pen arrived cracked."})
+
+    assert resp.status_code == 503
+    assert "artifact missing" in resp.json()["detail"]
+
+
+def test_batch_route_returns_results_in_input_order(client: TestClient):
+    resp = client.post(
+        "/classify/pc-category/batch",
+        json={"items": [{"complaint": "first"}, {"complaint": "second"}]},
+    )
+
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["classification_type"] == "pc-category"
+    assert [item["justification"] for item in payload["results"]] == ["stub for first", "stub for second"]
+    assert all(item["ok"] and item["classification"] == "Device malfunction" for item in payload["results"])
+    assert (payload["succeeded"], payload["failed"]) == (2, 0)
+
+
+def test_batch_route_rejects_empty_batch(client: TestClient):
+    resp = client.post("/classify/ae-pc/batch", json={"items": []})
+
+    assert resp.status_code == 422
+
+
+def test_stream_route_sends_label_first_as_server_sent_events(client: TestClient):
+    resp = client.post("/classify/ae-pc/stream", json={"complaint": "Pen arrived cracked."})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [line.removeprefix("event: ") for line in resp.text.splitlines() if line.startswith("event: ")]
+    assert events == ["classification", "justification", "done"]
+    assert 'data: {"classification": "Product Complaint"}' in resp.text
+
+
+def test_stream_route_reports_midstream_failure_as_error_event(client: TestClient):
+    app.state.streamers[ClassificationType.AE_PC] = _stub_streamer("Product Complaint", fail=True)
+
+    resp = client.post("/classify/ae-pc/stream", json={"complaint": "Pen arrived cracked."})
+
+    assert resp.status_code == 200
+    assert "event: error" in resp.text
+    assert "RuntimeError: backend went away" in resp.text
+
+
+def test_stream_route_returns_503_when_classifier_missing(client: TestClient):
+    resp = client.post("/classify/pc-category/stream", json={"complaint": "Pen arrived cracked."})
+
+    assert resp.status_code == 503
+
+
+def test_shed_request_returns_status_and_retry_after(client: TestClient):
+    async def _shed(request: ComplaintRequest) -> ComplaintResponse:
+        raise AdmissionRejected(429, 7, "Classifier queue is full")
+
+    app.state.ae_pc_predictor = _shed
+
+    resp = client.post("/classify/ae-pc", json={"complaint": "Pen arrived cracked."})
+
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "7"
+    assert resp.json() == {"detail": "Classifier queue is full"}
+
+
+def test_stream_cancelled_before_first_chunk_releases_its_admission_slot(client: TestClient):
+    admission = AdmissionController(max_in_flight=1, max_queue=0)
+    app.state.admission = {ClassificationType.AE_PC: admission}
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "method": "POST", "path": "/classify/ae-pc/stream"}
+
+    async def _receive() -> dict:
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(message: dict) -> None:
+        await asyncio.Event().wait()  # the client never reads the response start
+
+    async def _run() -> tuple[int, int]:
+        response = await _stream_classification(ClassificationType.AE_PC, ComplaintRequest(complaint="Pen cracked."))
+        admitted = admission.in_flight
+        task = asyncio.create_task(response(scope, _receive, _send))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return admitted, admission.in_flight
+
+    assert asyncio.run(_run()) == (1, 0)
+
+
+def test_health_reports_admission_state(client: TestClient):
+    controller = AdmissionController(max_in_flight=4, max_queue=0)
+    app.state.admission = {ClassificationType.AE_PC: controller}
+
+    idle = client.get("/health").json()
+    controller.in_flight = 4
+    busy = client.get("/health").json()
+
+    # with no queue, an idle classifier is not saturated; it is once every slot is taken
+    assert (idle["status"], idle["admission"]["ae-pc"]["saturated"]) == ("ok", False)
+    assert (busy["status"], busy["admission"]["ae-pc"]["saturated"]) == ("saturated", True)
+    assert idle["admission"]["ae-pc"]["max_in_flight"] == 4
+    assert idle["admission"]["ae-pc"]["in_flight"] == 0
+
+
+def test_admin_reload_requires_configured_token(client: TestClient):
+    assert client.post("/admin/reload").status_code == 403
+
+    app.state.admin_token = "secret"
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+
+def test_admin_reload_reports_each_classifier_and_409_on_failure(client: TestClient):
+    class _StubReloader:
+        async def reload(self, classification_type: ClassificationType, force: bool = False) -> ReloadResult:
+            status = "failed" if classification_type == ClassificationType.PC_CATEGORY else "reloaded"
+            return ReloadResult(classification_type=classification_type, status=status)
+
+    app.state.admin_token = "secret"
+    app.state.reloader = _StubReloader()
+
+    ok = client.post("/admin/reload?classification_type=ae-pc", headers={"X-Admin-Token": "secret"})
+    failed = client.post("/admin/reload?classification_type=pc-category", headers={"X-Admin-Token": "secret"})
+
+    assert ok.status_code == 200
+    assert ok.json()["results"][0]["status"] == "reloaded"
+    assert failed.status_code == 409
+
+
+def test_failed_lazy_load_is_retried_after_backoff_and_cleared_by_admin_reload(client: TestClient, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sys.modules["src.api.app"], "time", SimpleNamespace(monotonic=lambda: now[0]))
+    outcomes = ["failed", "reloaded", "failed", "reloaded"]
+    attempts: list[ClassificationType] = []
+
+    class _FlakyReloader:
+        async def reload(self, classification_type: ClassificationType, force: bool = False) -> ReloadResult:
+            attempts.append(classification_type)
+            status = outcomes.pop(0)
+            if status == "reloaded":
+                _install_classifier(
+                    app,
+                    classification_type,
+                    (_stub_predictor(classification_type), _stub_streamer("Product Complaint")),
+                )
+                return ReloadResult(classification_type=classification_type, status=status)
+            return ReloadResult(classification_type=classification_type, status=status, error="artifact missing")
+
+    monkeypatch.setattr(app.state, "lazy_load", True, raising=False)
+    monkeypatch.setattr(app.state, "lm", object(), raising=False)
+    monkeypatch.setattr(app.state, "load_locks", {}, raising=False)
+    monkeypatch.setattr(app.state, "load_retries", {}, raising=False)
+    app.state.reloader = _FlakyReloader()
+    app.state.ae_pc_predictor = None
+    request = {"complaint": "Pen arrived cracked."}
+
+    assert client.post("/classify/ae-pc", json=request).status_code == 503
+    assert client.post("/classify/ae-pc", json=request).status_code == 503  # inside the backoff: no new attempt
+    assert len(attempts) == 1
+    now[0] += 1.0
+    assert client.post("/classify/ae-pc", json=request).status_code == 200
+    assert (len(attempts), app.state.errors, app.state.load_retries) == (2, {}, {})
+
+    app.state.admin_token = "secret"
+    app.state.ae_pc_predictor = None
+    assert client.post("/classify/ae-pc", json=request).status_code == 503
+    assert (
+        client.post("/admin/reload?classification_type=ae-pc", headers={"X-Admin-Token": "secret"}).status_code == 200
+    )
+    assert client.post("/classify/ae-pc", json=request).status_code == 200
+    assert len(attempts) == 4
+
+
+def test_generic_route_serves_builtin_and_registry_classifiers(client: TestClient):
+    class _StubRegistry:
+        async def get(self, classification_type: str):
+            if classification_type != "device-defect":
+                raise UnknownClassificationType(classification_type)
+            return _stub_predictor(classification_type, "Defect")  # type: ignore[arg-type]
+
+    app.state.classifier_registry = _StubRegistry()
+
+    builtin = client.post("/classify/ae-category", json={"complaint": "Felt dizzy."})
+    registered = client.post("/classify/device-defect", json={"complaint": "Needle bent."})
+    unknown = client.post("/classify/nope", json={"complaint": "Needle bent."})
+
+    assert builtin.json()["classification"] == "Hypoglycemia"
+    assert registered.json() == {
+        "classification": "Defect",
+        "justification": "stub for Needle bent.",
+        "classification_type": "device-defect",
+    }
+    assert unknown.status_code == 404
+    assert client.post("/classify/pipeline", json={"complaint": "Needle bent."}).status_code == 200
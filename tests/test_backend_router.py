@@ -0,0 +1,97 @@
+"""Tests for routing LM calls over a backend pool."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import dspy
+import pytest
+
+from src.common.config import BackendConfig, LLMConfig, RouterConfig, load_llm_config
+from src.common.router import BackendUnavailable, RoutedLM
+
+
+class _FakeBackend(dspy.BaseLM):
+    def __init__(self, name: str, delay: float = 0.01, fail: bool = False):
+        super().__init__(model=f"openai/{name}")
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return self.name
+
+
+def _router(*backends: tuple[_FakeBackend, dict], **config) -> RoutedLM:
+    return RoutedLM(
+        [(BackendConfig(name=lm.name, lm=LLMConfig(model=lm.model), **options), lm) for lm, options in backends],
+        RouterConfig(**config),
+    )
+
+
+def test_local_backends_share_load_and_overflow_only_takes_the_excess():
+    box_a, box_b, paid = _FakeBackend("box-a"), _FakeBackend("box-b"), _FakeBackend("paid")
+    router = _router(
+        (box_a, {"max_in_flight": 2}),
+        (box_b, {"max_in_flight": 2, "weight": 2}),
+        (paid, {"max_in_flight": 0, "overflow": True}),
+    )
+
+    async def _burst(size: int) -> list[str]:
+        return await asyncio.gather(*(router.aforward(prompt="hi") for _ in range(size)))
+
+    assert sorted(asyncio.run(_burst(3))) == ["box-a", "box-b", "box-b"]  # box-b has twice the weight
+    assert asyncio.run(_burst(7)).count("paid") == 3  # only what the four local slots cannot hold
+    assert router.stats()["backends"]["paid"]["outstanding"] == 0
+
+
+def test_failing_backend_is_ejected_and_calls_fail_over():
+    broken, healthy = _FakeBackend("broken", fail=True), _FakeBackend("healthy")
+    router = _router((broken, {}), (healthy, {}), eject_after_failures=2, eject_seconds=60)
+
+    async def _run() -> list[str]:
+        return [await router.aforward(prompt="hi") for _ in range(6)]
+
+    assert asyncio.run(_run()) == ["healthy"] * 6
+    assert broken.calls == 2  # ejected after two straight failures, not tried again within eject_seconds
+    assert router.stats()["backends"]["broken"]["ejected"] is True
+
+
+def test_all_backends_failing_raises():
+    router = _router((_FakeBackend("a", fail=True), {}), (_FakeBackend("b", fail=True), {}))
+
+    with pytest.raises(BackendUnavailable, match="All 2 LM backends failed"):
+        asyncio.run(router.aforward(prompt="hi"))
+
+
+def test_backend_pool_is_read_from_the_environment(monkeypatch):
+    monkeypatch.setenv("DSPY_PROVIDER", "local")
+    monkeypatch.setenv("DSPY_MODEL_NAME", "nemotron.gguf")
+    monkeypatch.setenv("OPENROUTER_API_KEY", "sk-test")
+    monkeypatch.setenv(
+        "DSPY_BACKENDS",
+        json.dumps(
+            [
+                {"api_base": "http://box-a:8080/v1", "name": "box-a"},
+                {"api_base": "http://box-b:8080/v1", "weight": 2, "max_in_flight": 8},
+                {"provider": "openrouter"},
+            ]
+        ),
+    )
+    monkeypatch.setenv("DSPY_ROUTER_STRATEGY", "ewma")
+
+    cfg = load_llm_config()
+
+    assert (cfg.model, cfg.api_base, cfg.router.strategy) == ("openai/nemotron.gguf", "http://box-a:8080/v1", "ewma")
+    assert [(b.name, b.weight, b.max_in_flight, b.overflow) for b in cfg.backends] == [
+        ("box-a", 1.0, 4, False),
+        ("local-1", 2.0, 8, False),
+        ("openrouter-2", 1.0, 0, True),
+    ]
+    assert cfg.backends[2].lm.model.startswith("openrouter/")
@@ -0,0 +1,44 @@
+"""Tests for batch fan-out in the serving layer."""
+
+from __future__ import annotations
+
+import asyncio
+
+from src.common.types import ClassificationType
+from src.serving.service import ComplaintRequest, ComplaintResponse, classify_batch
+
+
+def test_classify_batch_keeps_order_reports_errors_and_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def _predictor(request: ComplaintRequest) -> ComplaintResponse:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            # Later items finish first so ordering cannot come from completion order.
+            await asyncio.sleep(0.01 * (10 - int(request.complaint)))
+            if request.complaint == "3":
+                raise RuntimeError("upstream timeout")
+            return ComplaintResponse(
+                classification=f"label-{request.complaint}",
+                justification="ok",
+                classification_type=ClassificationType.AE_PC,
+            )
+        finally:
+            in_flight -= 1
+
+    requests = [ComplaintRequest(complaint=str(i)) for i in range(10)]
+    response = asyncio.run(classify_batch(_predictor, requests, ClassificationType.AE_PC, max_concurrency=3))
+
+    assert [result.index for result in response.results] == list(range(10))
+    assert [result.classification for result in response.results if result.ok] == [
+        f"label-{i}" for i in range(10) if i != 3
+    ]
+    failed = response.results[3]
+    assert not failed.ok
+    assert failed.error == "RuntimeError: upstream timeout"
+    assert failed.classification == ""
+    assert (response.succeeded, response.failed) == (9, 1)
+    assert peak == 3
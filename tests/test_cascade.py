@@ -0,0 +1,68 @@
+"""Tests for the n-gram first stage of the classifier cascade."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+
+import dspy
+import numpy as np
+
+from src.common.cascade import NgramClassifier, calibrate_threshold, train_first_stage
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.metrics import MetricsRegistry
+from src.serving.service import ComplaintRequest
+
+_LABELS = ["Adverse Event", "Product Complaint"]
+_TEXTS = [
+    *(f"After my {n} dose I had nausea and dizziness for days" for n in ("first", "second", "third", "fourth")),
+    *(f"Patient reported vomiting and a rash after the {n} injection" for n in ("first", "second", "third")),
+    *(f"The pen arrived cracked and the cartridge was leaking, box {n}" for n in ("one", "two", "three", "four")),
+    *(f"Needle would not attach, the dial is broken on pen {n}" for n in ("one", "two", "three")),
+]
+_TARGETS = ["Adverse Event"] * 7 + ["Product Complaint"] * 7
+
+
+def test_threshold_is_the_lowest_confidence_that_keeps_the_target_accuracy():
+    confidences = np.array([0.99, 0.95, 0.9, 0.8, 0.7, 0.6])
+    correct = np.array([1, 1, 1, 0, 1, 0])
+
+    assert calibrate_threshold(confidences, correct, target=1.0) == 0.9
+    assert calibrate_threshold(confidences, correct, target=0.8) == 0.7
+    assert calibrate_threshold(confidences, np.zeros(6), target=0.5) == math.inf
+
+
+def test_first_stage_learns_the_obvious_cases():
+    model = train_first_stage(_TEXTS, _TARGETS, _LABELS, folds=2)
+    probabilities = model.predict_proba(["My pen was cracked and leaking", "I had nausea after the dose"])
+
+    assert [model.labels[best] for best in probabilities.argmax(axis=1)] == _LABELS[::-1]
+    assert model.with_threshold(0.5).answer("The cartridge was leaking from a cracked pen")[0] == "Product Complaint"
+    assert model.with_threshold(1.01).answer("The cartridge was leaking from a cracked pen") is None
+
+
+def test_confident_answers_skip_the_lm_and_the_rest_escalate(monkeypatch):
+    calls: list[str] = []
+
+    class _FakeClassifier:
+        async def acall(self, complaint: str) -> dspy.Prediction:
+            calls.append(complaint)
+            return dspy.Prediction(classification="Adverse Event", justification="from the LM")
+
+    monkeypatch.setattr(service, "_resolve_classifier", lambda *args, **kwargs: _FakeClassifier())
+    monkeypatch.setattr(service, "get_display_model_name", lambda: "mock-model")
+    model = NgramClassifier(_LABELS).fit(_TEXTS, _TARGETS).with_threshold(0.9)
+    registry = MetricsRegistry()
+    predict = service.get_async_classification_function(
+        ClassificationType.AE_PC, metrics_registry=registry, first_stage=model
+    )
+
+    confident = asyncio.run(predict(ComplaintRequest(complaint="The pen arrived cracked and was leaking.")))
+    escalated = asyncio.run(predict(ComplaintRequest(complaint="Something happened, please call me back.")))
+
+    assert confident.classification == "Product Complaint"
+    assert confident.justification.startswith("Answered by the first-stage n-gram model")
+    assert escalated.justification == "from the LM"
+    assert calls == ["Something happened, please call me back."]
+    assert registry.classifier(ClassificationType.AE_PC, "mock-model").first_stage_answers.value == 1
@@ -0,0 +1,120 @@
+"""Tests for the lazy classifier registry."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.common.classifier import ClassificationConfig
+from src.common.paths import get_classifier_artifact_path
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.cache import PredictionCache, prediction_cache_key
+from src.serving.registry import ArtifactEntry, ClassifierRegistry, UnknownClassificationType
+from src.serving.service import ComplaintResponse
+
+_TEMPLATE = json.loads(get_classifier_artifact_path(ClassificationType.AE_PC).read_text(encoding="utf-8"))
+
+
+def _write_artifact(directory: Path, classification_type: str, labels: list[str], padding: int = 0) -> Path:
+    artifact = json.loads(json.dumps(_TEMPLATE))
+    artifact["metadata"]["classification_type"] = classification_type
+    artifact["metadata"]["classification_config"] = {
+        "description": f"Classify {classification_type}.",
+        "labels": labels,
+    }
+    artifact["metadata"]["padding"] = "x" * padding
+    path = directory / f"{classification_type}.json"
+    path.write_text(json.dumps(artifact), encoding="utf-8")
+    return path
+
+
+def _registry(directory: Path, built: list[str], **kwargs) -> ClassifierRegistry[str]:
+    def _build(entry: ArtifactEntry) -> str:
+        built.append(entry.classification_type)
+        return f"{entry.classification_type}@{entry.fingerprint}"
+
+    return ClassifierRegistry(_build, artifacts_dir=directory, refresh_interval_seconds=0, **kwargs)
+
+
+def test_loads_on_first_use_and_shares_concurrent_loads(tmp_path):
+    for index in range(20):
+        _write_artifact(tmp_path, f"product-{index}", ["Defect", "Not a defect"])
+    (tmp_path / "notes.json").write_text('{"metadata": {}}', encoding="utf-8")
+    built: list[str] = []
+    registry = _registry(tmp_path, built)
+
+    async def _run() -> list[str]:
+        return await asyncio.gather(*(registry.get("product-7") for _ in range(5)))
+
+    results = asyncio.run(_run())
+
+    assert built == ["product-7"]  # nothing else is loaded, and five concurrent callers shared one load
+    assert len(set(results)) == 1
+    assert registry.stats()["indexed"] == 20
+    with pytest.raises(UnknownClassificationType):
+        asyncio.run(registry.get("notes"))
+
+
+def test_evicts_coldest_classifier_on_count_and_size_budget(tmp_path):
+    for name in ("a", "b", "c"):
+        _write_artifact(tmp_path, name, ["Yes", "No"])
+    _write_artifact(tmp_path, "huge", ["Yes", "No"], padding=50_000)
+    built: list[str] = []
+    registry = _registry(tmp_path, built, max_loaded=2, max_bytes=40_000)
+
+    async def _run() -> None:
+        await registry.get("a")
+        await registry.get("b")
+        await registry.get("a")  # "b" is now the coldest
+        await registry.get("c")
+        assert registry.stats()["resident"] == ["a", "c"]
+        await registry.get("huge")  # over the byte budget on its own: everything else goes
+        assert registry.stats()["resident"] == ["huge"]
+        await registry.get("b")
+
+    asyncio.run(_run())
+    assert built == ["a", "b", "c", "huge", "b"]
+    assert registry.evictions == 4
+
+
+def test_changed_artifact_is_reloaded_and_its_cache_entries_retired(tmp_path):
+    _write_artifact(tmp_path, "device", ["Defect", "Not a defect"])
+    cache: PredictionCache[ComplaintResponse] = PredictionCache()
+    built: list[str] = []
+    registry = _registry(tmp_path, built, prediction_cache=cache)
+
+    async def _run() -> tuple[str, str]:
+        first = await registry.get("device")
+        old_fingerprint = first.split("@")[1]
+        cache.put(
+            prediction_cache_key("pen cracked", "device", old_fingerprint, "m"),
+            ComplaintResponse(classification="Defect", justification="", classification_type="device"),
+        )
+        _write_artifact(tmp_path, "device", ["Defect", "Not a defect", "Unclear"])
+        return first, await registry.get("device")
+
+    first, second = asyncio.run(_run())
+
+    assert first != second
+    assert built == ["device", "device"]
+    assert len(cache) == 0
+
+
+def test_async_predictor_builds_signature_from_discovered_config(tmp_path, monkeypatch):
+    path = _write_artifact(tmp_path, "device", ["Defect", "Not a defect"])
+    config = ClassificationConfig(description="Classify device.", labels=["Defect", "Not a defect"])
+    loaded: list[object] = []
+
+    def _load(model_path, classification_type, config=None):
+        loaded.append((model_path, classification_type, config))
+        return object()
+
+    monkeypatch.setattr(service, "_load_classifier", _load)
+
+    service.get_async_classification_function("device", model_path=path, classification_config=config)
+
+    assert loaded == [(path, "device", config)]  # loaded straight from the artifact, bypassing the built-in cache
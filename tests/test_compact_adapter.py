@@ -0,0 +1,99 @@
+"""Tests for the compact adapter and its single-pass parser."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+import litellm
+import pytest
+from dspy.clients import lm as dspy_lm
+
+from src.common.classifier import ComplaintClassifier
+from src.common.compact import CompactChatAdapter
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.metrics import MetricsRegistry
+from src.serving.service import ComplaintRequest
+
+_SIGNATURE = ComplaintClassifier(ClassificationType.AE_PC).classify.predict.signature
+
+
+@pytest.mark.parametrize(
+    ("completion", "expected"),
+    [
+        (
+            "reasoning: Dizziness after the dose.\nclassification: adverse event\njustification: Dizziness.",
+            ("Adverse Event", "Dizziness."),
+        ),
+        (
+            "**Classification:** Product Complaint.\n**Justification:** The pen\narrived cracked.",
+            ("Product Complaint", "The pen\narrived cracked."),
+        ),
+        ("[[ ## classification ## ]]\nProduct Complaint\n\n[[ ## completed ## ]]", ("Product Complaint", "")),
+        ('```json\n{"classification": "Adverse Event", "justification": "Rash."}\n```', ("Adverse Event", "Rash.")),
+        ("This reads like a product complaint about the pen.", ("Product Complaint", "")),
+    ],
+)
+def test_parser_recovers_the_label_from_loosely_formatted_completions(completion, expected):
+    parsed = CompactChatAdapter().parse(_SIGNATURE, completion)
+
+    assert (parsed["classification"], parsed["justification"]) == expected
+
+
+def test_prompt_has_no_field_markers_and_is_shorter_than_chat_adapters():
+    demos = [
+        dspy.Example(
+            complaint="Felt dizzy after the dose.",
+            reasoning="Symptom after use.",
+            classification="Adverse Event",
+            justification="Dizziness.",
+        ).with_inputs("complaint")
+    ]
+    inputs = {"complaint": "The pen arrived cracked."}
+
+    compact = CompactChatAdapter().format(_SIGNATURE, demos, inputs)
+    chat = dspy.ChatAdapter().format(_SIGNATURE, demos, inputs)
+
+    assert [message["role"] for message in compact] == ["system", "user", "assistant", "user"]
+    assert all("[[ ##" not in message["content"] for message in compact)
+    assert compact[-1]["content"] == "complaint: The pen arrived cracked."
+    assert sum(len(m["content"]) for m in compact) < sum(len(m["content"]) for m in chat) / 2
+
+
+@pytest.mark.parametrize(("adapter", "calls", "fallbacks"), [(dspy.ChatAdapter(), 2, 1), (CompactChatAdapter(), 1, 0)])
+def test_only_the_chat_adapter_calls_the_lm_again_for_an_unformatted_answer(monkeypatch, adapter, calls, fallbacks):
+    requests: list[dict] = []
+
+    async def _completion(request, num_retries, cache=None):
+        requests.append(request)
+        content = (
+            "It is a product complaint."
+            if len(requests) == 1
+            else '{"reasoning": "", "classification": "Product Complaint", "justification": "Cracked pen."}'
+        )
+        return litellm.ModelResponse(
+            choices=[{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            usage={"prompt_tokens": 10, "completion_tokens": 5},
+        )
+
+    monkeypatch.setattr(dspy_lm, "alitellm_completion", _completion)
+    monkeypatch.setattr(
+        service, "_resolve_classifier", lambda *args, **kwargs: ComplaintClassifier(ClassificationType.AE_PC)
+    )
+    monkeypatch.setattr(service, "get_display_model_name", lambda: "mock-model")
+    registry = MetricsRegistry()
+    predict = service.get_async_classification_function(
+        ClassificationType.AE_PC, use_cache=False, metrics_registry=registry
+    )
+    lm = dspy.LM("openai/local-model", api_base="http://127.0.0.1:9/v1", api_key="dummy", cache=False)
+
+    async def _run():
+        with dspy.context(lm=lm, adapter=adapter):
+            return await predict(ComplaintRequest(complaint="The pen arrived cracked."))
+
+    response = asyncio.run(_run())
+
+    metrics = registry.classifier(ClassificationType.AE_PC, "mock-model")
+    assert response.classification == "Product Complaint"
+    assert (len(requests), metrics.adapter_fallbacks.value) == (calls, fallbacks)
@@ -0,0 +1,108 @@
+"""Tests for constrained label decoding."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import dspy
+import litellm
+import pytest
+from dspy.clients import lm as dspy_lm
+
+from src.common.classifier import ComplaintClassifier
+from src.common.constrained import (
+    ConstrainedChatAdapter,
+    ConstrainedJSONAdapter,
+    _LabelConstrainedAdapter,
+    label_grammar,
+    signature_labels,
+)
+from src.common.types import ClassificationType, InferenceProfile
+
+
+def _response(content: str) -> litellm.ModelResponse:
+    return litellm.ModelResponse(
+        choices=[{"message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        usage={"prompt_tokens": 10, "completion_tokens": 5},
+    )
+
+
+def _capture(monkeypatch, answer) -> list[dict]:
+    requests: list[dict] = []
+
+    async def _completion(request, num_retries, cache=None):
+        requests.append(request)
+        return answer(request)
+
+    monkeypatch.setattr(dspy_lm, "alitellm_completion", _completion)
+    return requests
+
+
+def _classify(classifier: dspy.Module, adapter: dspy.Adapter) -> dspy.Prediction:
+    lm = dspy.LM("openai/local-model", api_base="http://127.0.0.1:9/v1", api_key="dummy", cache=False)
+
+    async def _run() -> dspy.Prediction:
+        with dspy.context(lm=lm, adapter=adapter):
+            return await classifier.acall(complaint="The pen arrived cracked.")
+
+    return asyncio.run(_run())
+
+
+def test_grammar_follows_the_chat_format_and_only_allows_the_labels():
+    signature = ComplaintClassifier(ClassificationType.AE_PC).classify.predict.signature
+    labels = signature_labels(signature)
+
+    grammar = label_grammar(tuple(signature.output_fields), tuple(labels.items()))
+
+    assert labels == {"classification": ("Adverse Event", "Product Complaint")}
+    assert grammar.splitlines() == [
+        'root ::= "[[ ## reasoning ## ]]\\n" text "\\n\\n" "[[ ## classification ## ]]\\n" classification-label '
+        '"\\n\\n" "[[ ## justification ## ]]\\n" text "\\n\\n" "[[ ## completed ## ]]"',
+        'classification-label ::= "Adverse Event" | "Product Complaint"',
+        'text ::= ([^\\[] | "[" [^\\[])+',
+    ]
+
+
+def test_chat_adapter_sends_the_grammar_and_falls_back_when_the_backend_rejects_it(monkeypatch):
+    completion = "[[ ## classification ## ]]\nProduct Complaint\n\n[[ ## completed ## ]]"
+
+    def _answer(request):
+        if "grammar" in request.get("extra_body", {}):
+            raise litellm.BadRequestError("unknown field: grammar", model="local-model", llm_provider="openai")
+        return _response(completion)
+
+    requests = _capture(monkeypatch, _answer)
+    adapter = ConstrainedChatAdapter()
+    label_only = ComplaintClassifier(ClassificationType.AE_PC).for_profile(InferenceProfile.LABEL_ONLY)
+
+    first = _classify(label_only, adapter)
+    second = _classify(label_only, adapter)
+
+    assert first.classification == second.classification == "Product Complaint"
+    assert ["grammar" in request.get("extra_body", {}) for request in requests] == [True, False, False]
+    assert 'root ::= "[[ ## classification ## ]]\\n" classification-label' in requests[0]["extra_body"]["grammar"]
+
+
+def test_json_adapter_sends_the_label_enum_even_when_litellm_does_not_know_the_model(monkeypatch):
+    requests = _capture(
+        monkeypatch,
+        lambda request: _response(json.dumps({"classification": "Adverse Event", "justification": "Dizziness."})),
+    )
+    classifier = ComplaintClassifier(ClassificationType.AE_PC).for_profile(InferenceProfile.NO_REASONING)
+
+    prediction = _classify(classifier, ConstrainedJSONAdapter())
+
+    assert (prediction.classification, prediction.justification) == ("Adverse Event", "Dizziness.")
+    schema = requests[0]["response_format"]["json_schema"]["schema"]
+    assert schema["properties"]["classification"] == {"type": "string", "enum": ["Adverse Event", "Product Complaint"]}
+    assert schema["required"] == ["classification", "justification"]
+
+
+def test_constrained_adapter_without_a_constraint_fails_when_built():
+    class _Unconstrained(_LabelConstrainedAdapter, dspy.ChatAdapter):
+        pass
+
+    with pytest.raises(TypeError, match="_constraint_kwargs"):
+        _Unconstrained()
+    assert ConstrainedChatAdapter() and ConstrainedJSONAdapter()
@@ -14,6 +14,9 @@ EXPECTED_PATHS = {
     "/classify/ae-pc",
     "/classify/ae-category",
     "/classify/pc-category",
+    "/classify/ae-pc/batch",
+    "/classify/ae-category/batch",
+    "/classify/pc-category/batch",
 }
 EXPECTED_SERVER_URL = "http://localhost:5000"
 
@@ -0,0 +1,106 @@
+"""Tests for hedged LM calls."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+import pytest
+
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.hedging import RequestHedger
+from src.serving.metrics import MetricsRegistry
+from src.serving.service import ComplaintRequest
+
+
+async def _answer(value: str, delay: float = 0.0) -> str:
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _warm(hedger: RequestHedger, samples: int, delay: float = 0.0) -> None:
+    for _ in range(samples):
+        await hedger.run(lambda: _answer("warm", delay))
+
+
+def test_slow_call_is_hedged_and_first_answer_wins():
+    hedger = RequestHedger(percentile=90, max_extra_ratio=0.5, min_delay_ms=10, min_samples=5)
+    cancelled: list[str] = []
+
+    async def _stuck() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("primary")
+            raise
+        return "primary"
+
+    async def _run() -> str:
+        await _warm(hedger, 5)
+        assert hedger.delay_seconds() == pytest.approx(0.01)  # recent calls were instant: the floor applies
+        return await hedger.run(_stuck, lambda: _answer("backup"))
+
+    assert asyncio.run(_run()) == "backup"
+    assert cancelled == ["primary"]
+    assert (hedger.fired, hedger.won) == (1, 1)
+
+
+def test_hedges_stay_within_the_extra_call_budget():
+    hedger = RequestHedger(percentile=50, max_extra_ratio=0.1, min_delay_ms=1, window=20, min_samples=5)
+
+    async def _run() -> None:
+        await _warm(hedger, 5, delay=0.001)
+        await asyncio.gather(*(hedger.run(lambda: _answer("slow", 0.05)) for _ in range(50)))
+
+    asyncio.run(_run())
+
+    assert 0 < hedger.fired <= 0.1 * hedger.calls
+    assert hedger.skipped_budget == 50 - hedger.fired
+
+
+def test_failed_copy_does_not_win_and_double_failure_raises_primary_error():
+    hedger = RequestHedger(percentile=90, max_extra_ratio=1, min_delay_ms=5, min_samples=1)
+
+    async def _fail(message: str, delay: float) -> str:
+        await asyncio.sleep(delay)
+        raise RuntimeError(message)
+
+    async def _run() -> None:
+        await _warm(hedger, 1)
+        assert await hedger.run(lambda: _answer("primary", 0.05), lambda: _fail("backup", 0)) == "primary"
+        with pytest.raises(RuntimeError, match="primary"):
+            await hedger.run(lambda: _fail("primary", 0.05), lambda: _fail("backup", 0))
+
+    asyncio.run(_run())
+    assert hedger.won == 0
+
+
+def test_classifier_records_hedges_in_metrics(monkeypatch):
+    calls: list[str] = []
+
+    class _FirstCallSlowClassifier:
+        async def acall(self, complaint: str) -> dspy.Prediction:
+            calls.append(complaint)
+            if complaint == "slow" and calls.count("slow") == 1:
+                await asyncio.sleep(10)
+            return dspy.Prediction(classification="Product Complaint", justification=complaint)
+
+    monkeypatch.setattr(service, "_resolve_classifier", lambda *args, **kwargs: _FirstCallSlowClassifier())
+    hedger = RequestHedger(percentile=90, max_extra_ratio=1, min_delay_ms=10, min_samples=3)
+    registry = MetricsRegistry()
+    predict = service.get_async_classification_function(
+        ClassificationType.AE_PC, metrics_registry=registry, hedger=hedger
+    )
+
+    async def _run() -> None:
+        for index in range(3):
+            await predict(ComplaintRequest(complaint=f"fast {index}"))
+        await predict(ComplaintRequest(complaint="slow"))
+
+    asyncio.run(_run())
+
+    assert calls.count("slow") == 2
+    rendered = registry.render()
+    assert 'dspy_classifier_hedges_fired_total{classification_type="ae-pc",model="unknown"} 1' in rendered
+    assert 'dspy_classifier_hedges_won_total{classification_type="ae-pc",model="unknown"} 1' in rendered
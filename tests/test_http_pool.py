@@ -0,0 +1,38 @@
+"""Tests for the process-wide pooled HTTP client used by LM calls."""
+
+from __future__ import annotations
+
+import litellm
+from litellm.llms.custom_httpx import http_handler
+
+from src.common.config import HTTPClientConfig, configure_http_clients, load_llm_config
+
+
+def test_pool_settings_are_read_from_the_environment(monkeypatch):
+    monkeypatch.setenv("DSPY_PROVIDER", "local")
+    monkeypatch.setenv("DSPY_HTTP_MAX_CONNECTIONS", "8")
+    monkeypatch.setenv("DSPY_HTTP_KEEPALIVE_EXPIRY_SECONDS", "5")
+    monkeypatch.setenv("DSPY_HTTP_CONNECT_TIMEOUT_SECONDS", "2")
+
+    http = load_llm_config().http
+
+    assert (http.max_connections, http.keepalive_expiry_seconds, http.connect_timeout_seconds) == (8, 5.0, 2.0)
+    assert http.read_timeout_seconds == HTTPClientConfig().read_timeout_seconds
+
+
+def test_first_configuration_installs_one_shared_pool(monkeypatch):
+    monkeypatch.setattr(litellm, "aclient_session", None)
+    monkeypatch.setattr(litellm, "client_session", None)
+    for name in ("AIOHTTP_CONNECTOR_LIMIT", "AIOHTTP_CONNECTOR_LIMIT_PER_HOST", "AIOHTTP_KEEPALIVE_TIMEOUT"):
+        monkeypatch.setattr(http_handler, name, getattr(http_handler, name))
+
+    configure_http_clients(HTTPClientConfig(max_connections=8, max_keepalive_connections=4, keepalive_expiry_seconds=5))
+    installed = litellm.aclient_session
+    configure_http_clients(HTTPClientConfig(max_connections=1))
+
+    assert litellm.aclient_session is installed  # a second classifier reuses the pool instead of replacing it
+    pool = installed._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry) == (8, 4, 5)
+    assert litellm.client_session._transport._pool._max_connections == 8
+    assert (http_handler.AIOHTTP_CONNECTOR_LIMIT_PER_HOST, http_handler.AIOHTTP_KEEPALIVE_TIMEOUT) == (8, 5)
+    litellm.client_session.close()
@@ -0,0 +1,32 @@
+"""Import-time budget for the API module: serving must not pay for DSPy, LiteLLM or MLflow at import."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+IMPORT_BUDGET_SECONDS = 2.5
+HEAVY_MODULES = ("dspy", "litellm", "mlflow", "openai", "numpy")
+
+
+def test_api_imports_without_heavy_dependencies_within_budget():
+    script = f"import json, sys, src.api.app; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[-1].strip() == "src.api.app"
+    )
+    assert cumulative_us / 1e6 < IMPORT_BUDGET_SECONDS
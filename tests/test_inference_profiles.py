@@ -0,0 +1,88 @@
+"""Tests for serve-time inference profiles."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+
+from src.common.classifier import ComplaintClassifier, LeanComplaintClassifier
+from src.common.types import ClassificationType, InferenceProfile
+from src.serving import service
+from src.serving.cache import PredictionCache
+from src.serving.service import ComplaintRequest
+
+
+def _trained_classifier() -> ComplaintClassifier:
+    classifier = ComplaintClassifier(ClassificationType.AE_PC)
+    predict = classifier.classify.predict
+    predict.signature = predict.signature.with_instructions("Optimized instructions.")
+    predict.demos = [
+        dspy.Example(
+            complaint="The pen leaked.",
+            reasoning="Device problem.",
+            classification="Product Complaint",
+            justification="Leaking pen.",
+        )
+    ]
+    return classifier
+
+
+def test_lean_program_keeps_instructions_and_demos_without_dropped_fields():
+    classifier = _trained_classifier()
+
+    assert classifier.for_profile(InferenceProfile.FULL) is classifier
+    no_reasoning = classifier.for_profile("no-reasoning")
+    label_only = classifier.for_profile(InferenceProfile.LABEL_ONLY)
+
+    assert isinstance(label_only, LeanComplaintClassifier)
+    assert list(no_reasoning.classify.signature.output_fields) == ["classification", "justification"]
+    assert list(label_only.classify.signature.output_fields) == ["classification"]
+    assert label_only.classify.signature.instructions == "Optimized instructions."
+    assert dict(label_only.classify.demos[0]) == {"complaint": "The pen leaked.", "classification": "Product Complaint"}
+    assert "reasoning" in classifier.classify.predict.demos[0]  # the loaded program is left untouched
+
+
+def test_label_only_asks_for_the_label_and_returns_an_empty_justification():
+    lm = dspy.utils.DummyLM([{"classification": "Adverse Event"}])
+    label_only = _trained_classifier().for_profile(InferenceProfile.LABEL_ONLY)
+
+    with dspy.context(lm=lm):
+        prediction = label_only(complaint="I felt dizzy after the injection.")
+
+    assert (prediction.classification, prediction.justification) == ("Adverse Event", "")
+    prompt = lm.history[-1]["messages"][0]["content"]
+    assert "[[ ## classification ## ]]" in prompt
+    assert "[[ ## reasoning ## ]]" not in prompt and "[[ ## justification ## ]]" not in prompt
+
+
+def test_request_profile_overrides_the_default_and_is_cached_separately(monkeypatch):
+    served: list[InferenceProfile] = []
+
+    class _ProfiledClassifier:
+        def __init__(self, profile: InferenceProfile = InferenceProfile.FULL):
+            self.profile = profile
+
+        def for_profile(self, profile: InferenceProfile) -> _ProfiledClassifier:
+            return _ProfiledClassifier(InferenceProfile(profile))
+
+        async def acall(self, complaint: str) -> dspy.Prediction:
+            served.append(self.profile)
+            justification = "" if self.profile is InferenceProfile.LABEL_ONLY else "Leaking pen."
+            return dspy.Prediction(classification="Product Complaint", justification=justification)
+
+    monkeypatch.setattr(service, "_resolve_classifier", lambda *args, **kwargs: _ProfiledClassifier())
+    predict = service.get_async_classification_function(
+        ClassificationType.AE_PC, prediction_cache=PredictionCache(), default_profile=InferenceProfile.FULL
+    )
+
+    async def _run() -> list[str]:
+        return [
+            (await predict(ComplaintRequest(complaint="The pen leaked."))).justification,
+            (await predict(ComplaintRequest(complaint="The pen leaked.", profile="label-only"))).justification,
+            (await predict(ComplaintRequest(complaint="The pen leaked.", profile="label-only"))).justification,
+            (await predict(ComplaintRequest(complaint="The pen leaked."))).justification,
+        ]
+
+    assert asyncio.run(_run()) == ["Leaking pen.", "", "", "Leaking pen."]
+    assert served == [InferenceProfile.FULL, InferenceProfile.LABEL_ONLY]
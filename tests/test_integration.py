@@ -17,7 +17,12 @@ os.environ.setdefault("DSPY_CACHEDIR", str(DSPY_CACHE_DIR))
 # Imports must come after environment setup
 from src.api.app import app  # noqa: E402
 from src.common.config import configure_lm  # noqa: E402
-from src.serving.service import AEPCRequest, get_ae_pc_classifier  # noqa: E402
+from src.common.types import ClassificationType  # noqa: E402
+from src.serving.service import (  # noqa: E402
+    AEPCRequest,
+    get_ae_pc_classifier,
+    get_async_classification_function,
+)
 
 
 def _ensure_predictor():
@@ -56,9 +61,9 @@ def test_predictor_classifies_complaint():
 
 @pytest.mark.integration
 def test_fastapi_endpoint_uses_loaded_predictor():
-    predictor = _ensure_predictor()
-    # Mock the loaded predictor in the app state
-    app.state.ae_pc_predictor = predictor
+    _ensure_predictor()
+    # Mock the loaded predictor in the app state (routes await an async predictor)
+    app.state.ae_pc_predictor = get_async_classification_function(ClassificationType.AE_PC)
     # Ensure errors dict exists
     app.state.errors = {}
 
@@ -0,0 +1,135 @@
+"""Tests for logprob label scoring."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+
+import dspy
+import litellm
+import pytest
+from dspy.clients import lm as dspy_lm
+
+from src.common.classifier import ComplaintClassifier
+from src.common.label_scoring import (
+    LabelScorer,
+    apply_temperature,
+    expected_calibration_error,
+    label_calibration_metadata,
+    label_probabilities,
+)
+from src.common.types import ClassificationType, InferenceProfile
+from src.serving import service
+
+_HEADER = [("[[", 0.0, []), (" ## classification ## ]]", 0.0, []), ("\n", 0.0, [])]
+
+
+def test_alternative_first_tokens_score_the_other_labels():
+    steps = [
+        *_HEADER,
+        ("Ad", math.log(0.6), [("Ad", math.log(0.6)), ("Product", math.log(0.3)), ("The", math.log(0.1))]),
+        ("verse", 0.0, []),
+        (" Event", 0.0, []),
+    ]
+
+    probabilities = label_probabilities(steps, ["Adverse Event", "Product Complaint"])
+
+    assert probabilities == pytest.approx({"Adverse Event": 2 / 3, "Product Complaint": 1 / 3})
+
+
+def test_labels_sharing_a_prefix_are_told_apart_by_the_token_after_it():
+    labels = ["Gastrointestinal disorders", "Gastrointestinal disorders (Gastroparesis)", "Pancreatitis"]
+    steps = [
+        *_HEADER,
+        ("Gastro", math.log(0.9), [("Pan", math.log(0.1))]),
+        ("intestinal disorders", 0.0, []),
+        (" (", math.log(0.25), [("\n\n", math.log(0.75))]),
+        ("Gastroparesis)", 0.0, []),
+    ]
+
+    probabilities = label_probabilities(steps, labels)
+
+    assert probabilities == pytest.approx({labels[0]: 0.9 * 0.75, labels[1]: 0.9 * 0.25, "Pancreatitis": 0.1})
+
+
+def test_scorer_asks_for_logprobs_on_the_label_only_prompt(monkeypatch):
+    requests: list[dict] = []
+
+    async def _completion(request, num_retries, cache=None):
+        requests.append(request)
+        tokens = [("[[ ## classification ## ]]", 0.0, []), ("\n", 0.0, []), ("Product", math.log(0.9), ["Ad"])]
+        content = [
+            {
+                "token": token,
+                "logprob": logprob,
+                "top_logprobs": [{"token": token, "logprob": logprob}]
+                + [{"token": other, "logprob": math.log(0.05)} for other in others],
+            }
+            for token, logprob, others in tokens
+        ]
+        return litellm.ModelResponse(
+            choices=[
+                {
+                    "message": {"role": "assistant", "content": "[[ ## classification ## ]]\nProduct Complaint"},
+                    "logprobs": {"content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            usage={"prompt_tokens": 100, "completion_tokens": 8},
+        )
+
+    monkeypatch.setattr(dspy_lm, "alitellm_completion", _completion)
+    scorer = ComplaintClassifier(ClassificationType.AE_PC).for_profile(InferenceProfile.LOGPROB)
+    lm = dspy.LM("openai/local-model", api_base="http://127.0.0.1:9/v1", api_key="dummy", cache=False)
+
+    async def _run() -> dspy.Prediction:
+        with dspy.context(lm=lm):
+            return await scorer.acall(complaint="The pen arrived cracked.")
+
+    prediction = asyncio.run(_run())
+
+    assert isinstance(scorer, LabelScorer)
+    assert prediction.classification == "Product Complaint"
+    assert prediction.probabilities == pytest.approx({"Adverse Event": 0.05 / 0.95, "Product Complaint": 0.9 / 0.95})
+    assert prediction.justification == "Label probabilities: Product Complaint 0.947, Adverse Event 0.053"
+    assert (requests[0]["logprobs"], requests[0]["top_logprobs"]) == (True, 20)
+    system = requests[0]["messages"][0]["content"]
+    assert "[[ ## classification ## ]]" in system and "[[ ## reasoning ## ]]" not in system
+
+
+def test_temperature_fitted_on_overconfident_scores_flattens_them_without_reordering():
+    # the top label gets 0.99 but is right only 7 times in 10
+    scores = [{"Adverse Event": 0.99, "Product Complaint": 0.01}] * 10
+    truths = ["Adverse Event"] * 7 + ["Product Complaint"] * 3
+
+    metadata = label_calibration_metadata(scores, truths)
+    scaled = apply_temperature(scores[0], metadata["label_temperature"])
+
+    assert metadata["label_temperature"] > 1
+    assert scaled["Adverse Event"] == pytest.approx(0.7, abs=0.01)
+    calibration = metadata["label_calibration"]
+    assert calibration["nll_after"] < calibration["nll_before"]
+    assert calibration["ece_before"] == pytest.approx(0.29)
+    assert calibration["ece_after"] < 0.01
+    assert expected_calibration_error([scaled] * 10, truths) == pytest.approx(calibration["ece_after"], abs=1e-4)
+    assert apply_temperature(scores[0], 1.0) == scores[0]
+
+
+def test_scorer_applies_the_artifact_temperature(tmp_path):
+    artifact = tmp_path / "ae-pc.json"
+    ComplaintClassifier(ClassificationType.AE_PC).save(str(artifact))
+    saved = json.loads(artifact.read_text())
+    saved["metadata"]["label_temperature"] = 2.0
+    artifact.write_text(json.dumps(saved))
+    steps = [*_HEADER, ("Product", math.log(0.9), [("Ad", math.log(0.1))]), (" Complaint", 0.0, [])]
+    content = [
+        {"token": token, "logprob": logprob, "top_logprobs": [{"token": t, "logprob": lp} for t, lp in alternatives]}
+        for token, logprob, alternatives in steps
+    ]
+
+    scorer = service._load_classifier(artifact, ClassificationType.AE_PC).for_profile(InferenceProfile.LOGPROB)
+    prediction = scorer._prediction({"text": "", "logprobs": {"content": content}})
+
+    assert scorer.temperature == 2.0
+    assert prediction.probabilities == pytest.approx({"Adverse Event": 1 / 4, "Product Complaint": 3 / 4})
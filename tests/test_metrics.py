@@ -0,0 +1,116 @@
+"""Tests for the serving metrics and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import dspy
+import pytest
+from dspy.utils.exceptions import AdapterParseError
+from dspy.utils.usage_tracker import track_usage
+from fastapi.testclient import TestClient
+
+from src.api.app import app
+from src.common.classifier import create_classification_signature
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.cache import PredictionCache
+from src.serving.metrics import Counter, MetricsRegistry
+from src.serving.service import ComplaintRequest, ComplaintResponse
+
+
+def test_sharded_counter_sums_increments_from_every_thread():
+    counter = Counter()
+
+    def _work() -> None:
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=_work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value == 8000
+
+
+def _fake_classifier(monkeypatch, fail_parse: bool = False) -> None:
+    class _FakeClassifier:
+        async def acall(self, complaint: str) -> dspy.Prediction:
+            await asyncio.sleep(0.01)
+            dspy.settings.usage_tracker.add_usage("mock-model", {"prompt_tokens": 100, "completion_tokens": 20})
+            if fail_parse:
+                raise AdapterParseError("ChatAdapter", create_classification_signature(), "garbled")
+            return dspy.Prediction(classification="Product Complaint", justification="cracked pen")
+
+    monkeypatch.setattr(service, "_resolve_classifier", lambda *args, **kwargs: _FakeClassifier())
+    monkeypatch.setattr(service, "get_display_model_name", lambda: "mock-model")
+
+
+def test_predictor_records_requests_latency_tokens_and_cache_hits(monkeypatch):
+    _fake_classifier(monkeypatch)
+    registry = MetricsRegistry()
+    predict = service.get_async_classification_function(
+        ClassificationType.AE_PC, prediction_cache=PredictionCache(), metrics_registry=registry
+    )
+
+    async def _run() -> dict:
+        with track_usage() as outer:
+            await predict(ComplaintRequest(complaint="Pen arrived cracked."))
+        await predict(ComplaintRequest(complaint="Pen arrived cracked."))
+        return outer.get_total_tokens()
+
+    outer_totals = asyncio.run(_run())
+
+    metrics = registry.classifier(ClassificationType.AE_PC, "mock-model")
+    assert metrics.requests.value == 2
+    assert metrics.cache_hits.value == 1
+    assert (metrics.prompt_tokens.value, metrics.completion_tokens.value) == (100, 20)
+    assert outer_totals["mock-model"]["prompt_tokens"] == 100  # enclosing trackers still see the usage
+    assert metrics.lm_seconds.count == 1
+    assert metrics.overhead_seconds.count == 1
+    assert metrics.request_seconds.count == 2
+    assert metrics.in_flight.value == 0 and metrics.lm_in_flight.value == 0
+
+
+def test_predictor_counts_parse_failures(monkeypatch):
+    _fake_classifier(monkeypatch, fail_parse=True)
+    registry = MetricsRegistry()
+    predict = service.get_async_classification_function(ClassificationType.AE_PC, metrics_registry=registry)
+
+    with pytest.raises(AdapterParseError):
+        asyncio.run(predict(ComplaintRequest(complaint="Pen arrived cracked.")))
+
+    metrics = registry.classifier(ClassificationType.AE_PC, "mock-model")
+    assert (metrics.parse_failures.value, metrics.errors.value) == (1, 1)
+
+
+def test_metrics_endpoint_renders_prometheus_text(monkeypatch):
+    registry = MetricsRegistry()
+    metrics = registry.classifier(ClassificationType.PC_CATEGORY, "mock-model")
+    metrics.requests.inc(3)
+    metrics.lm_seconds.observe(0.2)
+    monkeypatch.setattr(app.state, "metrics", registry, raising=False)
+
+    resp = TestClient(app).get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    labels = 'classification_type="pc-category",model="mock-model"'
+    assert f"dspy_classifier_requests_total{{{labels}}} 3" in resp.text
+    assert f'dspy_classifier_lm_latency_seconds_bucket{{{labels},le="0.25"}} 1' in resp.text
+    assert f"dspy_classifier_lm_latency_seconds_count{{{labels}}} 1" in resp.text
+    assert "# TYPE dspy_classifier_in_flight gauge" in resp.text
+
+
+def test_response_model_unchanged_by_metrics(monkeypatch):
+    _fake_classifier(monkeypatch)
+    predict = service.get_async_classification_function(ClassificationType.AE_PC, metrics_registry=MetricsRegistry())
+
+    response = asyncio.run(predict(ComplaintRequest(complaint="Pen arrived cracked.")))
+
+    assert response == ComplaintResponse(
+        classification="Product Complaint", justification="cracked pen", classification_type="ae-pc"
+    )
@@ -0,0 +1,74 @@
+"""Tests for the micro-batching scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+
+import pytest
+
+from src.serving.batching import MicroBatcher
+from src.serving.metrics import Histogram
+
+
+def test_histogram_reports_cumulative_buckets():
+    histogram = Histogram((1, 4))
+    for value in (0, 1, 3, 9):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {"count": 4, "sum": 13.0, "buckets": {"1": 2, "4": 3, "+Inf": 4}}
+
+
+def test_full_batch_dispatches_without_waiting_for_window():
+    batcher: MicroBatcher[int] = MicroBatcher(max_wait_ms=10_000, max_batch_size=3)
+    started: list[int] = []
+
+    async def _call(value: int) -> int:
+        started.append(value)
+        return value * 10
+
+    async def _run() -> list[int]:
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(lambda v=v: _call(v)) for v in range(3))), 1)
+
+    assert asyncio.run(_run()) == [0, 10, 20]
+    assert sorted(started) == [0, 1, 2]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["batch_size"]["count"] == 1 and stats["batch_size"]["sum"] == 3
+    assert stats["queue_depth"]["sum"] == 0 + 1 + 2
+
+
+def test_window_flushes_partial_batch_and_splits_overflow():
+    batcher: MicroBatcher[int] = MicroBatcher(max_wait_ms=20, max_batch_size=4)
+
+    async def _call(value: int) -> int:
+        return value
+
+    async def _run() -> list[int]:
+        return await asyncio.gather(*(batcher.submit(lambda v=v: _call(v)) for v in range(6)))
+
+    assert asyncio.run(_run()) == list(range(6))
+    assert batcher.batches == 2
+    assert batcher.batch_size.sum == 6  # one full batch of 4, then the remaining 2 after the window
+
+
+def test_errors_and_context_reach_the_submitter():
+    batcher: MicroBatcher[str] = MicroBatcher(max_wait_ms=1, max_batch_size=4)
+    request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+
+    async def _echo() -> str:
+        return request_id.get()
+
+    async def _fail() -> str:
+        raise RuntimeError("backend down")
+
+    async def _submit(value: str) -> str:
+        request_id.set(value)
+        return await batcher.submit(_echo)
+
+    async def _run() -> list[str]:
+        return await asyncio.gather(_submit("a"), _submit("b"))
+
+    assert asyncio.run(_run()) == ["a", "b"]
+    with pytest.raises(RuntimeError, match="backend down"):
+        asyncio.run(batcher.submit(_fail))
@@ -0,0 +1,89 @@
+"""Tests for the MinHash/LSH near-duplicate lookup in front of the prediction cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.cache import PredictionCache
+from src.serving.metrics import MetricsRegistry
+from src.serving.near_duplicates import NearDuplicateIndex, jaccard, shingles
+from src.serving.service import ComplaintRequest, ComplaintResponse
+
+_COMPLAINT = (
+    "I picked up my Ozempic pen from the pharmacy on Monday and when I went to use it the dial would not turn past "
+    "the first click, the needle attached fine but no medication came out and I had to skip my weekly dose."
+)
+_RETRANSCRIBED = (
+    "Um, I picked up my Ozempic pen from the pharmacy on Monday and, uh, when I went to use it the dial would not "
+    "turn past the first click... the needle attached fine but, you know, no medication came out and I had to skip my "
+    "weekly dose."
+)
+_OTHER = (
+    "My patient started Ozempic three weeks ago and developed severe nausea and vomiting after the second dose, she "
+    "could not keep water down and needed IV fluids in the emergency room."
+)
+
+
+def test_filler_words_and_punctuation_do_not_change_the_shingles():
+    assert jaccard(shingles(_COMPLAINT), shingles(_RETRANSCRIBED)) == 1.0
+    assert jaccard(shingles(_COMPLAINT), shingles(_OTHER)) < 0.1
+
+
+def test_words_that_carry_meaning_are_not_dropped_as_fillers():
+    written = "The pen arrived like new but I know the dial was cracked so I want to return it."
+    stripped = "The pen arrived new but the dial was cracked want to return it."
+
+    assert shingles(written) != shingles(stripped)
+    assert jaccard(shingles(written), shingles(stripped)) < 0.5
+    index = NearDuplicateIndex(0.8)
+    index.add("ae-pc", written, "pen")
+    assert index.find("ae-pc", stripped) is None
+
+
+def test_index_finds_near_duplicates_within_a_scope_and_stays_bounded():
+    index = NearDuplicateIndex(0.8, max_entries=2)
+    index.add("ae-pc", _COMPLAINT, "pen")
+    index.add("ae-pc", _OTHER, "nausea")
+
+    assert index.find("ae-pc", _RETRANSCRIBED) == "pen"
+    assert index.find("ae-pc", _COMPLAINT.replace("Monday", "Tuesday")) == "pen"
+    assert index.find("ae-pc", "The box was damaged in shipping and the pen inside was cracked.") is None
+    assert index.find("pc-category", _RETRANSCRIBED) is None
+
+    index.add("ae-pc", "The box was damaged in shipping and the pen inside was cracked.", "box")
+    assert len(index) == 2
+    assert index.find("ae-pc", _OTHER) is None  # least recently used
+    assert index.stats()["evictions"] == 1
+
+
+def test_near_duplicate_is_answered_from_the_cached_prediction(monkeypatch):
+    calls: list[str] = []
+
+    class _FakeClassifier:
+        async def acall(self, complaint: str) -> dspy.Prediction:
+            calls.append(complaint)
+            return dspy.Prediction(classification="Product Complaint", justification="from the LM")
+
+    monkeypatch.setattr(service, "_resolve_classifier", lambda *args, **kwargs: _FakeClassifier())
+    monkeypatch.setattr(service, "get_display_model_name", lambda: "mock-model")
+    monkeypatch.setattr(service, "artifact_fingerprint", lambda path: "fingerprint")
+    cache = PredictionCache[ComplaintResponse](16, 60)
+    registry = MetricsRegistry()
+    predict = service.get_async_classification_function(
+        ClassificationType.AE_PC,
+        prediction_cache=cache,
+        metrics_registry=registry,
+        near_duplicates=NearDuplicateIndex(0.9),
+    )
+
+    first = asyncio.run(predict(ComplaintRequest(complaint=_COMPLAINT)))
+    again = asyncio.run(predict(ComplaintRequest(complaint=_RETRANSCRIBED)))
+    asyncio.run(predict(ComplaintRequest(complaint=_OTHER)))
+
+    assert again == first
+    assert calls == [_COMPLAINT, _OTHER]
+    assert registry.classifier(ClassificationType.AE_PC, "mock-model").near_duplicate_hits.value == 1
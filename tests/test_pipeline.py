@@ -0,0 +1,80 @@
+"""Tests for the server-side two-stage pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import dspy
+
+from src.common.types import ClassificationType
+from src.serving.pipeline import run_pipeline
+from src.serving.service import ComplaintRequest, ComplaintResponse
+
+
+def _predictor(classification_type: ClassificationType, label: str, delay: float, tokens: int, calls: list):
+    async def _apredict(request: ComplaintRequest) -> ComplaintResponse:
+        calls.append(classification_type)
+        await asyncio.sleep(delay)
+        # Mirror what dspy.LM does after a completed call so the pipeline's usage tracker sees it.
+        dspy.settings.usage_tracker.add_usage(
+            "mock", {"prompt_tokens": tokens, "completion_tokens": tokens, "total_tokens": 2 * tokens}
+        )
+        return ComplaintResponse(classification=label, justification="", classification_type=classification_type)
+
+    return _apredict
+
+
+def _predictors(router_label: str, calls: list, stage2_delay: float = 0.05):
+    return (
+        _predictor(ClassificationType.AE_PC, router_label, 0.2, 10, calls),
+        _predictor(ClassificationType.AE_CATEGORY, "Hypersensitivity", stage2_delay, 20, calls),
+        _predictor(ClassificationType.PC_CATEGORY, "Device malfunction", stage2_delay, 30, calls),
+    )
+
+
+def test_sequential_pipeline_routes_to_matching_branch():
+    calls: list = []
+    request = ComplaintRequest(complaint="Throat swelling after injection.")
+
+    response = asyncio.run(run_pipeline(*_predictors("Adverse Event", calls), request))
+
+    assert calls == [ClassificationType.AE_PC, ClassificationType.AE_CATEGORY]
+    assert response.category.classification == "Hypersensitivity"
+    assert response.tokens.total_tokens == 20 + 40
+    assert response.speculative_overhead_tokens.total_tokens == 0
+    assert response.discarded_branch is None
+
+
+def test_speculative_pipeline_overlaps_stages_and_reports_discarded_tokens():
+    calls: list = []
+    request = ComplaintRequest(complaint="Pen arrived cracked.")
+
+    started = time.perf_counter()
+    response = asyncio.run(
+        run_pipeline(*_predictors("Product Complaint", calls, stage2_delay=0.15), request, speculative=True)
+    )
+    elapsed = time.perf_counter() - started
+
+    assert set(calls) == set(ClassificationType)
+    assert response.category.classification == "Device malfunction"
+    assert response.tokens.total_tokens == 20 + 60
+    # The AE branch finished before the router, so its tokens are pure overhead.
+    assert response.discarded_branch == ClassificationType.AE_CATEGORY
+    assert not response.discarded_branch_cancelled
+    assert response.speculative_overhead_tokens.total_tokens == 40
+    # Sequential would take router + stage 2 (0.35s); speculation hides stage 2 behind the router.
+    assert elapsed < 0.3
+
+
+def test_speculative_pipeline_cancels_slow_losing_branch():
+    calls: list = []
+    request = ComplaintRequest(complaint="Pen arrived cracked.")
+
+    response = asyncio.run(
+        run_pipeline(*_predictors("Product Complaint", calls, stage2_delay=0.5), request, speculative=True)
+    )
+
+    assert response.discarded_branch_cancelled
+    assert response.speculative_overhead_tokens.total_tokens == 0
+    assert response.tokens.total_tokens == 20 + 60
@@ -0,0 +1,77 @@
+"""Tests for the in-process prediction cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.cache import PredictionCache, normalize_complaint, prediction_cache_key
+from src.serving.service import ComplaintRequest, ComplaintResponse
+
+
+def _response(label: str) -> ComplaintResponse:
+    return ComplaintResponse(classification=label, justification="", classification_type="ae-pc")
+
+
+def test_key_normalizes_whitespace_and_case_but_not_artifact_or_model():
+    base = prediction_cache_key("Pen arrived  CRACKED.\n", "ae-pc", "abc", "model-a")
+
+    assert normalize_complaint("  Pen arrived\tCRACKED. ") == "pen arrived cracked."
+    assert prediction_cache_key("pen arrived cracked.", "ae-pc", "abc", "model-a") == base
+    assert prediction_cache_key("pen arrived cracked.", "ae-pc", "def", "model-a") != base
+    assert prediction_cache_key("pen arrived cracked.", "ae-pc", "abc", "model-b") != base
+    assert prediction_cache_key("pen arrived cracked.", "pc-category", "abc", "model-a") != base
+
+
+def test_lru_eviction_and_counters():
+    cache: PredictionCache[ComplaintResponse] = PredictionCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", _response("A"))
+    cache.put("b", _response("B"))
+    assert cache.get("a").classification == "A"  # "a" becomes most recently used
+    cache.put("c", _response("C"))  # evicts "b"
+
+    assert cache.get("b") is None
+    assert cache.get("c").classification == "C"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 1, 1, 2)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.serving.cache.time.monotonic", lambda: now[0])
+    cache: PredictionCache[ComplaintResponse] = PredictionCache(max_entries=10, ttl_seconds=60)
+    cache.put("a", _response("A"))
+
+    now[0] += 59
+    assert cache.get("a") is not None
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_async_predictor_serves_resubmissions_from_cache(monkeypatch):
+    calls: list[str] = []
+
+    class _FakeClassifier:
+        async def acall(self, complaint: str) -> dspy.Prediction:
+            calls.append(complaint)
+            return dspy.Prediction(classification="Product Complaint", justification="cracked pen")
+
+    monkeypatch.setattr(service, "_resolve_classifier", lambda *args, **kwargs: _FakeClassifier())
+    cache: PredictionCache[ComplaintResponse] = PredictionCache()
+    predict = service.get_async_classification_function(ClassificationType.AE_PC, prediction_cache=cache)
+
+    async def _run() -> list[ComplaintResponse]:
+        return [
+            await predict(ComplaintRequest(complaint="My pen arrived cracked.")),
+            await predict(ComplaintRequest(complaint="  my PEN arrived   cracked. ")),
+        ]
+
+    first, second = asyncio.run(_run())
+
+    assert calls == ["My pen arrived cracked."]
+    assert first == second
+    assert cache.stats()["hits"] == 1
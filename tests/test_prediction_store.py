@@ -0,0 +1,150 @@
+"""Tests for the persistent cross-worker prediction store."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from src.serving.cache import PredictionCache
+from src.serving.service import ComplaintResponse
+from src.serving.store import _DELETE_KEY_RANGE, PersistentPredictionStore, _prefix_range
+
+
+def _response(label: str) -> ComplaintResponse:
+    return ComplaintResponse(classification=label, justification="", classification_type="ae-pc")
+
+
+def test_writes_are_visible_to_another_worker_after_flush(tmp_path):
+    path = tmp_path / "store.sqlite3"
+    writer = PersistentPredictionStore(path)
+    other_worker = PersistentPredictionStore(path)
+    try:
+        writer.put("k", '{"x": 1}')
+        writer.flush()
+
+        assert other_worker.get("k") == '{"x": 1}'
+        assert other_worker.get("missing") is None
+        assert writer.stats()["writes"] == 1
+    finally:
+        writer.close()
+        other_worker.close()
+
+
+def test_entries_survive_restart_and_respect_max_age(tmp_path, monkeypatch):
+    path = tmp_path / "store.sqlite3"
+    store = PersistentPredictionStore(path)
+    store.put("k", "payload")
+    store.close()
+
+    restarted = PersistentPredictionStore(path)
+    try:
+        assert restarted.get("k", max_age_seconds=60) == "payload"
+        monkeypatch.setattr("src.serving.store.time.time", lambda: 10**12)
+        assert restarted.get("k", max_age_seconds=60) is None
+    finally:
+        restarted.close()
+
+
+def test_size_eviction_drops_oldest_entries(tmp_path):
+    store = PersistentPredictionStore(tmp_path / "store.sqlite3", max_bytes=1000)
+    for index in range(20):
+        store.put(f"k{index}", "x" * 100)
+    store.close()  # the final batch always runs an eviction pass
+
+    reopened = PersistentPredictionStore(tmp_path / "store.sqlite3")
+    try:
+        stats = reopened.stats()
+        assert stats["bytes"] <= 1000
+        assert reopened.get("k0") is None
+        assert reopened.get("k19") == "x" * 100
+    finally:
+        reopened.close()
+
+
+def test_cache_reads_through_to_store_shared_with_another_process(tmp_path):
+    path = tmp_path / "store.sqlite3"
+    worker_a_store = PersistentPredictionStore(path)
+    worker_b_store = PersistentPredictionStore(path)
+    worker_a: PredictionCache[ComplaintResponse] = PredictionCache(
+        max_entries=8, ttl_seconds=0, store=worker_a_store, response_model=ComplaintResponse
+    )
+    worker_b: PredictionCache[ComplaintResponse] = PredictionCache(
+        max_entries=8, ttl_seconds=0, store=worker_b_store, response_model=ComplaintResponse
+    )
+    try:
+        worker_a.put("k", _response("Product Complaint"))
+        worker_a_store.flush()
+
+        assert worker_b.get("k") == _response("Product Complaint")
+        assert worker_b.get("k") == _response("Product Complaint")  # now served from worker B's memory
+        stats = worker_b.stats()
+        assert (stats["hits"], stats["store_hits"], stats["entries"]) == (2, 1, 1)
+    finally:
+        worker_a_store.close()
+        worker_b_store.close()
+
+
+def test_totals_follow_replacements_deletions_and_restarts_without_scanning(tmp_path):
+    path = tmp_path / "store.sqlite3"
+    store = PersistentPredictionStore(path)
+    try:
+        store.put("old:a", "x" * 10)
+        store.put("old:b", "x" * 20)
+        store.put("new:a", "x" * 30)
+        store.put("old:a", "x" * 5)
+        store.flush()
+        assert (store.stats()["entries"], store.stats()["bytes"]) == (3, 55)
+
+        assert store.delete_prefix("old:") == 2
+        assert (store.stats()["entries"], store.stats()["bytes"]) == (1, 30)
+    finally:
+        store.close()
+
+    restarted = PersistentPredictionStore(path)
+    try:
+        assert (restarted.stats()["entries"], restarted.stats()["bytes"]) == (1, 30)
+    finally:
+        restarted.close()
+
+
+def test_async_cache_reads_the_store_off_the_event_loop(tmp_path):
+    store = PersistentPredictionStore(tmp_path / "store.sqlite3")
+    cache: PredictionCache[ComplaintResponse] = PredictionCache(
+        max_entries=0, ttl_seconds=0, store=store, response_model=ComplaintResponse
+    )
+    reader_threads = []
+    store_get = store.get
+
+    def _recording_get(key, max_age_seconds=0):
+        reader_threads.append(threading.current_thread())
+        return store_get(key, max_age_seconds)
+
+    store.get = _recording_get
+    try:
+        cache.put("k", _response("Product Complaint"))
+        store.flush()
+
+        async def _lookups():
+            return await cache.aget("k"), await cache.aget("missing"), threading.current_thread()
+
+        hit, miss, loop_thread = asyncio.run(_lookups())
+        assert (hit, miss) == (_response("Product Complaint"), None)
+        assert len(reader_threads) == 2 and loop_thread not in reader_threads
+        assert (cache.stats()["store_hits"], cache.stats()["misses"]) == (1, 1)
+    finally:
+        store.close()
+
+
+def test_delete_prefix_uses_the_key_index_and_spares_neighbouring_keys(tmp_path):
+    store = PersistentPredictionStore(tmp_path / "store.sqlite3")
+    try:
+        for key in ("ab9:x", "ab:", "ab:x", "ab:\uffff", "ab;", "ab;x", "aa:x"):
+            store.put(key, "payload")
+        store.flush()
+        plan = store._reader().execute(f"EXPLAIN QUERY PLAN {_DELETE_KEY_RANGE}", _prefix_range("ab:")).fetchall()
+
+        assert store.delete_prefix("ab:") == 3
+        assert [store.get(key) is not None for key in ("ab9:x", "ab;", "ab;x", "aa:x")] == [True] * 4
+        assert "SEARCH predictions USING" in str(plan) and "(key>? AND key<?)" in str(plan)
+    finally:
+        store.close()
@@ -0,0 +1,81 @@
+"""Tests for the byte-stable prompt prefix and llama.cpp cache/slot hints."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+import litellm
+from dspy.clients import lm as dspy_lm
+
+from src.common.classifier import create_classification_signature
+from src.common.config import create_lm, load_llm_config
+from src.common.llama_cpp import LlamaCppLM, StablePrefixChatAdapter
+from src.common.slots import SlotPinner, assign_slots, llama_slot
+from src.common.types import ClassificationType
+from src.serving.metrics import ForwardingUsageTracker
+
+
+def test_prefix_is_rendered_once_and_matches_chat_adapter():
+    signature = dspy.ChainOfThought(create_classification_signature(ClassificationType.PC_CATEGORY)).predict.signature
+    demos = [
+        dspy.Example(
+            complaint="The pen cap cracked.",
+            reasoning="Damaged pen.",
+            classification="Device Malfunction",
+            justification="Cracked pen.",
+        ).toDict(),
+    ]
+    adapter = StablePrefixChatAdapter()
+
+    first = adapter.format(signature, demos, {"complaint": "The box arrived open."})
+    second = adapter.format(signature, demos, {"complaint": "The label was unreadable."})
+
+    assert first == dspy.ChatAdapter().format(signature, demos, {"complaint": "The box arrived open."})
+    assert len(first) == 4 and first[:3] == second[:3]
+    assert all(a["content"] is b["content"] for a, b in zip(first[:3], second[:3], strict=True))  # reused, not rebuilt
+    assert first[3] != second[3]
+
+
+def test_slots_are_split_between_classifiers_and_the_least_busy_one_is_pinned():
+    assert assign_slots(list(ClassificationType), 4) == {"ae-pc": (0, 3), "ae-category": (1,), "pc-category": (2,)}
+    assert assign_slots(list(ClassificationType), 2) == {"ae-pc": (0,), "ae-category": (1,), "pc-category": (0,)}
+
+    pinner = SlotPinner((0, 3))
+    with pinner.pin() as first:
+        with pinner.pin() as second:
+            assert (first, second, llama_slot.get()) == (0, 3, 3)
+        assert llama_slot.get() == 0
+    assert llama_slot.get() is None
+    assert pinner.stats()["calls"] == {"0": 1, "3": 1}
+
+
+def test_llama_cpp_lm_sends_cache_hints_and_records_cached_tokens(monkeypatch):
+    monkeypatch.setenv("DSPY_PROVIDER", "local")
+    monkeypatch.setenv("DSPY_PREFIX_CACHE", "true")
+    requests: list[dict] = []
+
+    async def _completion(request, num_retries, cache=None):
+        requests.append(request)
+        return litellm.ModelResponse(
+            choices=[{"message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            usage={"prompt_tokens": 120, "completion_tokens": 1, "prompt_tokens_details": {"cached_tokens": 100}},
+        )
+
+    monkeypatch.setattr(dspy_lm, "alitellm_completion", _completion)
+    lm = create_lm(load_llm_config())
+    tracker = ForwardingUsageTracker(None)
+
+    async def _call() -> None:
+        with SlotPinner((2,)).pin(), dspy.settings.context(usage_tracker=tracker):
+            await lm.aforward(messages=[{"role": "user", "content": "hi"}])
+        await lm.aforward(messages=[{"role": "user", "content": "hi"}])
+
+    asyncio.run(_call())
+
+    assert isinstance(lm, LlamaCppLM)
+    assert [request["extra_body"] for request in requests] == [
+        {"cache_prompt": True, "id_slot": 2},
+        {"cache_prompt": True},
+    ]
+    assert (tracker.prompt_tokens, tracker.cached_prompt_tokens) == (120, 100)
@@ -0,0 +1,123 @@
+"""Tests for hot reload of classifier artifacts."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.common.paths import get_classifier_artifact_path
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.cache import PredictionCache, prediction_cache_key
+from src.serving.reload import ArtifactReloader, ArtifactValidationError, validate_artifact
+from src.serving.service import ComplaintResponse
+from src.serving.store import PersistentPredictionStore
+
+
+@pytest.fixture
+def artifact(tmp_path, monkeypatch) -> Path:
+    """A writable copy of the AE-PC artifact; the other classification types keep their shipped artifacts."""
+    path = tmp_path / "ae-pc.json"
+    shutil.copy(get_classifier_artifact_path(ClassificationType.AE_PC), path)
+    monkeypatch.setattr(
+        service,
+        "get_classifier_artifact_path",
+        lambda classification_type: (
+            path
+            if classification_type == ClassificationType.AE_PC
+            else get_classifier_artifact_path(classification_type)
+        ),
+    )
+    return path
+
+
+def _rewrite(path: Path, **metadata: object) -> None:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["metadata"].update(metadata)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def _response(label: str) -> ComplaintResponse:
+    return ComplaintResponse(classification=label, justification="", classification_type="ae-pc")
+
+
+def _reloader(installed: dict, cache: PredictionCache | None = None) -> ArtifactReloader[str]:
+    builds = iter(range(100))
+    return ArtifactReloader(
+        lambda classification_type: f"predictor-{next(builds)}",
+        lambda classification_type, built: installed.__setitem__(classification_type, built),
+        prediction_cache=cache,
+    )
+
+
+def test_reload_swaps_on_change_and_retires_old_cache_entries(artifact):
+    installed: dict[ClassificationType, str] = {}
+    cache: PredictionCache[ComplaintResponse] = PredictionCache()
+    reloader = _reloader(installed, cache)
+
+    async def _run() -> None:
+        first = await reloader.reload(ClassificationType.AE_PC)
+        assert (first.status, installed[ClassificationType.AE_PC]) == ("reloaded", "predictor-0")
+        assert (await reloader.reload(ClassificationType.AE_PC)).status == "unchanged"
+
+        held_by_in_flight_request = installed[ClassificationType.AE_PC]
+        cache.put(prediction_cache_key("pen cracked", "ae-pc", first.fingerprint, "m"), _response("old"))
+        cache.put(prediction_cache_key("pen cracked", "ae-pc", "other", "m"), _response("other"))
+        _rewrite(artifact, mlflow_run_id="retrained")
+
+        second = await reloader.reload(ClassificationType.AE_PC)
+        assert second.status == "reloaded"
+        assert second.previous_fingerprint == first.fingerprint != second.fingerprint
+        assert second.retired_cache_entries == 1
+        assert held_by_in_flight_request == "predictor-0"
+        assert installed[ClassificationType.AE_PC] == "predictor-1"
+
+    asyncio.run(_run())
+    assert len(cache) == 1
+    assert reloader.stats()["reloads"] == 1
+
+
+def test_invalid_artifact_keeps_previous_classifier_and_is_not_retried(artifact):
+    installed: dict[ClassificationType, str] = {}
+    reloader = _reloader(installed)
+
+    async def _run() -> None:
+        await reloader.reload(ClassificationType.AE_PC)
+        _rewrite(artifact, classification_type="pc-category")
+
+        failed = await reloader.reload(ClassificationType.AE_PC)
+        assert failed.status == "failed" and "pc-category" in failed.error
+        assert installed[ClassificationType.AE_PC] == "predictor-0"
+
+        watcher = asyncio.create_task(reloader.watch(0.001))
+        await asyncio.sleep(0.05)
+        watcher.cancel()
+
+    asyncio.run(_run())
+    assert reloader.failures == 1  # the watcher skipped content that already failed
+
+
+def test_validate_artifact_rejects_label_drift(artifact):
+    _rewrite(artifact, classification_config={"description": "", "labels": ["Adverse Event", "Other"]})
+
+    with pytest.raises(ArtifactValidationError, match="label set"):
+        validate_artifact(artifact, ClassificationType.AE_PC)
+
+
+def test_retire_drops_matching_entries_from_the_store(tmp_path):
+    store = PersistentPredictionStore(tmp_path / "store.sqlite3")
+    cache: PredictionCache[ComplaintResponse] = PredictionCache(store=store, response_model=ComplaintResponse)
+    old_key = prediction_cache_key("pen cracked", "ae-pc", "old", "m")
+    new_key = prediction_cache_key("pen cracked", "ae-pc", "new", "m")
+    cache.put(old_key, _response("old"))
+    cache.put(new_key, _response("new"))
+
+    assert cache.retire("old") == 2  # one in memory, one in the store
+    cache.clear()
+    assert cache.get(old_key) is None
+    assert cache.get(new_key).classification == "new"
+    store.close()
@@ -0,0 +1,60 @@
+"""Tests for per-request few-shot demos retrieved from the memory-mapped training-set index."""
+
+from __future__ import annotations
+
+import dspy
+import numpy as np
+
+from src.common.classifier import ComplaintClassifier
+from src.common.demo_retrieval import DemoIndex, DemoRetriever, build_demo_index
+from src.common.types import ClassificationType, InferenceProfile
+
+_EXAMPLES = [
+    {
+        "complaint": "The pen arrived cracked and the cartridge was leaking.",
+        "classification": "Product Complaint",
+        "justification": "Damaged device.",
+    },
+    {
+        "complaint": "I had nausea and vomiting for three days after the dose.",
+        "classification": "Adverse Event",
+        "justification": "Reaction after dosing.",
+    },
+    {
+        "complaint": "The dose counter on my pen stopped moving.",
+        "classification": "Product Complaint",
+        "justification": "Device malfunction.",
+    },
+]
+
+
+def test_index_is_memory_mapped_and_ranks_the_most_similar_examples_first(tmp_path):
+    index = DemoIndex(build_demo_index(_EXAMPLES, tmp_path / "demo_index"))
+
+    assert isinstance(index.vectors, np.memmap)
+    assert [demo["justification"] for demo in index.top_k("My pen was cracked and leaking", 2)] == [
+        "Damaged device.",
+        "Device malfunction.",
+    ]
+    # an example never serves as its own demo
+    assert _EXAMPLES[1] not in index.top_k(_EXAMPLES[1]["complaint"], 3)
+    # the most similar demo is shown last, next to the complaint
+    assert DemoRetriever(index, 2)("My pen was cracked and leaking")[-1] == _EXAMPLES[0]
+
+
+def test_retrieved_demos_replace_the_artifact_demos_in_every_profile(tmp_path):
+    classifier = ComplaintClassifier(ClassificationType.AE_PC)
+    classifier.classify.predict.demos = [
+        dspy.Example(complaint="Baked-in demo.", classification="Adverse Event", justification="Fixed.")
+    ]
+    classifier.demo_retriever = DemoRetriever(DemoIndex(build_demo_index(_EXAMPLES, tmp_path / "demo_index")), 1)
+    lm = dspy.utils.DummyLM([{"reasoning": "r", "classification": "Product Complaint", "justification": "j"}] * 2)
+
+    with dspy.context(lm=lm):
+        classifier(complaint="My pen was cracked and leaking")
+        classifier.for_profile(InferenceProfile.LABEL_ONLY)(complaint="My pen was cracked and leaking")
+
+    full, label_only = ("\n".join(m["content"] for m in entry["messages"]) for entry in lm.history)
+    assert "The pen arrived cracked" in full and "Damaged device." in full
+    assert "Baked-in demo." not in full
+    assert "The pen arrived cracked" in label_only and "Damaged device." not in label_only
@@ -0,0 +1,94 @@
+"""Tests for single-flight coalescing of identical in-flight classifications."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+import pytest
+
+from src.common.types import ClassificationType
+from src.serving import service
+from src.serving.service import ComplaintRequest, ComplaintResponse, SingleFlight
+
+
+def _fake_classifier(monkeypatch, calls: list[str], delay: float = 0.05, error: Exception | None = None) -> None:
+    class _FakeClassifier:
+        async def acall(self, complaint: str) -> dspy.Prediction:
+            calls.append(complaint)
+            await asyncio.sleep(delay)
+            if error is not None:
+                raise error
+            return dspy.Prediction(classification="Product Complaint", justification="cracked pen")
+
+    monkeypatch.setattr(service, "_resolve_classifier", lambda *args, **kwargs: _FakeClassifier())
+
+
+def test_identical_concurrent_requests_make_one_backend_call(monkeypatch):
+    calls: list[str] = []
+    _fake_classifier(monkeypatch, calls)
+    single_flight: SingleFlight[ComplaintResponse] = SingleFlight()
+    predict = service.get_async_classification_function(ClassificationType.AE_PC, single_flight=single_flight)
+
+    async def _run() -> list[ComplaintResponse]:
+        duplicates = ["My pen arrived cracked."] * 9 + ["  my PEN arrived cracked. "]
+        return await asyncio.gather(*(predict(ComplaintRequest(complaint=text)) for text in duplicates))
+
+    responses = asyncio.run(_run())
+
+    assert len(calls) == 1
+    assert all(response.classification == "Product Complaint" for response in responses)
+    assert single_flight.stats() == {"calls": 1, "coalesced": 9, "in_flight": 0}
+
+
+def test_distinct_complaints_are_not_coalesced(monkeypatch):
+    calls: list[str] = []
+    _fake_classifier(monkeypatch, calls)
+    single_flight: SingleFlight[ComplaintResponse] = SingleFlight()
+    predict = service.get_async_classification_function(ClassificationType.AE_PC, single_flight=single_flight)
+
+    async def _run() -> None:
+        await asyncio.gather(predict(ComplaintRequest(complaint="a")), predict(ComplaintRequest(complaint="b")))
+
+    asyncio.run(_run())
+
+    assert sorted(calls) == ["a", "b"]
+    assert single_flight.coalesced == 0
+
+
+def test_errors_reach_every_waiter_and_do_not_stick(monkeypatch):
+    calls: list[str] = []
+    _fake_classifier(monkeypatch, calls, error=RuntimeError("backend down"))
+    single_flight: SingleFlight[ComplaintResponse] = SingleFlight()
+    predict = service.get_async_classification_function(ClassificationType.AE_PC, single_flight=single_flight)
+
+    async def _run() -> list[BaseException | ComplaintResponse]:
+        return await asyncio.gather(
+            *(predict(ComplaintRequest(complaint="same")) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(_run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(calls) == 1
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(predict(ComplaintRequest(complaint="same")))
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    single_flight: SingleFlight[str] = SingleFlight()
+
+    async def _compute() -> str:
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def _run() -> str:
+        first = asyncio.create_task(single_flight.run("k", _compute))
+        second = asyncio.create_task(single_flight.run("k", _compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(_run()) == "done"
+    assert single_flight.calls == 1
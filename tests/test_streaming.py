@@ -0,0 +1,79 @@
+"""Tests for translating DSPy stream chunks into classification stream events."""
+
+from __future__ import annotations
+
+import asyncio
+
+import dspy
+import pytest
+from dspy.streaming import StreamResponse
+
+from src.common.types import ClassificationType
+from src.serving.streaming import ClassificationStreamEvent, stream_prediction_events
+
+_PREDICTION = dspy.Prediction(classification="Product Complaint", justification="The pen cracked.")
+
+
+async def _chunks(*items):
+    for item in items:
+        yield item
+
+
+def _collect(*items) -> list[ClassificationStreamEvent]:
+    async def _run() -> list[ClassificationStreamEvent]:
+        return [event async for event in stream_prediction_events(_chunks(*items), ClassificationType.AE_PC)]
+
+    return asyncio.run(_run())
+
+
+def test_label_is_emitted_whole_before_justification_deltas():
+    events = _collect(
+        StreamResponse("classify.predict", "classification", "Product ", False),
+        StreamResponse("classify.predict", "classification", "Complaint", True),
+        StreamResponse("classify.predict", "justification", "The pen ", False),
+        StreamResponse("classify.predict", "justification", "cracked.", True),
+        _PREDICTION,
+    )
+
+    assert [(event.event, event.data) for event in events] == [
+        ("classification", {"classification": "Product Complaint"}),
+        ("justification", {"delta": "The pen "}),
+        ("justification", {"delta": "cracked."}),
+        (
+            "done",
+            {
+                "classification": "Product Complaint",
+                "justification": "The pen cracked.",
+                "classification_type": "ae-pc",
+            },
+        ),
+    ]
+
+
+def test_justification_start_closes_label_without_last_chunk_flag():
+    events = _collect(
+        StreamResponse("classify.predict", "classification", "Product Complaint", False),
+        StreamResponse("classify.predict", "justification", "The pen cracked.", False),
+        _PREDICTION,
+    )
+
+    assert [event.event for event in events] == ["classification", "justification", "done"]
+    assert events[0].data == {"classification": "Product Complaint"}
+
+
+def test_falls_back_to_final_prediction_when_nothing_streamed():
+    events = _collect(_PREDICTION)
+
+    assert [event.event for event in events] == ["classification", "justification", "done"]
+    assert events[1].data == {"delta": "The pen cracked."}
+
+
+def test_missing_final_prediction_raises():
+    with pytest.raises(RuntimeError):
+        _collect(StreamResponse("classify.predict", "classification", "Product", True))
+
+
+def test_event_encodes_as_server_sent_event():
+    event = ClassificationStreamEvent(event="classification", data={"classification": "Adverse Event"})
+
+    assert event.encode() == 'event: classification\ndata: {"classification": "Adverse Event"}\n\n'
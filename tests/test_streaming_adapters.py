@@ -0,0 +1,40 @@
+"""Streaming under the adapters this package installs in place of DSPy's ``ChatAdapter``."""
+
+from __future__ import annotations
+
+import dspy
+import pytest
+from dspy.streaming import StreamListener
+from litellm import ModelResponseStream
+
+from src.common.llama_cpp import StablePrefixChatAdapter
+from src.serving.streaming import _stream_listeners
+
+_COMPLETION = [
+    "[[ ## classification ## ]]\n",
+    "Product",
+    " Complaint",
+    "\n\n[[ ## justification ## ]]\n",
+    "The pen ",
+    "cracked.",
+    "\n\n[[ ## completed ## ]]",
+]
+
+
+def _stream(listener: StreamListener) -> list[str]:
+    chunks = (ModelResponseStream(choices=[{"index": 0, "delta": {"content": text}}]) for text in _COMPLETION)
+    return [response.chunk for response in map(listener.receive, chunks) if response is not None]
+
+
+def test_listeners_stream_fields_under_the_prefix_stable_adapter():
+    with dspy.context(adapter=StablePrefixChatAdapter()):
+        classification, justification = _stream_listeners("classification", "justification")
+
+        assert "".join(_stream(classification)) == "Product Complaint"
+        assert "".join(_stream(justification)).strip() == "The pen cracked."
+
+
+def test_stock_listeners_reject_the_prefix_stable_adapter():
+    # why _stream_listeners exists; if this starts passing through, DSPy accepts subclasses itself
+    with dspy.context(adapter=StablePrefixChatAdapter()), pytest.raises(ValueError, match="Unsupported adapter"):
+        _stream(StreamListener("classification"))
@@ -0,0 +1,98 @@
+"""Tests for per-classifier completion budgets."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import dspy
+import litellm
+from dspy.clients import lm as dspy_lm
+
+from src.common.classifier import ComplaintClassifier
+from src.common.token_budget import completion_budget, token_budget_metadata
+from src.common.types import ClassificationType
+from src.serving import service
+
+_COMPLETION = (
+    "[[ ## reasoning ## ]]\nThe pen arrived cracked.\n\n[[ ## classification ## ]]\nProduct Complaint\n\n"
+    "[[ ## justification ## ]]\nA damaged device.\n\n[[ ## completed ## ]]"
+)
+
+
+def test_budget_is_the_p99_completion_length_with_a_margin():
+    lengths = [100] * 98 + [180, 4000]
+
+    metadata = token_budget_metadata(lengths)
+
+    assert completion_budget([10, 12]) == 64
+    assert metadata["max_tokens"] == 272  # 180 * 1.5, rounded up to a multiple of 16
+    assert metadata["completion_tokens"] == {
+        "samples": 100,
+        "p50": 100,
+        "p99": 180,
+        "max": 4000,
+        "quantile": 0.99,
+        "margin": 1.5,
+    }
+
+
+def test_truncated_completion_is_retried_once_with_the_lms_max_tokens(monkeypatch):
+    requests: list[dict] = []
+
+    async def _completion(request, num_retries, cache=None):
+        requests.append(request)
+        truncated = request["max_tokens"] == 16
+        return litellm.ModelResponse(
+            choices=[
+                {
+                    "message": {"role": "assistant", "content": _COMPLETION[:40] if truncated else _COMPLETION},
+                    "finish_reason": "length" if truncated else "stop",
+                }
+            ],
+            usage={"prompt_tokens": 100, "completion_tokens": 16 if truncated else 30},
+        )
+
+    monkeypatch.setattr(dspy_lm, "alitellm_completion", _completion)
+    classifier = ComplaintClassifier(ClassificationType.AE_PC)
+    lm = dspy.LM("openai/local-model", api_base="http://127.0.0.1:9/v1", api_key="dummy", cache=False, max_tokens=8000)
+
+    async def _run(max_tokens: int) -> dspy.Prediction:
+        classifier.max_tokens = max_tokens
+        with dspy.context(lm=lm, adapter=dspy.ChatAdapter(use_json_adapter_fallback=False)):
+            return await classifier.acall(complaint="The pen arrived cracked.")
+
+    within = asyncio.run(_run(64))
+    retried = asyncio.run(_run(16))
+
+    assert within.classification == retried.classification == "Product Complaint"
+    assert [request["max_tokens"] for request in requests] == [64, 16, 8000]
+
+
+def test_loaded_classifier_takes_its_budget_from_the_artifact_metadata(tmp_path, monkeypatch):
+    artifact = tmp_path / "ae-pc.json"
+    ComplaintClassifier(ClassificationType.AE_PC).save(str(artifact))
+    saved = json.loads(artifact.read_text())
+    saved["metadata"]["max_tokens"] = 272
+    artifact.write_text(json.dumps(saved))
+
+    budgeted = service._load_classifier(artifact, ClassificationType.AE_PC)
+    monkeypatch.setenv("DSPY_TOKEN_BUDGETS", "false")
+    unbudgeted = service._load_classifier(artifact, ClassificationType.AE_PC)
+
+    assert (budgeted.max_tokens, unbudgeted.max_tokens) == (272, None)
+
+
+def test_artifact_without_a_budget_keeps_the_lms_max_tokens_and_says_so(tmp_path):
+    from loguru import logger
+
+    artifact = tmp_path / "ae-pc.json"
+    ComplaintClassifier(ClassificationType.AE_PC).save(str(artifact))
+    messages: list[str] = []
+    sink = logger.add(messages.append, level="INFO", format="{message}")
+    try:
+        assert service._load_classifier(artifact, ClassificationType.AE_PC).max_tokens is None
+    finally:
+        logger.remove(sink)
+
+    assert any("ae-pc.json has no metadata.max_tokens" in message for message in messages)